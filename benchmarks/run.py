@@ -0,0 +1,338 @@
+"""
+Benchmark degli indici di ricerca e delle analisi del vault
+
+Non fanno parte dell'applicazione: misurano su dati casuali i moduli di core
+e verificano che i risultati coincidano con il calcolo senza ottimizzazioni.
+
+Esecuzione dalla cartella del progetto:
+    python -m benchmarks.run                  (tutti)
+    python -m benchmarks.run search sort      (solo quelli indicati)
+    python -m benchmarks.run breach --size 200000
+"""
+import hashlib
+import math
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.breach_corpus import HEADER, BreachCorpus, _bloom_positions, build_index
+from core.frecency import FrecencyTracker
+from core.password_strength import PasswordAnalysis, PasswordValidator
+from core.search_index import SearchIndex
+from core.sort_index import DESCENDING_ORDERS, SORT_KEYS, SortedViews, SortIndex
+from core.strength_batch import _analyze_in_pool, _analyze_vectorized, _load_numpy
+
+WORDS = ["git", "hub", "mail", "bank", "shop", "cloud", "home", "work", "social",
+         "news", "store", "game", "music", "video", "photo", "travel", "pay", "drive"]
+DOMAINS = [".com", ".it", ".org", ".net", ".io"]
+
+
+def random_entry(rng: random.Random, number: int) -> Dict:
+    """Password di prova con sito, username e date plausibili (senza password)"""
+    return {
+        "id": f"bench{number}",
+        "site": "".join(rng.sample(WORDS, 2)) + str(rng.randint(1, 999)) + rng.choice(DOMAINS),
+        "username": "".join(rng.choices(string.ascii_lowercase, k=8)) + "@" + rng.choice(WORDS) + ".com",
+        "created_at": f"2024-01-01T00:{number % 60:02d}:00",
+        "updated_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+    }
+
+
+def random_entries(size: int) -> List[Dict]:
+    rng = random.Random(42)
+    entries = [random_entry(rng, number) for number in range(size)]
+    entries[size // 2]["site"] = "github.com"
+    return entries
+
+
+def bench_search(sizes: Tuple[int, ...] = (1000, 10000, 100000), repeat: int = 20):
+    """Scansione lineare originale contro l'indice a trigrammi (SearchIndex.search)"""
+    queries = ["g", "gi", "git", "gith", "github.com", "mail", "bank.it", "zzz", "example"]
+
+    print(f"{'voci':>8} {'query':>12} {'lineare ms':>12} {'indice ms':>11} {'risultati':>10}")
+    for size in sizes:
+        entries = random_entries(size)
+
+        start = time.perf_counter()
+        index = SearchIndex()
+        index.rebuild(entries)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{size:>8} {'(build)':>12} {'':>12} {build_ms:>11.1f}")
+
+        for query in queries:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                expected = [e for e in entries if query in e["site"].lower() or query in e["username"].lower()]
+            linear_ms = (time.perf_counter() - start) * 1000 / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                found = index.search(query)
+            index_ms = (time.perf_counter() - start) * 1000 / repeat
+
+            assert found == expected, f"Risultati diversi per '{query}'"
+            print(f"{size:>8} {query:>12} {linear_ms:>12.2f} {index_ms:>11.2f} {len(found):>10}")
+
+
+def bench_fuzzy(size: int = 20000, limit: int = 200, repeat: int = 20):
+    """Ricerca fuzzy ordinata (SearchIndex.search_ranked), da zero e incrementale"""
+    queries = ["g", "gi", "git", "gthb", "github", "githbu", "guthub", "mail", "bnk.it", "zzzz"]
+    entries = random_entries(size)
+
+    # Senza cache ogni ricerca parte dall'indice completo
+    index = SearchIndex(cache_size=0)
+    index.rebuild(entries)
+
+    print(f"{size} voci, primi {limit} risultati")
+    print(f"{'query':>10} {'ms':>8} {'risultati':>10}  primo")
+    for query in queries:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            found = index.search_ranked(query, limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+        first = found[0]["site"] if found else "-"
+        print(f"{query:>10} {elapsed_ms:>8.2f} {len(found):>10}  {first}")
+
+    # Digitazione con restringimento incrementale e ritorno con backspace
+    typing = ["m", "ma", "mai", "mail", "mailg", "mailgi", "mailg", "mail", "mai"]
+    cached_index = SearchIndex()
+    cached_index.rebuild(entries)
+
+    print(f"\n{'digitazione':>12} {'da zero ms':>11} {'incrementale ms':>16}")
+    for query in typing:
+        start = time.perf_counter()
+        expected = index.search_ranked(query, limit)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        found = cached_index.search_ranked(query, limit)
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        assert found == expected, f"Risultati diversi per '{query}'"
+        print(f"{query:>12} {full_ms:>11.2f} {incremental_ms:>16.2f}")
+
+
+def bench_sort(size: int = 20000, repeat: int = 20):
+    """Costruzione, cambio di ordinamento e inserimenti delle viste ordinate"""
+    entries = random_entries(size)
+    views = SortedViews(lambda: entries)
+
+    print(f"{size} voci")
+    for order in SORT_KEYS:
+        start = time.perf_counter()
+        views.items(order)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            views.items(order)
+        switch_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            full_sort = sorted(entries, key=SORT_KEYS[order])
+        resort_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        expected = full_sort[::-1] if order in DESCENDING_ORDERS else full_sort
+        assert views.items(order) == expected, f"Ordinamento '{order}' diverso"
+        print(f"{order:>10}: prima costruzione {build_ms:6.2f} ms, cambio {switch_ms:5.2f} ms, "
+              f"riordino completo {resort_ms:6.2f} ms")
+
+    rng = random.Random(7)
+    start = time.perf_counter()
+    for number in range(size, size + 1000):
+        entry = random_entry(rng, number)
+        entries.append(entry)
+        views.add(entry)
+    print(f"1000 inserimenti con bisect su {len(SORT_KEYS)} viste: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+def bench_frecency(size: int = 20000, accesses: int = 5000):
+    """Registrazione degli accessi, classifica e ordinamento per frecency"""
+    rng = random.Random(42)
+    entries = random_entries(size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        tracker = FrecencyTracker(flush_every=accesses + 1, flush_interval=math.inf)
+        tracker.load(Path(directory) / "bench.usage.json")
+
+        # Accessi distribuiti come in un uso reale: poche voci molto usate
+        start = time.perf_counter()
+        now = time.time() - 120 * 86400
+        for _ in range(accesses):
+            now += rng.uniform(0, 3600)
+            tracker.record(entries[int(rng.paretovariate(1.2)) % size]["id"], now=now)
+        record_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        top = tracker.top(20)
+        top_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index = SortIndex(tracker.sort_key)
+        index.rebuild(entries)
+        sort_ms = (time.perf_counter() - start) * 1000
+        assert [entry["id"] for entry in index.items()[:20]] == top
+
+        start = time.perf_counter()
+        tracker.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+
+        reloaded = FrecencyTracker()
+        reloaded.load(tracker.path)
+        assert reloaded.top(20) == top
+
+    print(f"{size} voci, {accesses} accessi su {len(tracker)} voci distinte")
+    print(f"registrazione: {record_ms / accesses * 1000:.2f} µs per accesso")
+    print(f"prime 20: {top_ms:.3f} ms, ordinamento completo: {sort_ms:.2f} ms, salvataggio: {flush_ms:.2f} ms")
+
+
+def bench_strength(size: int = 20000):
+    """Analisi scalare della forza contro quella a lotti, con verifica dell'identità"""
+    rng = random.Random(42)
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*()-_ àèéìòùİß"
+    passwords = ["".join(rng.choices(alphabet, k=rng.randint(0, 40))) for _ in range(size)]
+    passwords[:4] = ["password", "aaa111", "qwerty123", "Xk9!mZ2@pL5#"]
+    validator = PasswordValidator()
+
+    def fields(analysis: PasswordAnalysis):
+        return analysis.score, analysis.strength, analysis.suggestions, analysis.criteria_met, analysis.color
+
+    start = time.perf_counter()
+    scalar = [validator._analyze(password) if password else validator.analyze_password(password)
+              for password in passwords]
+    scalar_ms = (time.perf_counter() - start) * 1000
+    print(f"{size} password")
+    print(f"scalare:   {scalar_ms:8.1f} ms")
+
+    np = _load_numpy()
+    if np is not None:
+        start = time.perf_counter()
+        vectorized = _analyze_vectorized(np, validator, passwords)
+        vectorized_ms = (time.perf_counter() - start) * 1000
+        assert list(map(fields, vectorized)) == list(map(fields, scalar)), "Risultati vettoriali diversi"
+        print(f"NumPy:     {vectorized_ms:8.1f} ms ({scalar_ms / vectorized_ms:.1f}x)")
+    else:
+        print("NumPy non installato: analisi vettoriale saltata")
+
+    workers = max(2, os.cpu_count() or 1)
+    start = time.perf_counter()
+    pooled = _analyze_in_pool(validator, passwords, workers)
+    pool_ms = (time.perf_counter() - start) * 1000
+    assert list(map(fields, pooled)) == list(map(fields, scalar)), "Risultati del pool diversi"
+    print(f"pool ({workers} processi): {pool_ms:8.1f} ms")
+
+
+def bench_breach(size: int = 1_000_000, lookups: int = 20000):
+    """Costruzione di un indice di password compromesse di prova e ricerche"""
+    rng = random.Random(42)
+    alphabet = string.ascii_lowercase + string.digits
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "corpus.txt"
+        passwords = []
+        with open(source, "w", encoding="utf-8") as f:
+            for number in range(size):
+                password = "".join(rng.choices(alphabet, k=rng.randint(6, 14)))
+                if number % 2:
+                    f.write(hashlib.sha1(password.encode()).hexdigest().upper() + f":{number}\n")
+                else:
+                    f.write(password + "\n")
+                if number < lookups:
+                    passwords.append(password)
+
+        destination = Path(directory) / "corpus.idx"
+        start = time.perf_counter()
+        success, message = build_index(source, destination)
+        build_s = time.perf_counter() - start
+        if not success:
+            print(message)
+            return
+        print(f"{size} voci, indice di {destination.stat().st_size / 2 ** 20:.1f} MiB "
+              f"costruito in {build_s:.1f} s")
+
+        misses = ["".join(rng.choices(string.ascii_uppercase, k=16)) for _ in range(lookups)]
+        before = _resident_kib()
+        corpus = BreachCorpus(destination)
+        try:
+            # Uso tipico (validazione e audit): la memoria del processo non cresce, le
+            # pagine del file toccate restano nella cache del kernel e sono liberabili
+            for password in passwords[:50] + misses[:50]:
+                corpus.contains(password)
+            after = _resident_kib()
+            if before and after:
+                print(f"dopo 100 ricerche: memoria anonima {after['RssAnon'] - before['RssAnon']:+d} KiB, "
+                      f"pagine dell'indice mappate {after['RssFile'] - before['RssFile']:+d} KiB")
+
+            for label, sample, expected in (("presenti", passwords, True), ("assenti", misses, False)):
+                start = time.perf_counter()
+                found = sum(corpus.contains(password) for password in sample)
+                elapsed_us = (time.perf_counter() - start) * 1e6 / len(sample)
+                print(f"ricerca {label}: {elapsed_us:6.2f} µs/password, trovate {found}/{len(sample)}")
+                if expected:
+                    assert found == len(sample), "Password della lista non trovate"
+
+            # Falsi positivi del Bloom: password assenti che arrivano alla tabella
+            blocked = sum(
+                any(not corpus._map[HEADER.size + (position >> 3)] >> (position & 7) & 1
+                    for position in _bloom_positions(digest, corpus.hashes, corpus.bloom_bits))
+                for digest in (hashlib.sha1(password.encode()).digest() for password in misses)
+            )
+            print(f"falsi positivi del Bloom: {(len(misses) - blocked) / len(misses):.4%}")
+        finally:
+            corpus.close()
+
+
+def _resident_kib() -> Dict[str, int]:
+    """Memoria residente anonima e mappata da file (Linux), in KiB"""
+    resident: Dict[str, int] = {}
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(("RssAnon:", "RssFile:")):
+                    name, value = line.split(":")
+                    resident[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return resident
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "search": bench_search,
+    "fuzzy": bench_fuzzy,
+    "sort": bench_sort,
+    "frecency": bench_frecency,
+    "strength": bench_strength,
+    "breach": bench_breach,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark degli indici e delle analisi del vault")
+    parser.add_argument("names", nargs="*", metavar="nome",
+                        help=f"benchmark da eseguire ({', '.join(BENCHMARKS)}; default tutti)")
+    parser.add_argument("--size", type=int, help="numero di voci (default: quello di ogni benchmark)")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark sconosciuti: {', '.join(unknown)}")
+
+    for name in args.names or list(BENCHMARKS):
+        print(f"== {name}: {BENCHMARKS[name].__doc__}")
+        if args.size:
+            BENCHMARKS[name]((args.size,) if name == "search" else args.size)
+        else:
+            BENCHMARKS[name]()
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
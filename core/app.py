@@ -1,10 +1,22 @@
 # core/app.py
 import customtkinter as ctk
 from pathlib import Path
+from tkinter import ttk
 from .theme import theme_manager, ThemeMode
 from .database import PasswordDatabase
 from core.components import ThemedFrame, ThemedLabel, ThemedButton
 from .config import config_manager
+from .view_cache import ViewCache
+from .startup import startup_profiler
+
+# Viste che mostrano i dati dell'utente: invalidate al logout
+USER_VIEWS = ("dashboard", "backup", "audit")
+
+# Moduli caricati dopo che la finestra di login è visibile, uno per ciclo di eventi:
+# al login la dashboard e la crittografia sono già pronte
+DEFERRED_IMPORTS = ("cryptography.fernet", "ui.dashboard_view", "ui.register_view", "ui.backup_view",
+                    "ui.audit_view")
+DEFERRED_IMPORT_DELAY_MS = 50
 
 class PasswordManagerApp(ctk.CTk):
     """Applicazione principale del password manager"""
@@ -13,41 +25,95 @@ class PasswordManagerApp(ctk.CTk):
         super().__init__()
         
         # Configurazione finestra - usa configurazione
-        app_config = config_manager.get_app_config()
-        self.title(app_config.get('title', 'Password Manager'))
+        app_config = config_manager.app
+        self.title(app_config.title)
+        self.geometry(f"{app_config.width}x{app_config.height}")
+        self.minsize(app_config.min_width, app_config.min_height)
         
-        geometry = app_config.get('geometry', {})
-        width = geometry.get('width', 1000)
-        height = geometry.get('height', 700)
-        min_width = geometry.get('min_width', 800)
-        min_height = geometry.get('min_height', 600)
-        
-        self.geometry(f"{width}x{height}")
-        self.minsize(min_width, min_height)
+        # Tema ttk delle tabelle compatte, scelto una volta per tutta l'applicazione:
+        # "clam" rispetta i colori personalizzati su tutte le piattaforme
+        ttk.Style(self).theme_use("clam")
         
         # Inizializza variabili
         self.current_user = None
         self.current_view = None
         self.login_view = None
         self.register_view = None
+        self._config_watch_job = None
+        
+        # Viste già costruite, nascoste invece che distrutte durante la navigazione
+        self.views = ViewCache(
+            app_config.view_cache_size,
+            destroy=self._destroy_widget_safely
+        )
+        
+        # Diagnostica dei leak (opzionale): misura widget e memoria a ogni cambio di vista
+        self.diagnostics = None
+        if app_config.diagnostics:
+            from .diagnostics import Diagnostics
+            self.diagnostics = Diagnostics.install(self)
         
         print("Inizializzazione app...")
         
-        # Inizializza database
-        try:
-            data_dir = Path(__file__).parent.parent / "data"
-            self.database = PasswordDatabase(str(data_dir))
-            print(f"Database inizializzato: {self.database}")
-        except Exception as e:
-            print(f"Errore inizializzazione database: {e}")
-            self.database = None
+        # Inizializza database (la crittografia viene caricata solo quando serve)
+        with startup_profiler.phase("database"):
+            try:
+                data_dir = Path(__file__).parent.parent / "data"
+                self.database = PasswordDatabase(str(data_dir))
+                print(f"Database inizializzato: {self.database}")
+            except Exception as e:
+                print(f"Errore inizializzazione database: {e}")
+                self.database = None
         
-        # Setup UI
-        self._setup_ui()
-        self._show_login()
+        # Setup UI: solo la vista di login prima della prima visualizzazione
+        with startup_profiler.phase("vista di login"):
+            self._setup_ui()
+            self._show_login()
         
         # Bind eventi
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
+        
+        # Il resto dell'inizializzazione dopo che la finestra è stata disegnata
+        self.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        """Prima visualizzazione completata: avvia l'inizializzazione differita"""
+        if startup_profiler.enabled:
+            startup_profiler.mark("finestra di login visibile")
+            startup_profiler.disable()
+            print(startup_profiler.report())
+        
+        if config_manager.app.deferred_imports:
+            self._load_deferred_imports(list(DEFERRED_IMPORTS))
+        
+        # Le modifiche a config.json vengono applicate senza riavviare
+        self._watch_config()
+    
+    def _watch_config(self):
+        """Controlla periodicamente la data di modifica di config.json"""
+        try:
+            config_manager.check_for_changes()
+        except Exception as e:
+            print(f"Errore controllo configurazione: {e}")
+        
+        interval = config_manager.app.config_watch_ms
+        if interval > 0:
+            self._config_watch_job = self.after(interval, self._watch_config)
+
+    def _load_deferred_imports(self, modules):
+        """Carica un modulo differito e pianifica il successivo"""
+        if not modules:
+            return
+        
+        import importlib
+        module = modules.pop(0)
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"Errore caricamento differito di {module}: {e}")
+        
+        if modules:
+            self.after(DEFERRED_IMPORT_DELAY_MS, lambda: self._load_deferred_imports(modules))
 
     def _setup_ui(self):
         """Configura l'interfaccia utente principale"""
@@ -58,17 +124,18 @@ class PasswordManagerApp(ctk.CTk):
     def _show_login(self):
         """Mostra la vista di login"""
         try:
-            self._clear_current_view()
+            def create():
+                from ui.login_view import LoginView
+                login_view = LoginView(
+                    self.main_frame,
+                    self._on_login_success,
+                    self._on_register_click
+                )
+                # Condividi il database
+                login_view.database = self.database
+                return login_view
             
-            from ui.login_view import LoginView
-            self.login_view = LoginView(
-                self.main_frame,
-                self._on_login_success,
-                self._on_register_click
-            )
-            # Condividi il database
-            self.login_view.database = self.database
-            self.login_view.pack(fill="both", expand=True)
+            self.login_view = self.views.show("login", create)
             self.current_view = self.login_view
             
         except Exception as e:
@@ -77,17 +144,18 @@ class PasswordManagerApp(ctk.CTk):
     def _show_register(self):
         """Mostra la vista di registrazione"""
         try:
-            self._clear_current_view()
+            def create():
+                from ui.register_view import RegisterView
+                register_view = RegisterView(
+                    self.main_frame,
+                    self._on_register_success,
+                    self._on_back_to_login
+                )
+                # Condividi il database (come fatto per LoginView)
+                register_view.database = self.database
+                return register_view
             
-            from ui.register_view import RegisterView
-            self.register_view = RegisterView(
-                self.main_frame,
-                self._on_register_success,
-                self._on_back_to_login
-            )
-            # Condividi il database (come fatto per LoginView)
-            self.register_view.database = self.database
-            self.register_view.pack(fill="both", expand=True)
+            self.register_view = self.views.show("register", create)
             self.current_view = self.register_view
             
         except Exception as e:
@@ -95,18 +163,17 @@ class PasswordManagerApp(ctk.CTk):
             self._show_login()
 
     def _show_dashboard(self):
-        """Mostra la vista dashboard"""
+        """Mostra la vista dashboard (ricostruita solo dopo un logout)"""
         try:
-            self._clear_current_view()
+            def create():
+                from ui.dashboard_view import DashboardView
+                return DashboardView(
+                    self.main_frame,
+                    self.database,
+                    self._on_logout
+                )
             
-            # Crea la vista dashboard
-            from ui.dashboard_view import DashboardView
-            dashboard_view = DashboardView(
-                self.main_frame,
-                self.database,
-                self._on_logout
-            )
-            dashboard_view.pack(fill="both", expand=True)
+            dashboard_view = self.views.show("dashboard", create)
             self.current_view = dashboard_view
             
             # Rendi accessibile il metodo backup
@@ -122,49 +189,74 @@ class PasswordManagerApp(ctk.CTk):
             if not self.database or not self.database.current_user:
                 self._show_login()
                 return
-                
-            self._clear_current_view()
             
-            # Crea la vista backup
-            from ui.backup_view import BackupView
-            backup_view = BackupView(
-                self.main_frame,
-                self.database,
-                self.database.current_user,
-                self._show_dashboard
-            )
-            backup_view.pack(fill="both", expand=True)
-            self.current_view = backup_view
+            def create():
+                from ui.backup_view import BackupView
+                return BackupView(
+                    self.main_frame,
+                    self.database,
+                    self.database.current_user,
+                    self._show_dashboard
+                )
+            
+            self.current_view = self.views.show("backup", create)
             
         except Exception as e:
             print(f"Errore creando vista backup: {e}")
             self._show_dashboard()
 
+    def _show_audit(self):
+        """Mostra il report di audit del vault"""
+        try:
+            if not self.database or not self.database.current_user:
+                self._show_login()
+                return
+            
+            def create():
+                from ui.audit_view import AuditView
+                return AuditView(
+                    self.main_frame,
+                    self.database,
+                    self._show_dashboard
+                )
+            
+            self.current_view = self.views.show("audit", create)
+            
+        except Exception as e:
+            print(f"Errore creando vista audit: {e}")
+            self._show_dashboard()
+
+    def _invalidate_user_views(self):
+        """Distrugge le viste legate all'utente (logout): il prossimo login le ricostruisce"""
+        self.views.invalidate(*USER_VIEWS)
+        self.current_view = self.views.current
+        
+        # Forza garbage collection per liberare memoria
+        import gc
+        gc.collect()
+
     def _clear_current_view(self):
         """
-        Pulisce la vista corrente in modo sicuro per evitare memory leak
+        Distrugge tutte le viste, in cache e visibile (chiusura dell'applicazione)
         Gestisce la pulizia ricorsiva di tutti i widget e le loro risorse
         """
         try:
             # Forza il completamento di tutte le operazioni pending della GUI
             self.update_idletasks()
             
-            # Distrugge tutti i widget figli del frame principale
+            # Disabilita eventuali callback di scaling per evitare errori durante distruzione
             for child in list(self.main_frame.winfo_children()):
-                try:
-                    # Disabilita eventuali callback di scaling per evitare errori durante distruzione
-                    if hasattr(child, '_set_scaling'):
-                        try:
-                            child._set_scaling = lambda x: None
-                        except:
-                            pass
-                    
-                    # Esegue distruzione ricorsiva sicura
-                    self._destroy_widget_safely(child)
-                except Exception as e:
-                    # Log degli errori di distruzione per debugging
-                    print(f"ERRORE PULIZIA WIDGET: {e}")
-                    pass
+                if hasattr(child, '_set_scaling'):
+                    try:
+                        child._set_scaling = lambda x: None
+                    except:
+                        pass
+            
+            self.views.invalidate()
+            
+            # Widget eventualmente creati fuori dalla cache
+            for child in list(self.main_frame.winfo_children()):
+                self._destroy_widget_safely(child)
         except Exception as e:
             print(f"ERRORE PULIZIA VISTA: {e}")
         
@@ -232,9 +324,11 @@ class PasswordManagerApp(ctk.CTk):
             # Reset variabili
             self.current_user = None
             
-            print("Logout completato, tornando al login")
-            # Torna al login
+            # Torna al login prima di distruggere la dashboard visibile
             self._show_login()
+            self._invalidate_user_views()
+            
+            print("Logout completato")
             
         except Exception as e:
             print(f"Errore durante logout: {e}")
@@ -245,6 +339,10 @@ class PasswordManagerApp(ctk.CTk):
         try:
             print("Chiusura applicazione...")
             
+            if self._config_watch_job is not None:
+                self.after_cancel(self._config_watch_job)
+                self._config_watch_job = None
+            
             # Cleanup viste
             self._clear_current_view()
             
@@ -266,6 +364,10 @@ class PasswordManagerApp(ctk.CTk):
             # Chiudi database
             if hasattr(self.database, 'close'):
                 self.database.close()
+            
+            if self.diagnostics:
+                print(self.diagnostics.report())
+                self.diagnostics.stop()
                 
         except Exception as e:
             print(f"Errore durante chiusura: {e}")
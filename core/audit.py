@@ -0,0 +1,297 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .breach_corpus import get_breach_corpus
+from .config import config_manager
+from .password_strength import PasswordStrength, PasswordValidator
+
+# Versione 2: risultati crittografati con la chiave del vault (la 1 era in chiaro)
+AUDIT_FILE_VERSION = 2
+
+# Cambia quando cambiano i criteri di valutazione: i risultati salvati vanno ricalcolati
+AUDIT_RULES_VERSION = 1
+
+# Problemi segnalati dall'audit -> etichetta mostrata nel report
+ISSUES = {
+    "weak": "Debole",
+    "reused": "Riutilizzata",
+    "old": "Vecchia",
+    "breached": "Compromessa",
+    "unreadable": "Non decrittabile",
+}
+
+# Contesto dell'HMAC delle impronte: la chiave non coincide con quella del vault
+FINGERPRINT_CONTEXT = b"vault-audit-fingerprint-v1"
+
+
+@dataclass
+class EntryAudit:
+    """Risultato dell'audit di una password"""
+    id: str
+    site: str
+    username: str
+    strength: Optional[int]        # Livello di PasswordStrength (None se non decrittabile)
+    score: Optional[int]
+    breached: bool
+    updated_at: str
+    age_days: Optional[int]
+    fingerprint: Optional[str] = None
+    reuse_count: int = 0           # Altre voci con la stessa password
+    issues: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AuditReport:
+    """Report dell'audit del vault"""
+    entries: List[EntryAudit]
+    generated_at: str
+    analyzed: int       # Password decrittate e valutate in questa esecuzione
+    cached: int         # Risultati riusati dall'audit precedente
+    elapsed_ms: float
+
+    def counts(self) -> Dict[str, int]:
+        """Numero di voci per problema"""
+        counts = {issue: 0 for issue in ISSUES}
+        for entry in self.entries:
+            for issue in entry.issues:
+                counts[issue] += 1
+        return counts
+
+    def sorted_entries(self, column: str, descending: bool = False) -> List[EntryAudit]:
+        """Voci ordinate su una colonna del report"""
+        key = AUDIT_SORT_KEYS.get(column, AUDIT_SORT_KEYS["issues"])
+        return sorted(self.entries, key=key, reverse=descending)
+
+
+# Chiavi di ordinamento del report (voci senza valore in fondo)
+AUDIT_SORT_KEYS: Dict[str, Callable[[EntryAudit], Tuple]] = {
+    "site": lambda entry: (entry.site.casefold(), entry.username.casefold()),
+    "username": lambda entry: (entry.username.casefold(), entry.site.casefold()),
+    "strength": lambda entry: (entry.strength if entry.strength is not None else -1, entry.site.casefold()),
+    "reuse": lambda entry: (-entry.reuse_count, entry.site.casefold()),
+    "age": lambda entry: (-(entry.age_days or 0), entry.site.casefold()),
+    "issues": lambda entry: (-len(entry.issues), entry.strength if entry.strength is not None else -1,
+                             entry.site.casefold()),
+}
+
+
+class VaultAuditor:
+    """
+    Audit del vault: password deboli, riutilizzate, vecchie e compromesse
+
+    Le password sono decrittate a blocchi su più thread e valutate con
+    PasswordValidator.analyze_many; il testo in chiaro resta solo nel blocco
+    che lo elabora. Il riutilizzo si rileva confrontando impronte HMAC con
+    una chiave derivata da quella del vault, mai le password in chiaro.
+
+    Impronte e punteggi sono salvati in <utente>.audit.json con un hash della
+    password crittografata: un nuovo audit decritta solo le voci cambiate.
+    Il file è crittografato con la chiave del vault, come le password: le
+    impronte uguali rivelerebbero i riutilizzi a chi ne ha una copia.
+    """
+
+    def __init__(self, database, validator: Optional[PasswordValidator] = None):
+        self.database = database
+        self.validator = validator or database.validator
+        self.max_age_days = config_manager.get('audit.max_age_days', 365)
+        self.weak_below = config_manager.get('audit.weak_below', PasswordStrength.GOOD.value)
+        self.batch_size = max(1, config_manager.get('audit.batch_size', 256))
+        self.workers = max(1, config_manager.get('audit.workers', 4))
+
+    def run(self, now: Optional[datetime] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None,
+            on_progress: Optional[Callable[[int, int], None]] = None) -> Optional[AuditReport]:
+        """
+        Esegue l'audit del vault dell'utente corrente
+
+        Pensato per un thread di background: lavora su una copia delle voci
+        e della chiave presa all'avvio.
+
+        Args:
+            now: Istante di riferimento per l'età delle password
+            is_cancelled: Interrompe l'audit (es. logout); il report non viene prodotto
+            on_progress: Chiamata con (voci valutate, voci da valutare) dopo ogni blocco
+
+        Returns:
+            Il report, None se annullato o se nessun utente è autenticato
+        """
+        start = time.perf_counter()
+        key = self.database.current_key
+        user = self.database.current_user
+        if not key or not user:
+            return None
+
+        now = now or datetime.now()
+        entries = [dict(entry) for entry in self.database.get_passwords()]
+        path = self.database.users_dir / f"{user}.audit.json"
+        fingerprint_key = hmac.new(key, FINGERPRINT_CONTEXT, hashlib.sha256).digest()
+        key_id = hmac.new(fingerprint_key, b"key-id", hashlib.sha256).hexdigest()[:16]
+
+        cache = self._load_cache(path, key, key_id)
+        results: Dict[str, Dict] = {}
+        changed: List[Dict] = []
+        for entry in entries:
+            token = self._token(entry)
+            cached = cache.get(entry["id"])
+            if cached is not None and cached.get("token") == token:
+                results[entry["id"]] = cached
+            else:
+                changed.append(entry)
+
+        # Decrittazione e valutazione a blocchi su più thread
+        batches = [changed[i:i + self.batch_size] for i in range(0, len(changed), self.batch_size)]
+        done = 0
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(self._audit_batch, batch, key, fingerprint_key, is_cancelled)
+                       for batch in batches]
+            for future in futures:
+                batch_results = future.result()
+                if batch_results is None or (is_cancelled and is_cancelled()):
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return None
+                results.update(batch_results)
+                done += len(batch_results)
+                if on_progress:
+                    on_progress(done, len(changed))
+
+        report = self._build_report(entries, results, now, len(changed), len(entries) - len(changed))
+        self._save_cache(path, key, key_id, {entry_id: result for entry_id, result in results.items()
+                                        if result.get("strength") is not None})
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+        return report
+
+    def _audit_batch(self, batch: List[Dict], key: bytes, fingerprint_key: bytes,
+                     is_cancelled: Optional[Callable[[], bool]]) -> Optional[Dict[str, Dict]]:
+        """Decritta e valuta un blocco; le password in chiaro non escono da qui"""
+        if is_cancelled and is_cancelled():
+            return None
+
+        passwords = self.database.decrypt_batch([entry["password"] for entry in batch], key)
+        readable = [(entry, password) for entry, password in zip(batch, passwords) if password is not None]
+        analyses = self.validator.analyze_many([password for _, password in readable])
+
+        results: Dict[str, Dict] = {}
+        for entry in batch:
+            # Voci non decrittabili: segnalate e non salvate, si riprova al prossimo audit
+            results[entry["id"]] = {"token": self._token(entry), "strength": None, "score": None,
+                                    "breached": False, "fingerprint": None}
+        for (entry, password), analysis in zip(readable, analyses):
+            results[entry["id"]] = {
+                "token": self._token(entry),
+                "strength": analysis.strength.value,
+                "score": analysis.score,
+                "breached": not analysis.criteria_met.get("no_common", True),
+                "fingerprint": hmac.new(fingerprint_key, password.encode("utf-8", "surrogatepass"),
+                                        hashlib.sha256).hexdigest()[:32],
+            }
+        return results
+
+    def _build_report(self, entries: List[Dict], results: Dict[str, Dict], now: datetime,
+                      analyzed: int, cached: int) -> AuditReport:
+        # Voci per impronta: più di una voce = password riutilizzata
+        by_fingerprint: Dict[str, int] = {}
+        for result in results.values():
+            fingerprint = result.get("fingerprint")
+            if fingerprint:
+                by_fingerprint[fingerprint] = by_fingerprint.get(fingerprint, 0) + 1
+
+        audits = []
+        for entry in entries:
+            result = results[entry["id"]]
+            updated_at = entry.get("updated_at") or entry.get("created_at") or ""
+            audit = EntryAudit(
+                id=entry["id"],
+                site=entry.get("site", ""),
+                username=entry.get("username", ""),
+                strength=result["strength"],
+                score=result["score"],
+                breached=result["breached"],
+                updated_at=updated_at,
+                age_days=self._age_days(updated_at, now),
+                fingerprint=result["fingerprint"],
+                reuse_count=by_fingerprint.get(result["fingerprint"], 1) - 1 if result["fingerprint"] else 0,
+            )
+            if audit.strength is None:
+                audit.issues.append("unreadable")
+            elif audit.strength < self.weak_below:
+                audit.issues.append("weak")
+            if audit.reuse_count:
+                audit.issues.append("reused")
+            if audit.age_days is not None and audit.age_days > self.max_age_days:
+                audit.issues.append("old")
+            if audit.breached:
+                audit.issues.append("breached")
+            audits.append(audit)
+
+        return AuditReport(audits, now.isoformat(), analyzed, cached, 0.0)
+
+    @staticmethod
+    def _token(entry: Dict) -> str:
+        # La password crittografata cambia a ogni modifica: il suo hash identifica la versione
+        return hashlib.blake2b(entry.get("password", "").encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _age_days(timestamp: str, now: datetime) -> Optional[int]:
+        try:
+            return max(0, (now - datetime.fromisoformat(timestamp)).days)
+        except (TypeError, ValueError):
+            return None
+
+    def _load_cache(self, path: Path, key: bytes, key_id: str) -> Dict[str, Dict]:
+        """Risultati dell'audit precedente (scartati se la chiave o le regole sono cambiate)"""
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # File di versioni precedenti (in chiaro) o di un'altra chiave: si ricalcola tutto
+            if data.get("version") != AUDIT_FILE_VERSION or data.get("key_id") != key_id:
+                return {}
+            cache = json.loads(self.database.decrypt_blob(data["data"], key))
+        except Exception as e:
+            print(f"Errore lettura risultati audit: {e}")
+            return {}
+        if cache.get("rules") != self._rules_signature():
+            return {}
+        return cache.get("entries", {})
+
+    def _save_cache(self, path: Path, key: bytes, key_id: str, results: Dict[str, Dict]) -> Tuple[bool, str]:
+        try:
+            cache = {
+                "rules": self._rules_signature(),
+                "entries": results,
+            }
+            data = {
+                "version": AUDIT_FILE_VERSION,
+                "key_id": key_id,
+                "data": self.database.encrypt_blob(json.dumps(cache, separators=(",", ":")).encode(), key),
+            }
+            # Scrittura atomica, come per i punteggi di utilizzo
+            temp_file = path.with_suffix(".tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_file, path)
+            return True, "Risultati audit salvati"
+        except Exception as e:
+            print(f"Errore salvataggio risultati audit: {e}")
+            return False, f"Errore salvando risultati audit: {str(e)}"
+
+    def _rules_signature(self) -> str:
+        """Identifica regole e liste di password compromesse usate per i punteggi salvati"""
+        common = hashlib.blake2b("\n".join(sorted(self.validator.common_passwords)).encode(),
+                                 digest_size=8).hexdigest()
+        corpus = get_breach_corpus()
+        return f"{AUDIT_RULES_VERSION}:{common}:{corpus.identity if corpus else '-'}"
+
+
+def report_to_rows(report: AuditReport, column: str = "issues", descending: bool = False) -> List[Dict]:
+    """Voci del report ordinate, come dizionari (per tabelle ed esportazione)"""
+    return [asdict(entry) for entry in report.sorted_entries(column, descending)]
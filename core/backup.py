@@ -1,20 +1,243 @@
+import copy
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+from .backup_targets import BackupTarget, create_target, file_sha256
+
+class BackupCatalog:
+    """
+    Catalogo dei backup con lo stato di upload verso ogni target
+    
+    Salvato come JSON accanto ai backup; la scrittura è atomica (file
+    temporaneo + rename) così un'interruzione non lascia il catalogo corrotto.
+    """
+    
+    def __init__(self, catalog_file: Path):
+        self.catalog_file = catalog_file
+        self._lock = threading.RLock()
+        self._data = {"version": 1, "backups": {}}
+        self._load()
+    
+    def _load(self):
+        """Carica il catalogo dal file"""
+        try:
+            if self.catalog_file.exists():
+                with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data.get("backups"), dict):
+                    self._data = data
+        except Exception as e:
+            print(f"Errore caricando catalogo backup: {e}")
+    
+    def save(self):
+        """Salva il catalogo in modo atomico"""
+        with self._lock:
+            try:
+                temp_file = self.catalog_file.with_name(self.catalog_file.name + ".tmp")
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._data, f, indent=2, ensure_ascii=False)
+                os.replace(temp_file, self.catalog_file)
+            except Exception as e:
+                print(f"Errore salvando catalogo backup: {e}")
+    
+    def register(self, filepath: Path) -> Dict:
+        """Registra (o aggiorna) un file di backup nel catalogo"""
+        with self._lock:
+            stat = filepath.stat()
+            entry = self._data["backups"].get(filepath.name)
+            
+            # Ricalcola il checksum solo se il file è cambiato
+            if not entry or entry.get("size") != stat.st_size or entry.get("mtime") != stat.st_mtime:
+                entry = {
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "sha256": file_sha256(filepath),
+                    "registered_at": datetime.now().isoformat(),
+                    "targets": {}
+                }
+                self._data["backups"][filepath.name] = entry
+                self.save()
+            
+            return entry
+    
+    def target_state(self, filename: str, target: BackupTarget) -> Dict:
+        """
+        Copia dello stato di upload di un backup verso un target (ripristinato se il file è cambiato)
+        
+        Il target aggiorna la copia fuori dal lock; le modifiche tornano nel
+        catalogo solo tramite update_target_state, così save() non serializza
+        mai un dizionario che un altro thread sta modificando.
+        """
+        with self._lock:
+            entry = self._data["backups"][filename]
+            state = entry["targets"].get(target.name)
+            
+            if (not state or state.get("sha256") != entry["sha256"]
+                    or state.get("chunk_size") != target.chunk_size):
+                state = {
+                    "type": target.type_name,
+                    "status": "pending",
+                    "size": entry["size"],
+                    "sha256": entry["sha256"],
+                    "chunk_size": target.chunk_size,
+                    "parts": {}
+                }
+                entry["targets"][target.name] = state
+            
+            return copy.deepcopy(state)
+    
+    def update_target_state(self, filename: str, target_name: str, state: Dict):
+        """Sostituisce lo stato di upload di un backup verso un target e salva il catalogo"""
+        with self._lock:
+            entry = self._data["backups"].get(filename)
+            if entry is None:
+                return
+            entry["targets"][target_name] = copy.deepcopy(state)
+            self.save()
+    
+    def get_uploads(self, filename: str) -> Dict[str, Dict]:
+        """Stati di upload di un backup per nome target"""
+        with self._lock:
+            entry = self._data["backups"].get(filename, {})
+            return {name: copy.deepcopy(state) for name, state in entry.get("targets", {}).items()}
+    
+    def entries(self) -> Dict[str, Dict]:
+        """Copia superficiale delle voci del catalogo"""
+        with self._lock:
+            return dict(self._data["backups"])
+    
+    def remove(self, filename: str):
+        """Rimuove un backup dal catalogo"""
+        with self._lock:
+            if self._data["backups"].pop(filename, None) is not None:
+                self.save()
 
 class BackupManager:
     """Gestore per backup e restore delle password"""
     
-    def __init__(self):
+    def __init__(self, targets: Optional[List[BackupTarget]] = None):
         # Directory per i backup
         self.backup_dir = Path(__file__).parent.parent / "data" / "backups"
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Catalogo con lo stato di replica di ogni backup
+        self.catalog = BackupCatalog(self.backup_dir / "catalog.json")
+        
+        # Target di replica (plugin): se non specificati vengono letti dalla configurazione
+        self.targets: Dict[str, BackupTarget] = {}
+        for target in (targets if targets is not None else self._load_configured_targets()):
+            self.add_target(target)
+    
+    def _load_configured_targets(self) -> List[BackupTarget]:
+        """Crea i target definiti in 'backup.targets' nel file di configurazione"""
+        from .config import config_manager
+        
+        targets = []
+        for target_config in config_manager.get('backup.targets', []) or []:
+            try:
+                targets.append(create_target(target_config))
+            except Exception as e:
+                print(f"Target di backup non valido {target_config.get('name', '?')}: {e}")
+        return targets
+    
+    def add_target(self, target: BackupTarget):
+        """Aggiunge un target di replica"""
+        self.targets[target.name] = target
+    
+    def remove_target(self, name: str):
+        """Rimuove un target di replica"""
+        self.targets.pop(name, None)
+    
+    def replicate_backup(self, filepath: str, target_names: Optional[List[str]] = None) -> Tuple[bool, str]:
+        """
+        Copia un backup sui target configurati, riprendendo eventuali upload interrotti
+        
+        Args:
+            filepath: Percorso del file di backup locale
+            target_names: Target da usare (default: tutti)
+            
+        Returns:
+            Tuple[bool, str]: (success, message)
+        """
+        backup_path = Path(filepath)
+        if not backup_path.exists():
+            return False, "File di backup non trovato"
+        
+        names = target_names if target_names is not None else list(self.targets)
+        if not names:
+            return True, "Nessun target di replica configurato"
+        
+        try:
+            self.catalog.register(backup_path)
+        except Exception as e:
+            return False, f"Errore registrando il backup: {str(e)}"
+        
+        failures = []
+        for name in names:
+            target = self.targets.get(name)
+            if not target:
+                failures.append(f"{name}: target sconosciuto")
+                continue
+            
+            state = self.catalog.target_state(backup_path.name, target)
+            if state.get("status") == "complete":
+                continue
+            
+            # Ogni checkpoint riporta nel catalogo (sotto lock) la copia aggiornata dal target
+            def checkpoint(state=state, name=name):
+                self.catalog.update_target_state(backup_path.name, name, state)
+            
+            state["status"] = "uploading"
+            state.pop("error", None)
+            checkpoint()
+            
+            try:
+                success, result = target.upload(backup_path, backup_path.name, state, checkpoint)
+            except Exception as e:
+                success, result = False, str(e)
+            
+            state["status"] = "complete" if success else "failed"
+            state["updated_at"] = datetime.now().isoformat()
+            if success:
+                state["location"] = result
+            else:
+                state["error"] = result
+                failures.append(f"{name}: {result}")
+            checkpoint()
+        
+        if failures:
+            return False, "Replica incompleta:\n" + "\n".join(failures)
+        return True, f"Backup replicato su {len(names)} target"
+    
+    def resume_pending_uploads(self) -> List[Tuple[str, bool, str]]:
+        """
+        Riprende gli upload non completati registrati nel catalogo
+        
+        Returns:
+            List[Tuple[str, bool, str]]: (filename, success, message) per ogni backup ripreso
+        """
+        results = []
+        for filename, entry in self.catalog.entries().items():
+            backup_path = self.backup_dir / filename
+            if not backup_path.exists():
+                continue
+            
+            pending = [
+                name for name in self.targets
+                if entry.get("targets", {}).get(name, {}).get("status") != "complete"
+            ]
+            if pending:
+                success, message = self.replicate_backup(str(backup_path), pending)
+                results.append((filename, success, message))
+        
+        return results
     
     def _derive_key_from_password(self, password: str, salt: bytes = None) -> bytes:
         """Deriva una chiave di crittografia dalla password master"""
@@ -84,6 +307,9 @@ class BackupManager:
                 f.write(salt)           # Primi 16 bytes = salt per derivazione chiave
                 f.write(encrypted_data) # Resto = payload crittografato
             
+            # Registra il nuovo backup nel catalogo (la replica sui target è separata)
+            self.catalog.register(filepath)
+            
             return True, str(filepath)
             
         except Exception as e:
@@ -169,7 +395,8 @@ class BackupManager:
                         "filepath": str(filepath),
                         "size": stat.st_size,
                         "created": datetime.fromtimestamp(stat.st_mtime),
-                        "metadata": self._extract_metadata_preview(filepath)
+                        "metadata": self._extract_metadata_preview(filepath),
+                        "uploads": self.catalog.get_uploads(filepath.name)
                     }
                     
                     backups.append(backup_info)
@@ -251,6 +478,7 @@ class BackupManager:
                 return False, "File non nella directory di backup"
             
             backup_path.unlink()
+            self.catalog.remove(backup_path.name)
             return True, "Backup eliminato con successo"
             
         except Exception as e:
@@ -0,0 +1,367 @@
+import base64
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+# Dimensione predefinita dei blocchi copiati in parallelo
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+# S3 richiede parti di almeno 5 MiB (tranne l'ultima) negli upload multipart
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def plan_chunks(size: int, chunk_size: int) -> List[Tuple[int, int, int]]:
+    """
+    Suddivide un file in blocchi
+
+    Returns:
+        List[Tuple[int, int, int]]: lista di (indice, offset, lunghezza)
+    """
+    if size <= 0:
+        return [(0, 0, 0)]
+    return [
+        (index, offset, min(chunk_size, size - offset))
+        for index, offset in enumerate(range(0, size, chunk_size))
+    ]
+
+
+def file_sha256(filepath: Path, block_size: int = 1024 * 1024) -> str:
+    """Calcola lo SHA-256 di un file leggendolo a blocchi"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_chunk(filepath: Path, offset: int, length: int) -> bytes:
+    """Legge un singolo blocco dal file sorgente"""
+    with open(filepath, 'rb') as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+class BackupTarget(ABC):
+    """
+    Classe base per i target di destinazione dei backup
+
+    Ogni target riceve lo stato di upload del catalogo (un dict mutabile) e lo
+    aggiorna man mano che i blocchi vengono copiati, chiamando `checkpoint`
+    per renderlo persistente. In questo modo un upload interrotto può essere
+    ripreso dai soli blocchi mancanti.
+    """
+
+    type_name = "base"
+
+    def __init__(self, name: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.name = name
+        self.chunk_size = max(int(chunk_size), 1)
+        self.max_workers = max(int(max_workers), 1)
+
+    @abstractmethod
+    def upload(self, source: Path, remote_name: str, state: Dict, checkpoint: Callable[[], None]) -> Tuple[bool, str]:
+        """
+        Copia un file di backup sul target
+
+        Args:
+            source: File di backup locale
+            remote_name: Nome del file sul target
+            state: Stato di upload dal catalogo (size, sha256, parts, ...)
+            checkpoint: Callback per salvare lo stato dopo ogni blocco
+
+        Returns:
+            Tuple[bool, str]: (success, location_or_error_message)
+        """
+
+    @abstractmethod
+    def delete(self, remote_name: str) -> Tuple[bool, str]:
+        """Elimina una copia remota"""
+
+    def describe(self) -> str:
+        """Descrizione leggibile del target"""
+        return f"{self.type_name}:{self.name}"
+
+
+class LocalDirectoryTarget(BackupTarget):
+    """Target su directory locale o montata (disco esterno, share di rete)"""
+
+    type_name = "local"
+
+    def __init__(self, name: str, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = DEFAULT_MAX_WORKERS):
+        super().__init__(name, chunk_size, max_workers)
+        self.path = Path(path).expanduser()
+
+    def upload(self, source: Path, remote_name: str, state: Dict, checkpoint: Callable[[], None]) -> Tuple[bool, str]:
+        self.path.mkdir(parents=True, exist_ok=True)
+        destination = self.path / remote_name
+        partial = destination.with_name(destination.name + ".part")
+
+        size = state["size"]
+        parts = state.setdefault("parts", {})
+
+        # Senza file parziale non c'è nulla da riprendere
+        if not partial.exists():
+            parts.clear()
+
+        # Prealloca il file parziale così ogni blocco può essere scritto al suo offset
+        with open(partial, 'r+b' if partial.exists() else 'w+b') as f:
+            f.truncate(size)
+
+        chunks = plan_chunks(size, self.chunk_size)
+
+        # Verifica i blocchi già copiati prima di fidarsi del catalogo
+        for index, offset, length in chunks:
+            done = parts.get(str(index))
+            if done and hashlib.sha256(_read_chunk(partial, offset, length)).hexdigest() != done.get("sha256"):
+                del parts[str(index)]
+
+        pending = [chunk for chunk in chunks if str(chunk[0]) not in parts]
+
+        def copy_chunk(index: int, offset: int, length: int) -> Tuple[int, str]:
+            data = _read_chunk(source, offset, length)
+            with open(partial, 'r+b') as out:
+                out.seek(offset)
+                out.write(data)
+                out.flush()
+                os.fsync(out.fileno())
+            return index, hashlib.sha256(data).hexdigest()
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(copy_chunk, *chunk) for chunk in pending]
+            for future in as_completed(futures):
+                try:
+                    index, digest = future.result()
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                parts[str(index)] = {"sha256": digest}
+                checkpoint()
+
+        if errors:
+            return False, f"Copia interrotta: {errors[0]}"
+
+        # Controllo finale sull'intero file prima di renderlo visibile
+        if file_sha256(partial) != state["sha256"]:
+            parts.clear()
+            checkpoint()
+            return False, "Checksum del file copiato non corrispondente"
+
+        os.replace(partial, destination)
+        return True, str(destination)
+
+    def delete(self, remote_name: str) -> Tuple[bool, str]:
+        try:
+            for candidate in (self.path / remote_name, self.path / f"{remote_name}.part"):
+                if candidate.exists():
+                    candidate.unlink()
+            return True, "Copia eliminata"
+        except Exception as e:
+            return False, f"Errore eliminando la copia: {str(e)}"
+
+    def describe(self) -> str:
+        return f"📁 {self.name} ({self.path})"
+
+
+class S3Target(BackupTarget):
+    """
+    Target su object storage compatibile S3 (AWS, MinIO, Ceph, ...)
+
+    Usa gli upload multipart: ogni blocco è una parte con Content-MD5,
+    l'UploadId viene salvato nel catalogo e, alla ripresa, le parti già
+    presenti sul server (verificate tramite ETag) non vengono ricaricate.
+    Richiede `boto3` (dipendenza opzionale, requirements-s3.txt), importato
+    solo quando il target viene usato.
+    """
+
+    type_name = "s3"
+
+    def __init__(self, name: str, bucket: str, endpoint_url: Optional[str] = None, prefix: str = "",
+                 region: str = "us-east-1", access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, max_workers: int = DEFAULT_MAX_WORKERS):
+        super().__init__(name, max(int(chunk_size), S3_MIN_PART_SIZE), max_workers)
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.prefix = prefix
+        self.region = region
+        self.access_key = access_key or os.environ.get("AWS_ACCESS_KEY_ID")
+        self.secret_key = secret_key or os.environ.get("AWS_SECRET_ACCESS_KEY")
+        self._client = None
+
+    def _get_client(self):
+        """Crea il client S3 al primo utilizzo"""
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError(
+                    f"Il target S3 '{self.name}' richiede il pacchetto opzionale 'boto3', non installato. "
+                    "Installalo con: pip install -r requirements-s3.txt"
+                )
+
+            self._client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                region_name=self.region,
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key
+            )
+        return self._client
+
+    def _key(self, remote_name: str) -> str:
+        return f"{self.prefix.rstrip('/')}/{remote_name}" if self.prefix else remote_name
+
+    @staticmethod
+    def _md5(data: bytes) -> Tuple[str, str]:
+        """Restituisce (hex, base64) dell'MD5 di un blocco"""
+        digest = hashlib.md5(data)
+        return digest.hexdigest(), base64.b64encode(digest.digest()).decode()
+
+    def _list_remote_parts(self, key: str, upload_id: str) -> Optional[Dict[int, str]]:
+        """Parti già caricate per un upload multipart, None se l'upload non esiste più"""
+        client = self._get_client()
+        remote_parts = {}
+        marker = 0
+        try:
+            while True:
+                response = client.list_parts(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id, PartNumberMarker=marker
+                )
+                for part in response.get("Parts", []):
+                    remote_parts[part["PartNumber"]] = part["ETag"].strip('"')
+                if not response.get("IsTruncated"):
+                    break
+                marker = response["NextPartNumberMarker"]
+        except client.exceptions.NoSuchUpload:
+            return None
+        return remote_parts
+
+    def upload(self, source: Path, remote_name: str, state: Dict, checkpoint: Callable[[], None]) -> Tuple[bool, str]:
+        client = self._get_client()
+        key = self._key(remote_name)
+        size = state["size"]
+        parts = state.setdefault("parts", {})
+        location = f"s3://{self.bucket}/{key}"
+
+        # File piccoli: una sola PUT con verifica MD5 lato server
+        if size <= self.chunk_size:
+            data = _read_chunk(source, 0, size)
+            md5_hex, md5_b64 = self._md5(data)
+            response = client.put_object(
+                Bucket=self.bucket, Key=key, Body=data, ContentMD5=md5_b64,
+                Metadata={"sha256": state["sha256"]}
+            )
+            if response["ETag"].strip('"') != md5_hex:
+                return False, "ETag restituito dal server non corrispondente"
+            parts.clear()
+            parts["0"] = {"sha256": hashlib.sha256(data).hexdigest(), "etag": md5_hex}
+            checkpoint()
+            return True, location
+
+        upload_id = state.get("upload_id")
+        remote_parts = self._list_remote_parts(key, upload_id) if upload_id else None
+
+        if remote_parts is None:
+            response = client.create_multipart_upload(
+                Bucket=self.bucket, Key=key, Metadata={"sha256": state["sha256"]}
+            )
+            state["upload_id"] = upload_id = response["UploadId"]
+            remote_parts = {}
+            parts.clear()
+            checkpoint()
+
+        # Tieni solo le parti confermate dal server con lo stesso ETag
+        for index in list(parts):
+            if remote_parts.get(int(index) + 1) != parts[index].get("etag"):
+                del parts[index]
+
+        chunks = plan_chunks(size, self.chunk_size)
+        pending = [chunk for chunk in chunks if str(chunk[0]) not in parts]
+
+        def upload_part(index: int, offset: int, length: int) -> Tuple[int, Dict[str, str]]:
+            data = _read_chunk(source, offset, length)
+            md5_hex, md5_b64 = self._md5(data)
+            response = client.upload_part(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                PartNumber=index + 1, Body=data, ContentMD5=md5_b64
+            )
+            etag = response["ETag"].strip('"')
+            if etag != md5_hex:
+                raise ValueError(f"ETag della parte {index + 1} non corrispondente")
+            return index, {"sha256": hashlib.sha256(data).hexdigest(), "etag": etag}
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(upload_part, *chunk) for chunk in pending]
+            for future in as_completed(futures):
+                try:
+                    index, part = future.result()
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                parts[str(index)] = part
+                checkpoint()
+
+        if errors:
+            return False, f"Upload interrotto: {errors[0]}"
+
+        client.complete_multipart_upload(
+            Bucket=self.bucket, Key=key, UploadId=upload_id,
+            MultipartUpload={"Parts": [
+                {"PartNumber": index + 1, "ETag": f'"{parts[str(index)]["etag"]}"'}
+                for index, _, _ in chunks
+            ]}
+        )
+        state.pop("upload_id", None)
+        checkpoint()
+
+        # Verifica che l'oggetto finale abbia la dimensione attesa
+        head = client.head_object(Bucket=self.bucket, Key=key)
+        if head["ContentLength"] != size:
+            return False, "Dimensione dell'oggetto remoto non corrispondente"
+
+        return True, location
+
+    def delete(self, remote_name: str) -> Tuple[bool, str]:
+        try:
+            self._get_client().delete_object(Bucket=self.bucket, Key=self._key(remote_name))
+            return True, "Copia eliminata"
+        except Exception as e:
+            return False, f"Errore eliminando la copia: {str(e)}"
+
+    def describe(self) -> str:
+        endpoint = self.endpoint_url or "AWS"
+        return f"☁️ {self.name} (s3://{self.bucket}/{self.prefix} @ {endpoint})"
+
+
+# Registro dei tipi di target disponibili (estendibile con register_target_type)
+TARGET_TYPES: Dict[str, type] = {
+    LocalDirectoryTarget.type_name: LocalDirectoryTarget,
+    S3Target.type_name: S3Target,
+}
+
+
+def register_target_type(type_name: str, target_class: type):
+    """Registra un nuovo tipo di target (plugin)"""
+    TARGET_TYPES[type_name] = target_class
+
+
+def create_target(target_config: Dict[str, Any]) -> BackupTarget:
+    """
+    Crea un target a partire dalla sua configurazione
+
+    Esempio:
+        create_target({"type": "local", "name": "usb", "path": "/media/usb/backups"})
+    """
+    options = dict(target_config)
+    type_name = options.pop("type", LocalDirectoryTarget.type_name)
+
+    target_class = TARGET_TYPES.get(type_name)
+    if not target_class:
+        raise ValueError(f"Tipo di target sconosciuto: {type_name}")
+
+    return target_class(**options)
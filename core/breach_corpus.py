@@ -0,0 +1,397 @@
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import config_manager
+
+# Intestazione del file indice: magic, versione, funzioni hash del Bloom,
+# dimensione degli hash, voci, bit del Bloom, identità del contenuto
+HEADER = struct.Struct("<4sHHIQQ16s")
+MAGIC = b"PMBC"
+INDEX_VERSION = 1
+
+# Le voci sono SHA-1 completi: la tabella conferma in modo esatto
+DIGEST_SIZE = 20
+
+# Probabilità di falsi positivi per il dimensionamento del Bloom (14,4 bit e
+# 10 hash per voce): solo una piccola frazione delle password non
+# compromesse arriva alla tabella
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+# Bloom a blocchi: tutti i bit di una voce stanno in 64 byte (una linea di
+# cache, una sola pagina del file), quindi il filtro legge una pagina sola.
+# I falsi positivi salgono a circa lo 0,3% con i valori di default
+BLOOM_BLOCK_BITS = 512
+
+# Tentativi di ricerca per interpolazione prima della bisezione
+INTERPOLATION_PROBES = 4
+
+# Hash letti e ordinati in memoria per ogni blocco della costruzione
+BUILD_CHUNK_SIZE = 1_000_000
+
+# Percorso dell'indice se security.breach_corpus non è configurato
+DEFAULT_INDEX_PATH = "data/breach_corpus.idx"
+
+_HASH_LINE = re.compile(r"[0-9A-Fa-f]{40}(:\d+)?")
+_PROJECT_DIR = Path(__file__).parent.parent
+
+
+def _load_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def password_digests(password: str) -> List[bytes]:
+    """
+    SHA-1 da cercare per una password
+
+    Le liste di hash (es. Have I Been Pwned) contengono la password esatta,
+    quelle in chiaro vengono indicizzate in minuscolo come common_passwords:
+    si cercano entrambe le forme.
+    """
+    digests = [hashlib.sha1(password.encode("utf-8", "surrogatepass")).digest()]
+    lowered = password.lower()
+    if lowered != password:
+        digests.append(hashlib.sha1(lowered.encode("utf-8", "surrogatepass")).digest())
+    return digests
+
+
+def _bloom_positions(digest: bytes, hashes: int, bits: int) -> Iterator[int]:
+    # Il primo hash sceglie il blocco, gli altri due i bit nel blocco (doppio hashing)
+    block = int.from_bytes(digest[:8], "little") % (bits // BLOOM_BLOCK_BITS) * BLOOM_BLOCK_BITS
+    h2 = int.from_bytes(digest[8:16], "little")
+    h3 = int.from_bytes(digest[16:20], "little") | 1
+    for i in range(hashes):
+        yield block + ((h2 + i * h3) & (BLOOM_BLOCK_BITS - 1))
+
+
+class BreachCorpus:
+    """
+    Lista di password compromesse indicizzata su disco
+
+    Il file contiene un filtro di Bloom seguito dalla tabella ordinata degli
+    SHA-1, entrambi letti tramite mmap: in memoria restano solo le pagine
+    toccate. Una password assente viene quasi sempre esclusa dal Bloom con
+    pochi accessi; le altre sono confermate con una ricerca binaria.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < HEADER.size:
+                raise ValueError(f"{self.path} non è un indice di password compromesse valido")
+            magic, version, self.hashes, digest_size, self.count, self.bloom_bits, identity = \
+                HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != INDEX_VERSION or digest_size != DIGEST_SIZE:
+                raise ValueError(f"{self.path} non è un indice di password compromesse valido")
+            # Accessi sparsi: niente lettura anticipata delle pagine vicine
+            if hasattr(self._map, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+                self._map.madvise(mmap.MADV_RANDOM)
+            if not self.bloom_bits or self.bloom_bits % BLOOM_BLOCK_BITS:
+                raise ValueError(f"Indice {self.path} non valido")
+            self._table_offset = HEADER.size + self.bloom_bits // 8
+            if len(self._map) != self._table_offset + self.count * DIGEST_SIZE:
+                raise ValueError(f"Indice {self.path} incompleto")
+        except Exception:
+            self.close()
+            raise
+        self.identity = identity.hex()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains(password)
+
+    def contains(self, password: str) -> bool:
+        """True se la password (o la sua forma minuscola) è nella lista"""
+        return any(self.contains_digest(digest) for digest in password_digests(password))
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """True se lo SHA-1 è nella lista (False se l'indice è stato chiuso)"""
+        data = self._map
+        if data is None:
+            return False
+        for position in _bloom_positions(digest, self.hashes, self.bloom_bits):
+            if not data[HEADER.size + (position >> 3)] >> (position & 7) & 1:
+                return False
+
+        # Conferma esatta nella tabella ordinata. Gli SHA-1 sono uniformi: la
+        # posizione stimata per interpolazione è quasi sempre a una o due
+        # pagine da quella giusta; dopo qualche tentativo si passa alla bisezione
+        low, high = 0, self.count - 1
+        low_key, high_key = 0, 1 << 64
+        target = int.from_bytes(digest[:8], "big")
+        probes = 0
+        while low <= high:
+            if probes < INTERPOLATION_PROBES and low_key <= target < high_key:
+                middle = low + (target - low_key) * (high - low + 1) // (high_key - low_key)
+                middle = min(max(middle, low), high)
+            else:
+                middle = (low + high) // 2
+            probes += 1
+            start = self._table_offset + middle * DIGEST_SIZE
+            current = data[start:start + DIGEST_SIZE]
+            if current < digest:
+                low = middle + 1
+                low_key = int.from_bytes(current[:8], "big")
+            elif current > digest:
+                high = middle - 1
+                high_key = int.from_bytes(current[:8], "big")
+            else:
+                return True
+        return False
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def build_index(source, destination, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                chunk_size: int = BUILD_CHUNK_SIZE,
+                on_progress: Optional[Callable[[str, int], None]] = None) -> Tuple[bool, str]:
+    """
+    Costruisce l'indice da una lista di password compromesse (una volta sola)
+
+    Ogni riga è uno SHA-1 esadecimale, eventualmente seguito da ':conteggio'
+    come negli export di Have I Been Pwned, oppure una password in chiaro
+    (indicizzata in minuscolo). Gli hash sono ordinati a blocchi su file
+    temporanei e poi fusi, quindi la memoria usata non dipende dalla
+    dimensione della lista.
+
+    Args:
+        source: File della lista
+        destination: File indice da creare (sostituito in modo atomico)
+        false_positive_rate: Probabilità di falsi positivi del filtro di Bloom
+        chunk_size: Hash ordinati in memoria per blocco
+        on_progress: Chiamata con (fase, voci elaborate)
+    """
+    import tempfile
+
+    source, destination = Path(source), Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    np = _load_numpy()
+    try:
+        with tempfile.TemporaryDirectory(dir=destination.parent) as directory:
+            runs = _sorted_runs(np, source, Path(directory), chunk_size, on_progress)
+
+            # Fusione dei blocchi senza duplicati; l'identità è l'hash del contenuto
+            table_path = Path(directory) / "table"
+            identity = hashlib.blake2b(digest_size=16)
+            count = 0
+            previous = None
+            with open(table_path, "wb") as table:
+                for digest in heapq.merge(*(_read_digests(run) for run in runs)):
+                    if digest != previous:
+                        table.write(digest)
+                        identity.update(digest)
+                        previous = digest
+                        count += 1
+
+            rate = min(max(false_positive_rate, 1e-9), 0.5)
+            bits = math.ceil(-max(count, 1) * math.log(rate) / math.log(2) ** 2)
+            bits = max(1, math.ceil(bits / BLOOM_BLOCK_BITS)) * BLOOM_BLOCK_BITS
+            hashes = max(1, round(bits / max(count, 1) * math.log(2)))
+            bloom = _build_bloom(np, table_path, count, hashes, bits, on_progress)
+
+            temp_file = destination.with_suffix(".tmp")
+            with open(temp_file, "wb") as f:
+                f.write(HEADER.pack(MAGIC, INDEX_VERSION, hashes, DIGEST_SIZE, count, bits, identity.digest()))
+                f.write(bloom)
+                with open(table_path, "rb") as table:
+                    while True:
+                        block = table.read(1 << 20)
+                        if not block:
+                            break
+                        f.write(block)
+            # Gli indici aperti vanno chiusi prima di sostituire il file
+            # (mmap e file aperto); il nuovo viene aperto al prossimo utilizzo
+            close_breach_corpora()
+            os.replace(temp_file, destination)
+
+        return True, f"Indice creato: {count} password compromesse in {destination}"
+    except Exception as e:
+        print(f"Errore costruzione indice password compromesse: {e}")
+        return False, f"Errore costruendo l'indice: {str(e)}"
+
+
+def _parse_line(line: str) -> Optional[bytes]:
+    line = line.rstrip("\r\n")
+    if not line:
+        return None
+    if _HASH_LINE.fullmatch(line):
+        return bytes.fromhex(line[:40])
+    return hashlib.sha1(line.lower().encode("utf-8", "surrogatepass")).digest()
+
+
+def _sorted_runs(np, source: Path, directory: Path, chunk_size: int,
+                 on_progress: Optional[Callable[[str, int], None]]) -> List[Path]:
+    """Legge la lista a blocchi e salva ogni blocco ordinato in un file"""
+    runs: List[Path] = []
+    chunk: List[bytes] = []
+    read = 0
+
+    def flush():
+        if not chunk:
+            return
+        if np is not None:
+            data = np.unique(np.frombuffer(b"".join(chunk), dtype=f"S{DIGEST_SIZE}")).tobytes()
+        else:
+            data = b"".join(sorted(set(chunk)))
+        path = directory / f"run{len(runs)}"
+        path.write_bytes(data)
+        runs.append(path)
+        chunk.clear()
+
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            digest = _parse_line(line)
+            if digest is None:
+                continue
+            chunk.append(digest)
+            read += 1
+            if len(chunk) >= chunk_size:
+                flush()
+                if on_progress:
+                    on_progress("lettura", read)
+    flush()
+    return runs
+
+
+def _read_digests(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(DIGEST_SIZE * 4096)
+            if not block:
+                return
+            for start in range(0, len(block), DIGEST_SIZE):
+                yield block[start:start + DIGEST_SIZE]
+
+
+def _build_bloom(np, table_path: Path, count: int, hashes: int, bits: int,
+                 on_progress: Optional[Callable[[str, int], None]]) -> bytes:
+    """Filtro di Bloom dagli hash della tabella (letti a blocchi)"""
+    block_size = DIGEST_SIZE * 65536
+    done = 0
+    if np is not None:
+        bloom = np.zeros(bits // 8, dtype=np.uint8)
+        with open(table_path, "rb") as table:
+            while True:
+                block = table.read(block_size)
+                if not block:
+                    break
+                digests = np.frombuffer(block, dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+                h1 = np.ascontiguousarray(digests[:, :8]).view("<u8").ravel()
+                h2 = np.ascontiguousarray(digests[:, 8:16]).view("<u8").ravel()
+                h3 = np.ascontiguousarray(digests[:, 16:20]).view("<u4").ravel().astype(np.uint64) | np.uint64(1)
+                start = (h1 % np.uint64(bits // BLOOM_BLOCK_BITS)) * np.uint64(BLOOM_BLOCK_BITS)
+                for i in range(hashes):
+                    positions = start + ((h2 + np.uint64(i) * h3) & np.uint64(BLOOM_BLOCK_BITS - 1))
+                    np.bitwise_or.at(bloom, (positions >> np.uint64(3)).astype(np.int64),
+                                     (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+                done += len(digests)
+                if on_progress:
+                    on_progress("filtro di Bloom", done)
+        return bloom.tobytes()
+
+    bloom = bytearray(bits // 8)
+    for digest in _read_digests(table_path):
+        for position in _bloom_positions(digest, hashes, bits):
+            bloom[position >> 3] |= 1 << (position & 7)
+        done += 1
+        if on_progress and done % 1_000_000 == 0:
+            on_progress("filtro di Bloom", done)
+    return bytes(bloom)
+
+
+# Indici aperti per percorso configurato (None: file assente o non valido)
+_corpora: Dict[str, Optional[BreachCorpus]] = {}
+_corpora_lock = threading.Lock()
+
+
+def index_path() -> Optional[Path]:
+    """Percorso dell'indice configurato (relativo alla cartella del progetto), None se disattivato"""
+    return _resolve(config_manager.get('security.breach_corpus', DEFAULT_INDEX_PATH))
+
+
+def _resolve(configured) -> Optional[Path]:
+    if not configured:
+        return None
+    path = Path(configured)
+    return path if path.is_absolute() else _PROJECT_DIR / path
+
+
+def get_breach_corpus() -> Optional[BreachCorpus]:
+    """
+    Indice delle password compromesse configurato, aperto al primo utilizzo
+
+    Chiamata a ogni validazione: dopo la prima costa due ricerche in un
+    dizionario. Con security.breach_corpus vuoto la lista è disattivata;
+    un indice creato con l'applicazione aperta viene usato dal riavvio.
+    """
+    configured = config_manager.get('security.breach_corpus', DEFAULT_INDEX_PATH)
+    try:
+        return _corpora[configured]
+    except KeyError:
+        pass
+
+    with _corpora_lock:
+        if configured not in _corpora:
+            corpus = None
+            path = _resolve(configured)
+            if path is not None and path.exists():
+                try:
+                    corpus = BreachCorpus(path)
+                except Exception as e:
+                    print(f"Errore apertura indice password compromesse: {e}")
+            _corpora[configured] = corpus
+        return _corpora[configured]
+
+
+def close_breach_corpora():
+    """Chiude gli indici aperti (file ricostruito): get_breach_corpus li riapre"""
+    with _corpora_lock:
+        for corpus in _corpora.values():
+            if corpus is not None:
+                corpus.close()
+        _corpora.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Indice delle password compromesse")
+    parser.add_argument("--build", metavar="LISTA", help="costruisce l'indice da una lista (hash SHA-1 o testo)")
+    parser.add_argument("--output", help=f"file indice (default: security.breach_corpus, {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--fp-rate", type=float, default=DEFAULT_FALSE_POSITIVE_RATE,
+                        help="probabilità di falsi positivi del filtro di Bloom")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        start = time.perf_counter()
+        success, message = build_index(args.build, args.output or index_path() or DEFAULT_INDEX_PATH, args.fp_rate,
+                                       on_progress=lambda phase, done: print(f"  {phase}: {done}"))
+        print(f"{message} ({time.perf_counter() - start:.1f} s)")
+        return 0 if success else 1
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -1,45 +1,56 @@
 import customtkinter as ctk
-from typing import Optional, Callable, Any
+from collections import deque
+from typing import Optional, Callable, Any, Dict, List
 from .theme import theme_manager
 from .config import config_manager
+from .fonts import font_registry
 
 class ThemedWidget:
     """Classe base per widget che supportano il tema automatico"""
     
     def __init__(self):
         self._theme_applied = False
+        self._applied_palette = None  # palette applicata l'ultima volta
         self._destroyed = False
         theme_manager.add_observer(self._update_theme)
-        # Usa after per applicare il tema iniziale
-        if hasattr(self, 'after'):
-            self.after(1, self._apply_theme)
-        else:
-            self._apply_theme()
+        # Il tema iniziale viene applicato nel prossimo passaggio batch
+        self._update_theme()
     
-    def _apply_theme(self):
-        """Applica il tema corrente al widget"""
+    def _apply_theme(self, colors: Optional[dict] = None, palette_key: Any = None):
+        """
+        Applica il tema corrente al widget
+        
+        Args:
+            colors: Palette già calcolata dal passaggio batch (None = la legge)
+            palette_key: Identifica la palette; se è quella già applicata il
+                widget non viene riconfigurato
+        """
         if self._destroyed:
             return
+        if palette_key is not None and palette_key == self._applied_palette:
+            return
         
         try:
             if hasattr(self, '_apply_theme_colors'):
-                self._apply_theme_colors()
+                self._apply_theme_colors(colors if colors is not None else theme_manager.get_colors())
             self._theme_applied = True
+            self._applied_palette = palette_key
         except Exception as e:
             print(f"Errore applicazione tema: {e}")
     
     def _update_theme(self):
         """
         Callback automatico per aggiornamento tema
-        Usa il sistema after() per garantire thread safety
+        
+        Non applica subito il tema: accoda il widget al passaggio batch del
+        theme manager, eseguito con after() nel thread principale una volta
+        per frame per tutti i widget in attesa.
         """
         if self._destroyed:
             return
         
-        # Utilizza after() per assicurarsi che l'aggiornamento avvenga nel thread principale
-        # Questo previene errori di concorrenza durante il cambio tema
         if hasattr(self, 'after'):
-            self.after(1, self._apply_theme)
+            theme_manager.request_apply(self)
         else:
             self._apply_theme()
     
@@ -50,7 +61,7 @@ class ThemedWidget:
         """
         self._destroyed = True
         try:
-            # Rimuove questo widget dalla lista degli observer del tema
+            # Rimuove questo widget dal registro degli observer del tema
             theme_manager.remove_observer(self._update_theme)
         except:
             # Ignora errori durante la rimozione (widget già rimosso)
@@ -72,8 +83,7 @@ class ThemedFrame(ThemedWidget, ctk.CTkFrame):
         ctk.CTkFrame.__init__(self, master, **kwargs)
         ThemedWidget.__init__(self)
     
-    def _apply_theme_colors(self):
-        colors = theme_manager.get_colors()
+    def _apply_theme_colors(self, colors: dict):
         color_map = {
             'primary': colors['primary'],
             'secondary': colors['secondary'],
@@ -94,8 +104,7 @@ class ThemedLabel(ThemedWidget, ctk.CTkLabel):
         ctk.CTkLabel.__init__(self, master, text=text, **kwargs)
         ThemedWidget.__init__(self)
     
-    def _apply_theme_colors(self):
-        colors = theme_manager.get_colors()
+    def _apply_theme_colors(self, colors: dict):
         color_map = {
             'primary': colors['text'],
             'secondary': colors['text_secondary'],
@@ -117,8 +126,7 @@ class ThemedButton(ThemedWidget, ctk.CTkButton):
         ctk.CTkButton.__init__(self, master, text=text, command=command, **kwargs)
         ThemedWidget.__init__(self)
     
-    def _apply_theme_colors(self):
-        colors = theme_manager.get_colors()
+    def _apply_theme_colors(self, colors: dict):
         
         if self.style == "primary":
             self.configure(
@@ -137,7 +145,7 @@ class ThemedButton(ThemedWidget, ctk.CTkButton):
         elif self.style == "danger":
             self.configure(
                 fg_color=colors['error'],
-                hover_color="#D32F2F",
+                hover_color=colors['error_hover'],
                 text_color="white"
             )
 
@@ -151,8 +159,7 @@ class ThemedEntry(ThemedWidget, ctk.CTkEntry):
         ctk.CTkEntry.__init__(self, master, **kwargs)
         ThemedWidget.__init__(self)
     
-    def _apply_theme_colors(self):
-        colors = theme_manager.get_colors()
+    def _apply_theme_colors(self, colors: dict):
         self.configure(border_color=colors['border'])
 
 class MessageDialog(ThemedWidget):
@@ -205,16 +212,16 @@ class MessageDialog(ThemedWidget):
         }
         
         icon_label = ThemedLabel(header_frame, text=icon_map.get(self.type, "ℹ️"))
-        icon_label.configure(font=ctk.CTkFont(size=14))
+        icon_label.configure(font=font_registry.sized(14))
         icon_label.pack(side="left", padx=(0, 8))
         
         title_label = ThemedLabel(header_frame, text=self.title, style="primary")
-        title_label.configure(font=ctk.CTkFont(size=13, weight="bold"))
+        title_label.configure(font=font_registry.sized(13, "bold"))
         title_label.pack(side="left")
         
         # Messaggio
         message_label = ThemedLabel(self.main_frame, text=self.message, style="secondary")
-        message_label.configure(font=ctk.CTkFont(size=12))
+        message_label.configure(font=font_registry.get("body"))
         message_label.pack(pady=(0, 12))
         
         # Pulsante OK
@@ -228,7 +235,7 @@ class MessageDialog(ThemedWidget):
         )
         ok_button.pack()
 
-    def _apply_theme_colors(self):
+    def _apply_theme_colors(self, colors: dict):
         # I colori vengono gestiti automaticamente dai componenti figli
         pass
     
@@ -320,13 +327,13 @@ def show_message(parent, title: str, message: str, message_type: str = "info"):
     
     # Icona
     icon_label = ThemedLabel(header_frame, text=icon, style="primary")
-    icon_label.configure(font=ctk.CTkFont(size=icon_size))
+    icon_label.configure(font=font_registry.sized(icon_size))
     icon_label.pack(side="left", padx=(0, 25))
     
     # Titolo
     title_label = ThemedLabel(header_frame, text=title, style="primary")
     title_label.configure(
-        font=ctk.CTkFont(size=title_font_size, weight="bold"),
+        font=font_registry.sized(title_font_size, "bold"),
         text_color=type_color
     )
     title_label.pack(side="left", fill="x", expand=True, anchor="w")
@@ -343,7 +350,7 @@ def show_message(parent, title: str, message: str, message_type: str = "info"):
     
     message_textbox = ctk.CTkTextbox(
         message_frame,
-        font=ctk.CTkFont(size=font_size),
+        font=font_registry.sized(font_size),
         wrap="word",
         height=textbox_height,
         fg_color=colors['secondary'],
@@ -372,7 +379,7 @@ def show_message(parent, title: str, message: str, message_type: str = "info"):
         width=button_width,
         height=button_height
     )
-    ok_button.configure(font=ctk.CTkFont(size=font_size + 1, weight="bold"))
+    ok_button.configure(font=font_registry.sized(font_size + 1, "bold"))
     ok_button.pack(anchor="center")
     
     # Focus sul pulsante OK
@@ -382,6 +389,143 @@ def show_message(parent, title: str, message: str, message_type: str = "info"):
     dialog.bind("<Return>", lambda e: dialog.destroy())
     dialog.bind("<Escape>", lambda e: dialog.destroy())
 
+class ToastManager:
+    """
+    Notifiche non bloccanti per gli eventi di routine (copia, salvataggio...)
+    
+    Ogni finestra ha un solo overlay, creato al primo messaggio e poi
+    riusato: le notifiche si impilano nell'angolo in basso a destra, si
+    chiudono da sole (o con un click) e le righe vengono riciclate. Oltre
+    il numero massimo visibile i messaggi attendono in coda; un messaggio
+    identico a uno ancora visibile non ne crea un altro ma ne aggiorna il
+    contatore e la durata. I dialog modali restano per errori da leggere
+    e conferme.
+    """
+    
+    MAX_QUEUE = 10
+    
+    # Colore del bordo per tipo di messaggio (chiave della palette)
+    TYPE_COLORS = {
+        "info": "accent",
+        "success": "success",
+        "warning": "warning",
+        "error": "error"
+    }
+    
+    def __init__(self, window):
+        self.window = window
+        self.duration_ms = config_manager.ui.toast_duration_ms
+        self.max_visible = config_manager.ui.toast_max_visible
+        
+        # Overlay trasparente posizionato sopra il contenuto della finestra
+        self.container = ctk.CTkFrame(window, fg_color="transparent")
+        self._rows: List[ThemedFrame] = []       # righe create (riusate)
+        self._visible: List[Dict[str, Any]] = []  # notifiche mostrate, dalla più vecchia
+        self._queue: deque = deque(maxlen=self.MAX_QUEUE)
+    
+    @classmethod
+    def for_window(cls, widget) -> "ToastManager":
+        """Gestore della finestra che contiene il widget (creato al primo uso)"""
+        window = widget.winfo_toplevel()
+        manager = getattr(window, '_toast_manager', None)
+        if manager is None:
+            manager = cls(window)
+            window._toast_manager = manager
+        return manager
+    
+    def show(self, message: str, message_type: str = "info", duration_ms: Optional[int] = None):
+        """Mostra (o accoda) una notifica"""
+        duration_ms = duration_ms or self.duration_ms
+        
+        # Messaggio ripetuto: si aggiorna quello visibile
+        for toast in self._visible:
+            if toast["message"] == message and toast["type"] == message_type:
+                toast["count"] += 1
+                toast["label"].configure(text=f"{message}  ×{toast['count']}")
+                self._schedule_dismiss(toast, duration_ms)
+                return
+        
+        if len(self._visible) >= self.max_visible:
+            if (message, message_type, duration_ms) not in self._queue:
+                self._queue.append((message, message_type, duration_ms))
+            return
+        
+        self._display(message, message_type, duration_ms)
+    
+    def _display(self, message: str, message_type: str, duration_ms: int):
+        row = self._rows[len(self._visible)] if len(self._visible) < len(self._rows) else self._create_row()
+        colors = theme_manager.get_colors()
+        row.configure(border_color=colors[self.TYPE_COLORS.get(message_type, "accent")])
+        row.label.configure(text=message)
+        
+        toast = {"message": message, "type": message_type, "count": 1,
+                 "row": row, "label": row.label, "job": None}
+        row.toast = toast
+        self._visible.append(toast)
+        self._schedule_dismiss(toast, duration_ms)
+        self._layout()
+    
+    def _create_row(self) -> ThemedFrame:
+        row = ThemedFrame(self.container, style="surface", corner_radius=8, border_width=2)
+        row.label = ThemedLabel(row, text="", style="primary", justify="left", wraplength=320)
+        row.label.configure(font=font_registry.get("body"))
+        row.label.pack(padx=14, pady=10)
+        row.toast = None
+        for widget in (row, row.label):
+            widget.bind("<Button-1>", lambda e, row=row: row.toast and self._dismiss(row.toast))
+        self._rows.append(row)
+        return row
+    
+    def _schedule_dismiss(self, toast: Dict[str, Any], duration_ms: int):
+        if toast["job"] is not None:
+            self.window.after_cancel(toast["job"])
+        toast["job"] = self.window.after(duration_ms, lambda: self._dismiss(toast))
+    
+    def _dismiss(self, toast: Dict[str, Any]):
+        if toast not in self._visible:
+            return
+        if toast["job"] is not None:
+            self.window.after_cancel(toast["job"])
+        self._visible.remove(toast)
+        
+        # Le righe restano in ordine: quella liberata passa in fondo al pool
+        self._rows.remove(toast["row"])
+        self._rows.append(toast["row"])
+        toast["row"].toast = None
+        
+        while self._queue and len(self._visible) < self.max_visible:
+            self._display(*self._queue.popleft())
+        self._layout()
+    
+    def _layout(self):
+        """Impila le notifiche visibili e nasconde l'overlay se non ce ne sono"""
+        for index, row in enumerate(self._rows):
+            if index < len(self._visible):
+                row.pack(fill="x", pady=(6, 0))
+            else:
+                row.pack_forget()
+        
+        if self._visible:
+            self.container.place(relx=1.0, rely=1.0, x=-20, y=-20, anchor="se")
+            self.container.lift()
+        else:
+            self.container.place_forget()
+
+def show_toast(parent, message: str, message_type: str = "info", duration_ms: Optional[int] = None):
+    """
+    Mostra una notifica non bloccante nella finestra del widget
+    
+    Da usare al posto di show_message per conferme di routine che non
+    richiedono una risposta (password copiata, salvata, generata...).
+    
+    Args:
+        parent: Widget della finestra in cui mostrare la notifica
+        message: Testo della notifica
+        message_type: Tipo di messaggio ("info", "success", "warning", "error")
+        duration_ms: Durata prima della chiusura automatica (default da configurazione)
+    """
+    ToastManager.for_window(parent).show(message, message_type, duration_ms)
+
 def create_theme_toggle(parent):
     """Crea un toggle per cambiare tema"""
     import customtkinter as ctk
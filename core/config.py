@@ -1,27 +1,172 @@
 import json
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
+
+# Etichette dei livelli di forza (0-5) se mancano nella configurazione
+DEFAULT_STRENGTH_LEVELS = ("Molto Debole", "Debole", "Discreta", "Buona", "Forte", "Molto Forte")
+
+def _section(flat: Dict[str, Any], path: str) -> Mapping[str, Any]:
+    """Sotto-dizionario in sola lettura (vuoto se manca o non è un dizionario)"""
+    value = flat.get(path)
+    return MappingProxyType(value) if isinstance(value, dict) else MappingProxyType({})
+
+@dataclass(frozen=True)
+class FontSpec:
+    size: int = 12
+    weight: str = "normal"
+
+@dataclass(frozen=True)
+class AppSection:
+    """Sezione 'app' della configurazione"""
+    title: str
+    width: int
+    height: int
+    min_width: int
+    min_height: int
+    view_cache_size: int
+    diagnostics: bool
+    deferred_imports: bool
+    config_watch_ms: int
+
+    @classmethod
+    def from_flat(cls, flat: Dict[str, Any]) -> "AppSection":
+        return cls(
+            title=flat.get('app.title', 'Password Manager'),
+            width=flat.get('app.geometry.width', 1000),
+            height=flat.get('app.geometry.height', 700),
+            min_width=flat.get('app.geometry.min_width', 800),
+            min_height=flat.get('app.geometry.min_height', 600),
+            view_cache_size=flat.get('app.view_cache_size', 4),
+            diagnostics=bool(flat.get('app.diagnostics', False)),
+            deferred_imports=bool(flat.get('app.deferred_imports', True)),
+            config_watch_ms=flat.get('app.config_watch_ms', 1000),
+        )
+
+@dataclass(frozen=True)
+class UISection:
+    """Sezione 'ui' della configurazione"""
+    fonts: Mapping[str, FontSpec]
+    spacing: Mapping[str, int]
+    toast_duration_ms: int
+    toast_max_visible: int
+
+    @classmethod
+    def from_flat(cls, flat: Dict[str, Any]) -> "UISection":
+        fonts = {
+            name: FontSpec(spec.get('size', 12), spec.get('weight', 'normal'))
+            for name, spec in _section(flat, 'ui.fonts').items() if isinstance(spec, dict)
+        }
+        return cls(
+            fonts=MappingProxyType(fonts),
+            spacing=_section(flat, 'ui.spacing'),
+            toast_duration_ms=flat.get('ui.toast.duration_ms', 2500),
+            toast_max_visible=flat.get('ui.toast.max_visible', 3),
+        )
+
+    def font(self, name: str) -> FontSpec:
+        """Preset di font (dimensione 12, peso normale se manca)"""
+        return self.fonts.get(name) or FontSpec()
+
+@dataclass(frozen=True)
+class ThemesSection:
+    """Sezione 'themes': colori personalizzati per modalità"""
+    light: Mapping[str, str]
+    dark: Mapping[str, str]
+
+    @classmethod
+    def from_flat(cls, flat: Dict[str, Any]) -> "ThemesSection":
+        return cls(light=_section(flat, 'themes.light'), dark=_section(flat, 'themes.dark'))
+
+    def colors(self, mode: str) -> Mapping[str, str]:
+        return self.dark if mode == "dark" else self.light
+
+@dataclass(frozen=True)
+class MessagesSection:
+    """Sezione 'messages' e testi mostrati a ogni aggiornamento dell'interfaccia"""
+    validation: Mapping[str, str]
+    success: Mapping[str, str]
+    errors: Mapping[str, str]
+    confirmations: Mapping[str, str]
+    strength_levels: Tuple[str, ...]   # password_generator.strength_levels, per livello 0-5
+
+    @classmethod
+    def from_flat(cls, flat: Dict[str, Any]) -> "MessagesSection":
+        return cls(
+            validation=_section(flat, 'messages.validation'),
+            success=_section(flat, 'messages.success'),
+            errors=_section(flat, 'messages.errors'),
+            confirmations=_section(flat, 'messages.confirmations'),
+            strength_levels=tuple(flat.get(f'password_generator.strength_levels.{level}', name)
+                                  for level, name in enumerate(DEFAULT_STRENGTH_LEVELS)),
+        )
+
+    def strength_name(self, level: int) -> str:
+        return self.strength_levels[level] if 0 <= level < len(self.strength_levels) else "Sconosciuta"
+
+class CompiledConfig:
+    """
+    Configurazione compilata: percorsi appiattiti e sezioni tipizzate
+
+    Costruita una volta per caricamento e mai modificata: reload() ne crea
+    una nuova e la sostituisce con un solo assegnamento, quindi chi la sta
+    leggendo vede sempre una configurazione coerente.
+    """
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self.flat: Dict[str, Any] = {}
+        self._flatten(raw, "")
+        self.app = AppSection.from_flat(self.flat)
+        self.ui = UISection.from_flat(self.flat)
+        self.themes = ThemesSection.from_flat(self.flat)
+        self.messages = MessagesSection.from_flat(self.flat)
+
+    def _flatten(self, node: Dict[str, Any], prefix: str):
+        # Anche i nodi intermedi sono indicizzati: get('app') restituisce la sezione
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            self.flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(value, f"{path}.")
 
 class ConfigManager:
     """Gestore centralizzato della configurazione dell'applicazione"""
     
     def __init__(self, config_file: str = None):
         self.config_file = config_file or Path(__file__).parent.parent / "config.json"
-        self._config = {}
+        self._compiled = CompiledConfig({})
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._reload_listeners: List[Callable[[], None]] = []
         self._load_config()
     
-    def _load_config(self):
-        """Carica la configurazione dal file JSON"""
+    def _load_config(self) -> bool:
+        """
+        Carica la configurazione dal file JSON
+        
+        Se il file non è leggibile si usa la configurazione di default al
+        primo caricamento, mentre a una ricarica si tiene quella attuale
+        (un salvataggio a metà non deve azzerare l'interfaccia).
+        """
+        config = None
+        self._file_stamp = self._stat()
         try:
-            if Path(self.config_file).exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
-            else:
-                print(f"File di configurazione non trovato: {self.config_file}")
-                self._config = self._get_default_config()
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            print(f"File di configurazione non trovato: {self.config_file}")
         except Exception as e:
             print(f"Errore caricando configurazione: {e}")
-            self._config = self._get_default_config()
+        
+        if config is None:
+            if self._compiled.raw:
+                return False
+            config = self._get_default_config()
+        
+        self._compiled = CompiledConfig(config)
+        return True
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Configurazione di default in caso di errori"""
@@ -36,27 +181,38 @@ class ConfigManager:
             }
         }
     
+    @property
+    def _config(self) -> Dict[str, Any]:
+        return self._compiled.raw
+    
+    @property
+    def app(self) -> AppSection:
+        return self._compiled.app
+    
+    @property
+    def ui(self) -> UISection:
+        return self._compiled.ui
+    
+    @property
+    def themes(self) -> ThemesSection:
+        return self._compiled.themes
+    
+    @property
+    def messages(self) -> MessagesSection:
+        return self._compiled.messages
+    
     def get(self, path: str, default: Any = None) -> Any:
         """
         Ottiene un valore dalla configurazione usando la notazione punto
         
+        I percorsi sono precalcolati al caricamento: la lettura è una sola
+        ricerca in un dizionario.
+        
         Esempi:
         - config.get('app.title') -> "Password Manager"
         - config.get('login.username_label') -> "Nome Utente:"
         """
-        try:
-            keys = path.split('.')
-            value = self._config
-            
-            for key in keys:
-                if isinstance(value, dict) and key in value:
-                    value = value[key]
-                else:
-                    return default
-            
-            return value
-        except Exception:
-            return default
+        return self._compiled.flat.get(path, default)
     
     def format_message(self, path: str, **kwargs) -> str:
         """
@@ -75,15 +231,15 @@ class ConfigManager:
     
     def get_font_config(self, font_type: str = "body") -> Dict[str, Any]:
         """Ottiene la configurazione per un tipo di font"""
-        font_config = self.get(f'ui.fonts.{font_type}', {})
+        font = self.ui.font(font_type)
         return {
-            'size': font_config.get('size', 12),
-            'weight': font_config.get('weight', 'normal')
+            'size': font.size,
+            'weight': font.weight
         }
     
     def get_spacing(self, size: str = "medium") -> int:
         """Ottiene un valore di spaziatura"""
-        return self.get(f'ui.spacing.{size}', 10)
+        return self.ui.spacing.get(size, 10)
     
     def get_app_config(self) -> Dict[str, Any]:
         """Ottiene la configurazione dell'applicazione"""
@@ -93,9 +249,44 @@ class ConfigManager:
         """Ottiene un'icona dalla configurazione"""
         return self.get(f'icons.{icon_name}', '●')
     
-    def reload(self):
-        """Ricarica la configurazione dal file"""
-        self._load_config()
+    def add_reload_listener(self, listener: Callable[[], None]):
+        """Registra una callback chiamata dopo ogni reload()"""
+        if listener not in self._reload_listeners:
+            self._reload_listeners.append(listener)
+    
+    def reload(self) -> bool:
+        """Ricarica la configurazione dal file e avvisa chi ne ha derivato dei dati"""
+        if not self._load_config():
+            return False
+        for listener in list(self._reload_listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"Errore nel listener di ricarica configurazione: {e}")
+        return True
+    
+    def check_for_changes(self) -> bool:
+        """
+        Ricarica la configurazione se il file è cambiato dall'ultimo caricamento
+        
+        Costa una stat() del file: pensato per essere chiamato periodicamente
+        (vedi app.config_watch_ms).
+        
+        Returns:
+            True se la configurazione è stata ricaricata
+        """
+        stamp = self._stat()
+        if stamp == self._file_stamp:
+            return False
+        print("Configurazione modificata, ricarico...")
+        return self.reload()
+    
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
 
 # Istanza globale del gestore configurazione
 config_manager = ConfigManager()
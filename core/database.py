@@ -2,10 +2,47 @@ import json
 import os
 import base64
 import hashlib
+import threading
+import uuid
+from dataclasses import dataclass
+from enum import Enum
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-from cryptography.fernet import Fernet
+from typing import Callable, List, Dict, Tuple, Optional
+from core.frecency import FrecencyTracker
+from core.notes_index import NotesIndex
+from core.password_strength import PasswordValidator
+from core.query import compile_query, parse_query
+from core.search_index import SearchIndex
+from core.sort_index import SortedViews, strength_key
+
+# Password decrittate e valutate insieme nel calcolo della forza dopo il login
+RATING_BATCH_SIZE = 256
+
+def _fernet(key: bytes):
+    """
+    Cifratore Fernet per una chiave
+
+    cryptography viene importato al primo utilizzo (dopo il login) e non
+    all'avvio: la finestra di login non deve attenderne il caricamento.
+    """
+    from cryptography.fernet import Fernet
+    return Fernet(key)
+
+class ChangeKind(Enum):
+    ADDED = "added"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ACCESSED = "accessed"   # Password aperta o copiata (cambia solo la frecency)
+    INDEXED = "indexed"     # Indice costruito in background pronto (notificato da quel thread)
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Modifica a una password, notificata ai listener del database"""
+    kind: ChangeKind
+    entry_id: str
+    entry: Optional[Dict] = None      # Voce attuale (None se eliminata)
+    previous: Optional[Dict] = None   # Voce precedente (modifica ed eliminazione)
 
 class PasswordDatabase:
     """Database con crittografia selettiva - solo le password vengono crittografate"""
@@ -17,6 +54,24 @@ class PasswordDatabase:
         self.current_key: Optional[bytes] = None
         self.user_data: Optional[Dict] = None
         
+        # Indici di ricerca su sito/username e sulle note, aggiornati a ogni modifica
+        self.search_index = SearchIndex()
+        self.notes_index = NotesIndex()
+        # Punteggi di utilizzo: ordinamento "frecency" e bonus nella ricerca
+        self.frecency = FrecencyTracker()
+        self.sorted_views = SortedViews(self.get_passwords, {"frecency": self.frecency.sort_key,
+                                                             "strength": strength_key(self.search_index.strength_of)})
+        self.validator = PasswordValidator()
+        # False mentre la forza delle password viene calcolata dopo il login
+        self.strengths_ready = True
+        # Generazione della sessione (login e logout): i thread in background
+        # applicano i risultati solo se nel frattempo non è cambiata
+        self._session_lock = threading.Lock()
+        self._session = 0
+        
+        # Listener notificati a ogni password aggiunta, modificata o eliminata
+        self._change_listeners: List[Callable[[ChangeEvent], None]] = []
+        
         # Crea directory se non esistono
         self.data_dir.mkdir(exist_ok=True)
         self.users_dir.mkdir(exist_ok=True)
@@ -36,7 +91,7 @@ class PasswordDatabase:
     def _encrypt_password(self, password: str, key: bytes) -> str:
         """Cripta una singola password e restituisce la stringa base64"""
         try:
-            fernet = Fernet(key)
+            fernet = _fernet(key)
             encrypted_data = fernet.encrypt(password.encode())
             return base64.b64encode(encrypted_data).decode()
         except Exception as e:
@@ -45,13 +100,49 @@ class PasswordDatabase:
     def _decrypt_password(self, encrypted_password: str, key: bytes) -> str:
         """Decripta una singola password dalla stringa base64"""
         try:
-            fernet = Fernet(key)
+            fernet = _fernet(key)
             encrypted_data = base64.b64decode(encrypted_password)
             decrypted_data = fernet.decrypt(encrypted_data)
             return decrypted_data.decode()
         except Exception as e:
             raise Exception(f"Errore durante la decrittografia: {str(e)}")
 
+    def encrypt_blob(self, data: bytes, key: Optional[bytes] = None) -> str:
+        """
+        Cripta dati accessori del vault (es. risultati dell'audit) con la chiave dell'utente
+
+        Returns:
+            Il token Fernet come stringa, da salvare così com'è
+        """
+        return _fernet(key or self.current_key).encrypt(data).decode()
+
+    def decrypt_blob(self, token: str, key: Optional[bytes] = None) -> bytes:
+        """Decripta dati salvati con encrypt_blob (eccezione se la chiave non corrisponde)"""
+        return _fernet(key or self.current_key).decrypt(token.encode())
+
+    def decrypt_batch(self, encrypted_passwords: List[str], key: Optional[bytes] = None) -> List[Optional[str]]:
+        """
+        Decripta un blocco di password con un solo cifratore (audit del vault)
+
+        Args:
+            encrypted_passwords: Password crittografate, come salvate nelle voci
+            key: Chiave da usare (default: quella dell'utente corrente)
+
+        Returns:
+            Le password in chiaro, None per quelle non decrittabili
+        """
+        key = key or self.current_key
+        if not key:
+            return [None] * len(encrypted_passwords)
+        fernet = _fernet(key)
+        decrypted: List[Optional[str]] = []
+        for encrypted_password in encrypted_passwords:
+            try:
+                decrypted.append(fernet.decrypt(base64.b64decode(encrypted_password)).decode())
+            except Exception:
+                decrypted.append(None)
+        return decrypted
+
     def register_user(self, username: str, password: str) -> Tuple[bool, str]:
         """Registra un nuovo utente"""
         try:
@@ -124,6 +215,7 @@ class PasswordDatabase:
                 self.current_user = username
                 self.current_key = key
                 self.user_data = user_data
+                self._load_user_passwords()
                 
                 print(f"Login riuscito per: {username}")
                 return True, "Login riuscito"
@@ -157,7 +249,7 @@ class PasswordDatabase:
             key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
             
             try:
-                fernet = Fernet(key)
+                fernet = _fernet(key)
                 decrypted_data = fernet.decrypt(encrypted_data)
                 user_data = json.loads(decrypted_data.decode())
                 
@@ -177,6 +269,7 @@ class PasswordDatabase:
                 self.current_user = username
                 self.current_key = new_key
                 self.user_data = user_data
+                self._load_user_passwords()
                 
                 print(f"File migrato con successo per {username}")
                 return True, "Login riuscito (file migrato al nuovo formato)"
@@ -189,6 +282,103 @@ class PasswordDatabase:
             print(f"Errore durante migrazione legacy: {e}")
             return False, "File utente non leggibile"
 
+    def add_change_listener(self, listener: Callable[[ChangeEvent], None]):
+        """Registra un listener per le modifiche alle password"""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[ChangeEvent], None]):
+        """Rimuove un listener registrato con add_change_listener"""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _notify_change(self, event: ChangeEvent):
+        """Notifica una modifica a tutti i listener"""
+        for listener in list(self._change_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Errore nel listener delle modifiche: {e}")
+
+    def _load_user_passwords(self):
+        """Prepara le password dell'utente appena autenticato e ne costruisce l'indice"""
+        with self._session_lock:
+            self._session += 1
+        passwords = self.user_data.setdefault("passwords", [])
+        
+        # Le voci create prima degli identificativi ne ricevono uno; la forza,
+        # salvata in chiaro dalle versioni precedenti, viene tolta dal file
+        changed = False
+        for pwd in passwords:
+            if not pwd.get("id"):
+                pwd["id"] = uuid.uuid4().hex
+                changed = True
+            if pwd.pop("strength", None) is not None:
+                changed = True
+        if changed:
+            self._save_user_data()
+        
+        self.frecency.load(self.users_dir / f"{self.current_user}.usage.json",
+                           {pwd["id"] for pwd in passwords})
+        # Gli indici si costruiscono in background per non bloccare il login:
+        # finché non sono pronti le ricerche usano una scansione lineare
+        self.search_index.rebuild_async(passwords, on_ready=self._on_index_ready)
+        self.search_index.set_boosts(self.frecency.boosts())
+        self.sorted_views.clear()
+        self.notes_index.rebuild_async(passwords, on_ready=self._on_index_ready)
+        self._rate_passwords_async(passwords)
+
+    def _rate_passwords_async(self, passwords: List[Dict]):
+        """
+        Calcola in background la forza di tutte le password (ricerche weak:, ordinamento)
+
+        I livelli restano solo nell'indice di ricerca: salvarli nel vault
+        mostrerebbe in chiaro quali account sono deboli. Come nell'audit, le
+        password sono decrittate e valutate a blocchi e il testo in chiaro
+        resta solo nel blocco che lo elabora, sempre in questo processo.
+        """
+        snapshot = list(passwords)
+        key = self.current_key
+        with self._session_lock:
+            session = self._session
+            self.strengths_ready = False
+
+        def rate():
+            for start in range(0, len(snapshot), RATING_BATCH_SIZE):
+                if self._session != session:
+                    return
+                rated = self._rate_batch(snapshot[start:start + RATING_BATCH_SIZE], key)
+                # Un logout o un nuovo login nel frattempo rendono inutili questi livelli
+                with self._session_lock:
+                    if self._session != session:
+                        return
+                    self.search_index.set_strengths(rated)
+            with self._session_lock:
+                if self._session != session:
+                    return
+                self.sorted_views.invalidate("strength")
+                self.strengths_ready = True
+            self._on_index_ready()
+
+        threading.Thread(target=rate, name="strength-rating", daemon=True).start()
+
+    def _rate_batch(self, batch: List[Dict], key: bytes) -> List[Tuple[Dict, int]]:
+        """Decritta e valuta un blocco; le password in chiaro non escono da qui"""
+        decrypted = self.decrypt_batch([pwd["password"] for pwd in batch], key)
+        readable = [(pwd, password) for pwd, password in zip(batch, decrypted) if password is not None]
+        # Un solo worker: il pool di processi riceverebbe le password in chiaro
+        analyses = self.validator.analyze_many([password for _, password in readable], workers=1)
+        return [(pwd, analysis.strength.value) for (pwd, _), analysis in zip(readable, analyses)]
+
+    def _on_index_ready(self):
+        """
+        Un indice è pronto: le ricerche fatte nel frattempo possono dare più risultati
+
+        Viene chiamato dal thread in background: i listener non devono usare Tk
+        direttamente ma solo segnalare l'evento al proprio thread.
+        """
+        self._notify_change(ChangeEvent(ChangeKind.INDEXED, ""))
+
     def _save_user_data(self) -> Tuple[bool, str]:
         """
         Salva i dati dell'utente corrente nel file JSON
@@ -223,6 +413,66 @@ class PasswordDatabase:
         
         return self.user_data.get("passwords", [])
 
+    def get_sorted_passwords(self, order: str) -> List[Dict]:
+        """
+        Password dell'utente corrente nell'ordinamento indicato
+
+        Args:
+            order: Chiave di core.sort_index.SORT_ORDERS (es. "site", "updated")
+        """
+        return self.sorted_views.items(order)
+
+    def sort_position(self, order: str, entry_id: str) -> Optional[int]:
+        """Posizione di una password nell'ordinamento indicato (None = ordine di inserimento)"""
+        return self.sorted_views.position(order, entry_id)
+
+    def search(self, query: str, limit: Optional[int] = None,
+               is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[Dict]]:
+        """
+        Cerca le password per sito, username e note
+
+        Una query di solo testo usa la corrispondenza fuzzy su sito e username,
+        ordinata per rilevanza; seguono, in ordine di inserimento, le password
+        le cui note contengono tutti i termini (come prefissi di parola).
+
+        Una query con predicati (site:, user:, notes:, updated:, weak:, vedi
+        core.query) viene compilata in un piano sugli indici e restituisce
+        le password in ordine di inserimento.
+
+        Args:
+            query: Testo da cercare
+            limit: Numero massimo di risultati (None = tutti)
+            is_cancelled: Callback per interrompere la ricerca
+
+        Returns:
+            Le password trovate (tutte se la query è vuota), None se la ricerca è stata annullata
+        """
+        parsed = parse_query(query)
+        if parsed.is_invalid:
+            # Solo predicati non validi: la UI mostra gli errori, non tutto il vault
+            return []
+        if not parsed.is_plain:
+            plan = compile_query(parsed, self.search_index, self.notes_index, self._rate_entry)
+            return plan.execute(limit, is_cancelled)
+        
+        # Solo testo libero (i predicati non validi sono già stati scartati)
+        query = parsed.text
+        results = self.search_index.search_ranked(query, limit, is_cancelled)
+        if results is None or not query:
+            return results
+
+        if limit is None or len(results) < limit:
+            # Indice delle note non ancora pronto: solo sito e username
+            note_ids = self.notes_index.search(query)
+            if note_ids:
+                found = {pwd["id"] for pwd in results}
+                note_matches = self.search_index.get_entries(note_ids - found)
+                if limit is not None:
+                    note_matches = note_matches[:limit - len(results)]
+                results = results + note_matches
+        
+        return results
+
     def add_password(self, site: str, username: str, password: str, notes: str = "") -> Tuple[bool, str]:
         """Aggiunge una nuova password"""
         if not self.current_user or not self.current_key or not self.user_data:
@@ -239,6 +489,7 @@ class PasswordDatabase:
             
             # Aggiungi ai dati (tutto in chiaro tranne la password)
             password_entry = {
+                "id": uuid.uuid4().hex,
                 "site": site,
                 "username": username,
                 "password": encrypted_password,  # Solo questo è crittografato
@@ -248,6 +499,11 @@ class PasswordDatabase:
             }
             
             self.user_data["passwords"].append(password_entry)
+            self.search_index.add(password_entry)
+            self.search_index.set_strength(password_entry["id"], self._rate_password(password))
+            self.notes_index.add(password_entry)
+            self.sorted_views.add(password_entry)
+            self._notify_change(ChangeEvent(ChangeKind.ADDED, password_entry["id"], password_entry))
             
             # Salva
             success, message = self._save_user_data()
@@ -259,8 +515,84 @@ class PasswordDatabase:
         except Exception as e:
             return False, f"Errore aggiungendo password: {str(e)}"
 
-    def get_decrypted_password(self, site: str, username: str) -> Tuple[str, str]:
-        """Ottiene una password decriptata"""
+    def update_password(self, entry_id: str, site: str, username: str, password: str, notes: str = "") -> Tuple[bool, str]:
+        """Modifica una password esistente"""
+        if not self.current_user or not self.current_key or not self.user_data:
+            return False, "Utente non autenticato"
+        
+        try:
+            passwords = self.user_data["passwords"]
+            
+            index = next((i for i, pwd in enumerate(passwords) if pwd.get("id") == entry_id), None)
+            if index is None:
+                return False, "Password non trovata"
+            
+            # Il nuovo sito/username non deve coincidere con un'altra voce
+            for pwd in passwords:
+                if pwd.get("id") != entry_id and pwd["site"] == site and pwd["username"] == username:
+                    return False, "Password già esistente per questo sito e username"
+            
+            # La voce viene sostituita, non modificata sul posto: chi ne ha
+            # una copia (lista, ricerca in corso) continua a vedere quella vecchia
+            password_entry = dict(passwords[index])
+            password_entry.update({
+                "site": site,
+                "username": username,
+                "password": self._encrypt_password(password, self.current_key),
+                "notes": notes,
+                "updated_at": datetime.now().isoformat()
+            })
+            
+            previous = passwords[index]
+            passwords[index] = password_entry
+            self.search_index.update(password_entry)
+            self.search_index.set_strength(entry_id, self._rate_password(password))
+            self.notes_index.update(password_entry)
+            self.sorted_views.update(password_entry)
+            self._notify_change(ChangeEvent(ChangeKind.UPDATED, entry_id, password_entry, previous))
+            
+            success, message = self._save_user_data()
+            if success:
+                return True, "Password aggiornata con successo"
+            else:
+                return False, f"Errore salvando: {message}"
+                
+        except Exception as e:
+            return False, f"Errore aggiornando password: {str(e)}"
+
+    def _rate_password(self, password: str) -> int:
+        """Livello di forza di una password in chiaro (tenuto solo in memoria)"""
+        return self.validator.analyze_password(password).strength.value
+
+    def _rate_entry(self, entry: Dict) -> Optional[int]:
+        """
+        Livello di forza di una voce non ancora valutata in background
+
+        Decritta la password e conserva il livello nell'indice, così le
+        ricerche successive non la decrittano di nuovo.
+        """
+        if not self.current_key:
+            return None
+        try:
+            level = self._rate_password(self._decrypt_password(entry["password"], self.current_key))
+        except Exception:
+            return None
+        self.search_index.set_strength(entry["id"], level)
+        self.sorted_views.defer(entry, "strength")
+        return level
+
+    def strength_of(self, entry: Dict) -> Optional[int]:
+        """Livello di forza di una password, None se non ancora valutata"""
+        return self.search_index.strength_of(entry["id"])
+
+    def get_decrypted_password(self, site: str, username: str, track_access: bool = True) -> Tuple[str, str]:
+        """
+        Ottiene una password decriptata
+
+        Args:
+            track_access: Conta l'accesso nella frecency (False per backup e
+                controlli interni, che non sono un uso della password)
+        """
         if not self.current_user or not self.current_key or not self.user_data:
             return "", "Utente non autenticato"
         
@@ -269,6 +601,8 @@ class PasswordDatabase:
                 if pwd["site"] == site and pwd["username"] == username:
                     # Decripta SOLO la password
                     decrypted_password = self._decrypt_password(pwd["password"], self.current_key)
+                    if track_access:
+                        self.record_access(pwd["id"])
                     return decrypted_password, "Successo"
             
             return "", "Password non trovata"
@@ -276,6 +610,20 @@ class PasswordDatabase:
         except Exception as e:
             return "", f"Errore decrittando: {str(e)}"
 
+    def record_access(self, entry_id: str):
+        """Registra l'uso di una password (apertura, copia negli appunti)"""
+        entry = self.search_index.get_entries([entry_id])
+        if not self.current_user or not entry:
+            return
+        
+        # I punteggi si salvano a blocchi nel file di utilizzo, non nel vault
+        self.frecency.record(entry_id)
+        # La lista mostrata non cambia ordine sotto il cursore: la voce si
+        # riposiziona al prossimo aggiornamento completo della lista
+        self.sorted_views.defer(entry[0], "frecency")
+        self.search_index.set_boost(entry_id, self.frecency.boost(entry_id))
+        self._notify_change(ChangeEvent(ChangeKind.ACCESSED, entry_id, entry[0], entry[0]))
+
     def delete_password(self, site: str, username: str) -> Tuple[bool, str]:
         """Elimina una password"""
         if not self.current_user or not self.current_key or not self.user_data:
@@ -286,7 +634,12 @@ class PasswordDatabase:
             
             for i, pwd in enumerate(passwords):
                 if pwd["site"] == site and pwd["username"] == username:
-                    passwords.pop(i)
+                    removed = passwords.pop(i)
+                    self.search_index.remove(removed.get("id"))
+                    self.notes_index.remove(removed.get("id"))
+                    self.sorted_views.remove(removed.get("id"))
+                    self.frecency.remove(removed.get("id"))
+                    self._notify_change(ChangeEvent(ChangeKind.DELETED, removed.get("id"), previous=removed))
                     success, message = self._save_user_data()
                     if success:
                         return True, "Password eliminata con successo"
@@ -321,9 +674,21 @@ class PasswordDatabase:
         except Exception as e:
             return f"Errore debug file {username}: {str(e)}"
 
+    def close(self):
+        """Salva i dati in sospeso (chiusura dell'applicazione)"""
+        self.frecency.flush()
+
     def logout(self):
         """Logout dell'utente corrente"""
+        with self._session_lock:
+            self._session += 1
+        self.frecency.flush()
+        self.frecency.clear()
         self.current_user = None
         self.current_key = None
         self.user_data = None
+        self.search_index.clear()
+        self.notes_index.clear()
+        self.sorted_views.clear()
+        self.strengths_ready = True
         print("Logout completato")
@@ -0,0 +1,328 @@
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Frame salvati per ogni allocazione: bastano per risalire al modulo che cresce
+TRACE_FRAMES = 5
+
+# Righe mostrate nel confronto fra snapshot
+TOP_STATS = 10
+
+# Cicli iniziali esclusi dal calcolo della crescita (cache, font, import pigri)
+WARMUP_CYCLES = 3
+
+# Crescita massima accettata dallo stress test, in byte per ciclo
+MAX_GROWTH_PER_CYCLE = 64 * 1024
+
+
+@dataclass
+class Sample:
+    """Misura dello stato dell'applicazione in un istante"""
+    label: str
+    traced_bytes: int
+    widgets: Dict[str, int] = field(default_factory=dict)
+    observers: Dict[str, int] = field(default_factory=dict)
+    scaling: Dict[str, int] = field(default_factory=dict)
+    snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def widget_total(self) -> int:
+        return sum(self.widgets.values())
+
+
+def themed_widget_counts() -> Dict[str, int]:
+    """ThemedWidget vivi per classe (dopo una garbage collection)"""
+    from .components import ThemedWidget
+
+    counts: Dict[str, int] = {}
+    for obj in gc.get_objects():
+        if isinstance(obj, ThemedWidget):
+            name = type(obj).__name__
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def scaling_tracker_sizes() -> Dict[str, int]:
+    """Dimensioni dei dizionari dello ScalingTracker di CustomTkinter"""
+    try:
+        import customtkinter as ctk
+        tracker = ctk.windows.widgets.scaling.scaling_tracker.ScalingTracker
+    except Exception:
+        return {}
+
+    widgets_dict = getattr(tracker, 'window_widgets_dict', {})
+    return {
+        "windows": len(widgets_dict),
+        "callbacks": sum(len(callbacks) for callbacks in widgets_dict.values()),
+        "dpi_windows": len(getattr(tracker, 'window_dpi_scaling_dict', {})),
+    }
+
+
+def growth_per_cycle(values: List[float], warmup: int = WARMUP_CYCLES) -> float:
+    """
+    Crescita media per ciclo (pendenza ai minimi quadrati) dopo il riscaldamento
+
+    La pendenza è meno sensibile del confronto primo/ultimo alle oscillazioni
+    dell'allocatore fra un ciclo e l'altro.
+    """
+    values = values[warmup:] if len(values) > warmup + 1 else values
+    count = len(values)
+    if count < 2:
+        return 0.0
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(count))
+    return numerator / denominator
+
+
+class Diagnostics:
+    """
+    Diagnostica dei leak di widget e memoria (opzionale)
+
+    Misura ThemedWidget vivi per classe, observer del tema, dizionari dello
+    ScalingTracker e memoria tracciata da tracemalloc prima e dopo ogni
+    cambio di vista. Ogni misura esegue una garbage collection completa,
+    quindi va abilitata solo per indagare (app.diagnostics in config.json).
+    """
+
+    def __init__(self, keep_snapshots: bool = True):
+        self.keep_snapshots = keep_snapshots
+        self.samples: List[Sample] = []
+        self._started_tracing = False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+
+    @classmethod
+    def install(cls, app) -> "Diagnostics":
+        """Collega la diagnostica ai cambi di vista dell'applicazione"""
+        diagnostics = cls()
+        app.views.transition_listeners.append(diagnostics.on_transition)
+        diagnostics.measure("avvio")
+        return diagnostics
+
+    def on_transition(self, name: str, phase: str):
+        """Listener di ViewCache: misura prima e dopo ogni cambio di vista"""
+        if phase in ("before", "after"):
+            self.measure(f"{phase}:{name}")
+
+    def measure(self, label: str, widgets: bool = True) -> Sample:
+        """Registra una misura (dopo una garbage collection completa)"""
+        gc.collect()
+        from .theme import theme_manager
+
+        sample = Sample(
+            label=label,
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            widgets=themed_widget_counts() if widgets else {},
+            observers=theme_manager.observers.stats(),
+            scaling=scaling_tracker_sizes(),
+        )
+        if self.keep_snapshots:
+            # Per ogni etichetta restano solo il primo e l'ultimo snapshot
+            previous = [s for s in self.samples if s.label == label and s.snapshot is not None]
+            for old in previous[1:]:
+                old.snapshot = None
+            sample.snapshot = tracemalloc.take_snapshot()
+        self.samples.append(sample)
+        return sample
+
+    def cycles(self, label: str) -> List[Sample]:
+        """Misure con l'etichetta indicata (una per ciclo)"""
+        return [sample for sample in self.samples if sample.label == label]
+
+    def report(self, label: Optional[str] = None) -> str:
+        """
+        Rapporto di crescita fra le misure con la stessa etichetta
+
+        Args:
+            label: Etichetta dei cicli da confrontare (default: la più frequente)
+        """
+        if not self.samples:
+            return "Diagnostica: nessuna misura"
+
+        if label is None:
+            labels = [sample.label for sample in self.samples]
+            label = max(set(labels), key=labels.count)
+        cycles = self.cycles(label)
+        first, last = cycles[0], cycles[-1]
+
+        lines = [f"Diagnostica '{label}': {len(cycles)} cicli"]
+        lines.append(f"  memoria: {first.traced_bytes / 1024:.1f} KiB -> {last.traced_bytes / 1024:.1f} KiB, "
+                     f"{growth_per_cycle([s.traced_bytes for s in cycles]) / 1024:+.2f} KiB/ciclo")
+        lines.append(f"  ThemedWidget: {first.widget_total} -> {last.widget_total}")
+        for name in sorted(set(first.widgets) | set(last.widgets)):
+            before, after = first.widgets.get(name, 0), last.widgets.get(name, 0)
+            if before != after:
+                lines.append(f"    {name}: {before} -> {after} ({after - before:+d})")
+        lines.append(f"  observer tema: {first.observers.get('live', 0)} -> {last.observers.get('live', 0)} "
+                     f"(raccolti dal gc: {last.observers.get('collected', 0)})")
+        lines.append(f"  ScalingTracker: {first.scaling} -> {last.scaling}")
+
+        if first.snapshot is not None and last.snapshot is not None and first is not last:
+            lines.append("  allocazioni cresciute:")
+            stats = self._own_filtered(last.snapshot).compare_to(self._own_filtered(first.snapshot), "lineno")
+            for stat in [stat for stat in stats if stat.size_diff > 0][:TOP_STATS]:
+                lines.append(f"    {stat}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _own_filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        # Esclude le misure stesse della diagnostica e di tracemalloc
+        return snapshot.filter_traces([
+            tracemalloc.Filter(False, __file__, all_frames=True),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+
+    def stop(self):
+        """Ferma il tracciamento (se avviato da questa istanza)"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def stress_database(diagnostics: Diagnostics, cycles: int, size: int):
+    """Cicli login -> ricerca -> accessi -> logout sul database, senza interfaccia"""
+    import tempfile
+    from .database import PasswordDatabase
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = PasswordDatabase(directory)
+        database.register_user("stress", "Stress-Test-1!")
+        database.login("stress", "Stress-Test-1!")
+        for number in range(size):
+            database.add_password(f"site{number}.example.com", f"user{number}", f"Pw-{number}-x!",
+                                  notes=f"nota {number}")
+        database.logout()
+
+        for cycle in range(cycles):
+            success, message = database.login("stress", "Stress-Test-1!")
+            if not success:
+                raise RuntimeError(message)
+            _wait_indexes(database)
+            database.search("site1")
+            database.get_sorted_passwords("site")
+            database.get_decrypted_password(f"site{cycle % size}.example.com", f"user{cycle % size}")
+            database.logout()
+            diagnostics.measure("database", widgets=False)
+        database.close()
+
+
+def stress_views(diagnostics: Diagnostics, cycles: int, size: int):
+    """Cicli login -> dashboard -> backup -> logout sull'applicazione reale"""
+    import tempfile
+    from .app import PasswordManagerApp
+    from .database import PasswordDatabase
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = PasswordManagerApp()
+        app.withdraw()
+        app.database = PasswordDatabase(directory)
+        app.database.register_user("stress", "Stress-Test-1!")
+        app.database.login("stress", "Stress-Test-1!")
+        for number in range(size):
+            app.database.add_password(f"site{number}.example.com", f"user{number}", f"Pw-{number}-x!")
+        app.database.logout()
+
+        def settle():
+            # Esegue i callback after() in sospeso (passata del tema, caricamento a blocchi)
+            deadline = time.monotonic() + 0.2
+            while time.monotonic() < deadline:
+                app.update()
+
+        try:
+            for _ in range(cycles):
+                app.database.login("stress", "Stress-Test-1!")
+                app.current_user = "stress"
+                app._show_dashboard()
+                settle()
+                app._show_backup()
+                settle()
+                app._show_dashboard()
+                settle()
+                app._on_logout()
+                settle()
+                diagnostics.measure("views")
+        finally:
+            app._on_closing()
+
+
+def _wait_indexes(database, timeout: float = 5.0):
+    # Gli indici si costruiscono in background: si attende per non
+    # confondere la loro costruzione con una crescita della memoria
+    deadline = time.monotonic() + timeout
+    while (not (database.notes_index.ready and database.search_index.ready and database.strengths_ready)
+           and time.monotonic() < deadline):
+        time.sleep(0.01)
+
+
+def stress(cycles: int = 20, size: int = 200, max_growth: float = MAX_GROWTH_PER_CYCLE) -> bool:
+    """
+    Stress test dei leak: fallisce se la memoria cresce a ogni ciclo
+
+    I cicli delle viste richiedono un display; senza si eseguono solo
+    quelli del database.
+
+    Esecuzione: python -m core.diagnostics --stress [--cycles N] [--size N];
+    gli stessi cicli sono verificati da tests/test_diagnostics.py
+    """
+    diagnostics = Diagnostics(keep_snapshots=True)
+    suites: List[Tuple[str, Callable]] = [("database", stress_database)]
+    if _display_available():
+        suites.append(("views", stress_views))
+    else:
+        print("Display non disponibile: cicli delle viste saltati")
+
+    passed = True
+    try:
+        for label, suite in suites:
+            start = time.perf_counter()
+            suite(diagnostics, cycles, size)
+            elapsed = time.perf_counter() - start
+            growth = growth_per_cycle([s.traced_bytes for s in diagnostics.cycles(label)])
+            ok = growth <= max_growth
+            widgets = [s.widget_total for s in diagnostics.cycles(label)][WARMUP_CYCLES:]
+            if widgets and widgets[-1] > widgets[0]:
+                ok = False
+            passed = passed and ok
+            print(diagnostics.report(label))
+            print(f"  {'OK' if ok else 'FALLITO'}: {growth / 1024:+.2f} KiB/ciclo "
+                  f"(limite {max_growth / 1024:.0f}), {elapsed:.1f} s\n")
+    finally:
+        diagnostics.stop()
+    return passed
+
+
+def _display_available() -> bool:
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Diagnostica dei leak di widget e memoria")
+    parser.add_argument("--stress", action="store_true", help="esegue lo stress test dei leak")
+    parser.add_argument("--cycles", type=int, default=20, help="numero di cicli (default 20)")
+    parser.add_argument("--size", type=int, default=200, help="password nel vault di prova (default 200)")
+    parser.add_argument("--max-growth-kb", type=float, default=MAX_GROWTH_PER_CYCLE / 1024,
+                        help="crescita massima per ciclo in KiB")
+    args = parser.parse_args(argv)
+
+    if not args.stress:
+        parser.print_help()
+        return 0
+    return 0 if stress(args.cycles, args.size, args.max_growth_kb * 1024) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
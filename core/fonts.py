@@ -0,0 +1,68 @@
+import customtkinter as ctk
+from typing import Dict, Tuple
+from .config import config_manager
+
+# Ruoli -> (preset in ui.fonts, peso imposto o None per usare quello del preset)
+FONT_ROLES = {
+    "title": ("title", None),
+    "subtitle": ("subtitle", None),
+    "header": ("header", None),
+    "body": ("body", None),
+    "small": ("small", None),
+    "bold": ("body", "bold"),
+}
+
+class FontRegistry:
+    """
+    Font condivisi da tutti i componenti
+
+    Ogni CTkFont crea un font con nome in Tk: invece di crearne uno per
+    widget (es. due per ogni riga della lista) i componenti chiedono al
+    registro un font per ruolo o per dimensione, creato al primo utilizzo
+    e poi riusato. I CTkFont sono indipendenti dallo scaling (ogni widget
+    ne calcola la dimensione scalata), quindi lo stesso oggetto vale per
+    tutti i fattori di scala e un cambio di DPI non ricrea nessun font.
+    Alla ricarica della configurazione i font dei ruoli vengono
+    riconfigurati sul posto e i widget che li usano si aggiornano da soli.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[int, str], ctk.CTkFont] = {}
+        self._roles: Dict[str, ctk.CTkFont] = {}
+        config_manager.add_reload_listener(self._on_config_reload)
+
+    def __len__(self) -> int:
+        return len(self._fonts) + len(self._roles)
+
+    def get(self, role: str = "body") -> ctk.CTkFont:
+        """Font di un ruolo (title, subtitle, header, body, small, bold)"""
+        font = self._roles.get(role)
+        if font is None:
+            size, weight = self._role_config(role)
+            font = ctk.CTkFont(size=size, weight=weight)
+            self._roles[role] = font
+        return font
+
+    def sized(self, size: int, weight: str = "normal") -> ctk.CTkFont:
+        """Font condiviso di dimensione e peso indicati (per i casi senza ruolo)"""
+        key = (size, weight)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ctk.CTkFont(size=size, weight=weight)
+            self._fonts[key] = font
+        return font
+
+    def _role_config(self, role: str) -> Tuple[int, str]:
+        preset, weight = FONT_ROLES.get(role, (role, None))
+        font_config = config_manager.get_font_config(preset)
+        return font_config['size'], weight or font_config['weight']
+
+    def _on_config_reload(self):
+        """Applica le nuove dimensioni dei preset ai font dei ruoli già creati"""
+        for role, font in self._roles.items():
+            size, weight = self._role_config(role)
+            if font.cget("size") != size or font.cget("weight") != weight:
+                font.configure(size=size, weight=weight)
+
+# Istanza globale del registro dei font
+font_registry = FontRegistry()
@@ -0,0 +1,195 @@
+import json
+import math
+import os
+import time
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Dopo questo intervallo un accesso vale la metà
+HALF_LIFE_DAYS = 14.0
+
+# Le modifiche vengono salvate ogni N accessi o dopo questo intervallo (secondi)
+FLUSH_EVERY = 20
+FLUSH_INTERVAL = 60.0
+
+# Bonus di rilevanza nella ricerca: per ogni accesso (decaduto), fino al massimo
+BOOST_PER_USE = 8.0
+MAX_BOOST = 40.0
+
+# Sotto questo punteggio (accessi decaduti) una voce viene dimenticata al caricamento
+MIN_SCORE = 0.01
+
+# Riferimento dei tempi: tiene piccoli i valori salvati
+EPOCH = 1704067200.0  # 2024-01-01 UTC
+
+USAGE_FILE_VERSION = 1
+
+
+class FrecencyTracker:
+    """
+    Punteggi di frecency (frequenza + recenza) delle password
+
+    Ogni accesso vale 1 e decade esponenzialmente nel tempo. Per ogni voce
+    si salva ln(punteggio) + λt invece del punteggio: il decadimento è
+    uguale per tutte le voci, quindi questo valore non cambia con il
+    passare del tempo e l'ordinamento resta valido senza ricalcoli. Un
+    accesso al tempo t lo aggiorna con logaddexp(valore, λt).
+
+    La classifica di tutte le voci usate è mantenuta ordinata con bisect,
+    quindi le più usate sono disponibili subito dopo il login. I punteggi
+    sono salvati in un file separato dal vault (<utente>.usage.json), a
+    blocchi di accessi e non a ogni apertura di una password.
+    """
+
+    def __init__(self, half_life_days: float = HALF_LIFE_DAYS,
+                 flush_every: int = FLUSH_EVERY, flush_interval: float = FLUSH_INTERVAL):
+        self.half_life_days = half_life_days
+        self.decay = math.log(2) / (half_life_days * 86400)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self.path: Optional[Path] = None
+        self._values: Dict[str, float] = {}           # id password -> ln(punteggio) + λt
+        self._ranking: List[Tuple[float, str]] = []   # (-valore, id) dalla più usata
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._values
+
+    def load(self, path: Path, valid_ids: Optional[set] = None):
+        """
+        Carica i punteggi di un utente
+
+        Args:
+            path: File dei punteggi (creato al primo salvataggio)
+            valid_ids: Id delle password esistenti; gli altri vengono scartati
+        """
+        self.clear()
+        self.path = Path(path)
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Errore lettura punteggi di utilizzo: {e}")
+            return
+
+        # Valori salvati con un'altra emivita: si riportano al decadimento attuale
+        stored_decay = math.log(2) / (float(data.get("half_life_days", self.half_life_days)) * 86400)
+        now = self._now()
+        threshold = math.log(MIN_SCORE) + self.decay * now
+
+        for entry_id, value in data.get("values", {}).items():
+            if valid_ids is not None and entry_id not in valid_ids:
+                continue
+            if stored_decay != self.decay:
+                value = value - stored_decay * now + self.decay * now
+            if value >= threshold:
+                self._values[entry_id] = value
+
+        self._ranking = sorted((-value, entry_id) for entry_id, value in self._values.items())
+
+    def record(self, entry_id: str, weight: float = 1.0, now: Optional[float] = None):
+        """Registra un accesso a una password"""
+        t = self._now(now)
+        added = math.log(weight) + self.decay * t
+
+        value = self._values.get(entry_id)
+        if value is None:
+            value = added
+        else:
+            self._ranking.pop(bisect_left(self._ranking, (-value, entry_id)))
+            high, low = (value, added) if value >= added else (added, value)
+            value = high + math.log1p(math.exp(low - high))
+
+        self._values[entry_id] = value
+        insort(self._ranking, (-value, entry_id))
+
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def remove(self, entry_id: str):
+        """Dimentica una password eliminata"""
+        value = self._values.pop(entry_id, None)
+        if value is not None:
+            self._ranking.pop(bisect_left(self._ranking, (-value, entry_id)))
+            self._pending += 1
+
+    def score(self, entry_id: str, now: Optional[float] = None) -> float:
+        """Numero di accessi decaduti al momento indicato (0 se mai usata)"""
+        value = self._values.get(entry_id)
+        if value is None:
+            return 0.0
+        return math.exp(value - self.decay * self._now(now))
+
+    def top(self, count: int) -> List[str]:
+        """Id delle password più usate"""
+        return [entry_id for _, entry_id in self._ranking[:count]]
+
+    def boosts(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Bonus di rilevanza per la ricerca delle password usate"""
+        t = self.decay * self._now(now)
+        return {entry_id: self._boost(value, t) for entry_id, value in self._values.items()}
+
+    def boost(self, entry_id: str, now: Optional[float] = None) -> float:
+        """Bonus di rilevanza di una sola password (0 se mai usata)"""
+        value = self._values.get(entry_id)
+        if value is None:
+            return 0.0
+        return self._boost(value, self.decay * self._now(now))
+
+    @staticmethod
+    def _boost(value: float, t: float) -> float:
+        return min(MAX_BOOST, BOOST_PER_USE * math.exp(value - t))
+
+    def sort_key(self, entry: Dict) -> Tuple:
+        """
+        Chiave per core.sort_index: prima le più usate, poi le altre per
+        data di creazione
+        """
+        value = self._values.get(entry["id"])
+        return (-value if value is not None else math.inf, entry.get("created_at", ""), entry["id"])
+
+    def flush(self) -> Tuple[bool, str]:
+        """Salva i punteggi se ci sono modifiche non salvate"""
+        if not self._pending or self.path is None:
+            return True, "Nessuna modifica"
+
+        try:
+            data = {
+                "version": USAGE_FILE_VERSION,
+                "half_life_days": self.half_life_days,
+                "values": self._values,
+            }
+            # Scrittura atomica: un file troncato non deve far perdere i punteggi
+            temp_file = self.path.with_suffix(".tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_file, self.path)
+
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            return True, "Punteggi salvati"
+
+        except Exception as e:
+            print(f"Errore salvataggio punteggi di utilizzo: {e}")
+            return False, f"Errore salvando punteggi: {str(e)}"
+
+    def clear(self):
+        """Scarta i punteggi in memoria (senza salvarli)"""
+        self.path = None
+        self._values.clear()
+        self._ranking.clear()
+        self._pending = 0
+
+    @staticmethod
+    def _now(now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - EPOCH
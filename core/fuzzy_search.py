@@ -0,0 +1,151 @@
+import heapq
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Caratteri che separano le "parole" di un sito o di un username
+SEPARATORS = frozenset(" .-_@/:+")
+
+# Peso dei campi indicizzati (stesso ordine di SEARCH_FIELDS)
+FIELD_WEIGHTS = (1.0, 0.8)
+
+# Punteggi di base dei tre tipi di corrispondenza: con questi valori una
+# sottostringa esatta, anche nello username, supera sempre una sottosequenza
+EXACT_SCORE = 300.0
+SUBSEQUENCE_SCORE = 100.0
+TYPO_SCORE = 120.0
+
+PREFIX_BONUS = 60.0
+BOUNDARY_BONUS = 30.0
+FULL_MATCH_BONUS = 40.0
+GAP_PENALTY = 6.0
+POSITION_PENALTY = 1.0
+LENGTH_PENALTY = 0.05
+
+# Lunghezza minima della query per cercare anche gli errori di battitura
+TYPO_MIN_LENGTH = 4
+
+# Frazione minima di trigrammi in comune per considerare un errore di battitura
+TYPO_MIN_OVERLAP = 0.5
+
+# Una sottosequenza con più buchi che caratteri è rumore, non una corrispondenza
+MAX_GAPS_FACTOR = 1
+
+
+class FuzzyQuery:
+    """
+    Query fuzzy compilata una sola volta per tutta la ricerca
+
+    `pattern` riconosce la query come sottosequenza dentro un singolo campo:
+    ogni carattere salta solo fino alla prima occorrenza del successivo
+    (nessun backtracking) e non può attraversare il separatore tra i campi.
+    """
+
+    __slots__ = ("text", "length", "chars", "pattern")
+
+    def __init__(self, text: str, field_separator: str = "\x00"):
+        self.text = text
+        self.length = len(text)
+        self.chars = frozenset(text)
+
+        parts = [re.escape(text[0])] if text else []
+        for char in text[1:]:
+            escaped = re.escape(char)
+            parts.append(f"[^{escaped}{field_separator}]*{escaped}")
+        self.pattern = re.compile("".join(parts))
+
+
+def word_starts(text: str) -> List[int]:
+    """Posizioni in cui inizia una parola (inizio campo o dopo un separatore)"""
+    return [0] + [i + 1 for i, char in enumerate(text[:-1]) if char in SEPARATORS] if text else []
+
+
+def score_text(query: FuzzyQuery, text: str) -> float:
+    """
+    Punteggio di un singolo campo normalizzato (0 se non corrisponde)
+
+    Una sottostringa esatta vale più di una sottosequenza; in entrambi i casi
+    sono premiati l'inizio del campo e l'inizio di una parola, mentre buchi,
+    posizione e lunghezza del campo pesano come penalità minori.
+    """
+    # Chiamata per ogni candidato: niente funzioni di supporto nel percorso caldo
+    start = text.find(query.text)
+    if start >= 0:
+        score = EXACT_SCORE
+        if start == 0:
+            score += PREFIX_BONUS + (FULL_MATCH_BONUS if query.length == len(text) else 0.0)
+        elif text[start - 1] in SEPARATORS:
+            score += BOUNDARY_BONUS
+    else:
+        match = query.pattern.search(text)
+        if match is None:
+            return 0.0
+        start, end = match.span()
+        gaps = (end - start) - query.length
+        if gaps > query.length * MAX_GAPS_FACTOR:
+            return 0.0
+        score = SUBSEQUENCE_SCORE - gaps * GAP_PENALTY
+        if start == 0:
+            score += PREFIX_BONUS
+        elif text[start - 1] in SEPARATORS:
+            score += BOUNDARY_BONUS
+
+    score -= (start if start < 20 else 20) * POSITION_PENALTY + len(text) * LENGTH_PENALTY
+    return score if score > 1.0 else 1.0
+
+
+def score_fields(query: FuzzyQuery, fields: Sequence[str]) -> float:
+    """Miglior punteggio pesato tra i campi di una password"""
+    best = 0.0
+    for value, weight in zip(fields, FIELD_WEIGHTS):
+        score = score_text(query, value) * weight
+        if score > best:
+            best = score
+    return best
+
+
+def typo_score(overlap: float) -> float:
+    """Punteggio di un errore di battitura, proporzionale ai trigrammi in comune"""
+    return TYPO_SCORE * overlap
+
+
+def top_k(scored: Iterable[Tuple[float, int]], limit: Optional[int]) -> List[Tuple[float, int]]:
+    """
+    Migliori risultati (punteggio, documento) in ordine decrescente
+
+    Con un limite usa un heap di dimensione `limit`: solo i primi K vengono
+    mantenuti e ordinati, a parità di punteggio vince il documento più vecchio.
+    """
+    def key(item: Tuple[float, int]):
+        return item[0], -item[1]
+
+    if limit is None:
+        return sorted(scored, key=key, reverse=True)
+    return heapq.nlargest(limit, scored, key=key)
+
+
+def rank(query: str, candidates: Iterable[Tuple[int, Sequence[str]]], limit: Optional[int] = None,
+         is_cancelled: Optional[Callable[[], bool]] = None,
+         boosts: Optional[Dict[int, float]] = None) -> Optional[List[Tuple[float, int]]]:
+    """
+    Ordina per rilevanza una sequenza di (documento, campi normalizzati)
+
+    Funzione di base usata anche senza indice; SearchIndex.search_ranked
+    la affianca a una selezione dei candidati tramite le posting list.
+    `boosts` aggiunge un bonus ai documenti corrispondenti (es. frecency).
+    """
+    fuzzy = FuzzyQuery(query)
+    boosts = boosts or {}
+    cancelled = False
+
+    def scored():
+        nonlocal cancelled
+        for count, (doc, fields) in enumerate(candidates):
+            if is_cancelled and count % 2000 == 0 and is_cancelled():
+                cancelled = True
+                return
+            score = score_fields(fuzzy, fields)
+            if score:
+                yield score + boosts.get(doc, 0.0), doc
+
+    results = top_k(scored(), limit)
+    return None if cancelled else results
@@ -0,0 +1,194 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Token delle note: sequenze alfanumeriche (anche accentate), senza stemming
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Token normalizzati di un testo, nell'ordine in cui compaiono"""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class NotesIndex:
+    """
+    Indice invertito full-text sulle note delle password
+
+    Ogni token punta all'insieme degli id delle password che lo contengono.
+    Il vocabolario è mantenuto ordinato, quindi i termini di una query sono
+    cercati come prefissi con una ricerca binaria ("ban" trova "bancomat" e
+    "banca"); più termini sono in AND e gli insiemi vengono intersecati
+    partendo dal più piccolo.
+
+    La costruzione iniziale può avvenire in un thread separato: finché non è
+    pronta l'indice non risponde (`ready` è False) e le modifiche ricevute
+    nel frattempo vengono accodate e riapplicate sull'indice appena costruito.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}   # token -> id password
+        self._tokens: Dict[str, Set[str]] = {}     # id password -> token
+        self._vocabulary: List[str] = []           # token ordinati per la ricerca per prefisso
+        self._pending: List[Tuple[str, object]] = []
+        self._generation = 0
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def rebuild(self, entries: Iterable[Dict]):
+        """Ricostruisce l'indice nel thread chiamante"""
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._swap(*self._build(entries))
+
+    def rebuild_async(self, entries: Iterable[Dict], on_ready: Optional[Callable[[], None]] = None):
+        """
+        Ricostruisce l'indice in un thread di background
+
+        Args:
+            entries: Password da indicizzare (viene presa una copia della lista)
+            on_ready: Callback chiamata dal thread di background a indice pronto
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending.clear()
+            self._postings, self._tokens, self._vocabulary = {}, {}, []
+            self.ready = False
+
+        snapshot = list(entries)
+
+        def build():
+            postings, tokens = self._build(snapshot)
+            with self._lock:
+                # Un logout o un nuovo login nel frattempo rendono inutile questo indice
+                if generation != self._generation:
+                    return
+                self._swap(postings, tokens)
+            if on_ready:
+                on_ready()
+
+        threading.Thread(target=build, name="notes-index", daemon=True).start()
+
+    def clear(self):
+        """Svuota l'indice e annulla eventuali costruzioni in corso (logout)"""
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._postings, self._tokens, self._vocabulary = {}, {}, []
+            self.ready = False
+
+    def add(self, entry: Dict):
+        """Indicizza le note di una nuova password"""
+        self.update(entry)
+
+    def update(self, entry: Dict):
+        """Reindicizza le note di una password"""
+        with self._lock:
+            if not self.ready:
+                self._pending.append(("update", entry))
+                return
+            self._unindex(entry["id"])
+            self._index(entry["id"], set(tokenize(entry.get("notes", ""))))
+
+    def remove(self, entry_id: str):
+        """Rimuove una password dall'indice"""
+        with self._lock:
+            if not self.ready:
+                self._pending.append(("remove", entry_id))
+                return
+            self._unindex(entry_id)
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """
+        Id delle password le cui note contengono tutti i termini della query
+
+        Returns:
+            Insieme degli id trovati, None se l'indice non è ancora pronto
+        """
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+
+        with self._lock:
+            if not self.ready:
+                return None
+            if not terms:
+                return set()
+
+            # I termini più lunghi sono i più selettivi: si parte da quelli
+            matches: Optional[Set[str]] = None
+            for term in terms:
+                found = self._prefix_matches(term)
+                if matches is None:
+                    matches = found
+                else:
+                    matches = found & matches if len(found) < len(matches) else matches & found
+                if not matches:
+                    return set()
+            return matches
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        """Unione delle posting list dei token che iniziano con il prefisso"""
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+
+        found: Set[str] = set()
+        for position in range(start, len(vocabulary)):
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            found |= self._postings[token]
+        return found
+
+    @staticmethod
+    def _build(entries: Iterable[Dict]) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        postings: Dict[str, Set[str]] = {}
+        tokens: Dict[str, Set[str]] = {}
+        for entry in entries:
+            entry_tokens = set(tokenize(entry.get("notes", "")))
+            tokens[entry["id"]] = entry_tokens
+            for token in entry_tokens:
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = {entry["id"]}
+                else:
+                    posting.add(entry["id"])
+        return postings, tokens
+
+    def _swap(self, postings: Dict[str, Set[str]], tokens: Dict[str, Set[str]]):
+        """Attiva un indice costruito e riapplica le modifiche accodate"""
+        self._postings = postings
+        self._tokens = tokens
+        self._vocabulary = sorted(postings)
+        self.ready = True
+
+        pending, self._pending = self._pending, []
+        for action, value in pending:
+            if action == "update":
+                self.update(value)
+            else:
+                self.remove(value)
+
+    def _index(self, entry_id: str, entry_tokens: Set[str]):
+        self._tokens[entry_id] = entry_tokens
+        for token in entry_tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = {entry_id}
+                insort(self._vocabulary, token)
+            else:
+                posting.add(entry_id)
+
+    def _unindex(self, entry_id: str):
+        for token in self._tokens.pop(entry_id, ()):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(entry_id)
+            if not posting:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
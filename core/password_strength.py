@@ -1,9 +1,135 @@
-import re
+import hashlib
+import math
 import string
 import secrets
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from .breach_corpus import get_breach_corpus
+
+# Simboli contati come caratteri speciali
+SPECIAL_CHARS = "!@#$%^&*(),.?\":{}|<>"
+
+# Sequenze prevedibili: numeri, alfabeto e tastiera QWERTY
+SEQUENCES = (
+    "0123456789",
+    "abcdefghijklmnopqrstuvwxyz",
+    "qwertyuiopasdfghjklzxcvbnm",
+)
+
+# Tutte le terne consecutive delle sequenze, in entrambe le direzioni
+SEQUENCE_TRIGRAMS = frozenset(
+    trigram
+    for sequence in SEQUENCES
+    for i in range(len(sequence) - 2)
+    for trigram in (sequence[i:i + 3], sequence[i:i + 3][::-1])
+)
+
+# Classi di caratteri (bit): le prime quattro seguono le regex dei criteri
+# ([A-Z], [a-z], \d, simboli), le altre i metodi str usati per l'entropia
+ASCII_UPPER = 1
+ASCII_LOWER = 2
+DECIMAL = 4
+SPECIAL = 8
+UPPER = 16
+LOWER = 32
+DIGIT = 64
+
+# Analisi recenti ricordate dal validatore
+ANALYSIS_MEMO_SIZE = 256
+
+# Criteri di _check_criteria, nell'ordine del dizionario restituito
+CRITERIA = (
+    "length_8", "length_12", "length_16",
+    "uppercase", "lowercase", "numbers", "special_chars",
+    "no_common", "no_repeated", "no_sequential", "mixed_case", "entropy",
+)
+
+def _classify(char: str) -> int:
+    """Classi di un carattere"""
+    classes = 0
+    if "A" <= char <= "Z":
+        classes |= ASCII_UPPER
+    if "a" <= char <= "z":
+        classes |= ASCII_LOWER
+    if char.isdecimal():
+        classes |= DECIMAL
+    if char in SPECIAL_CHARS:
+        classes |= SPECIAL
+    if char.isupper():
+        classes |= UPPER
+    if char.islower():
+        classes |= LOWER
+    if char.isdigit():
+        classes |= DIGIT
+    return classes
+
+_ASCII_CLASSES = {chr(code): _classify(chr(code)) for code in range(128)}
+
+@dataclass(frozen=True)
+class CharacterProfile:
+    """Risultato della scansione di una password"""
+    length: int
+    classes: int              # Unione delle classi dei caratteri
+    upper_after_first: bool   # Maiuscola (Unicode) dopo il primo carattere
+    repeated: bool            # Tre caratteri identici consecutivi
+    sequential: bool          # Terna di una sequenza prevedibile
+
+    def has(self, classes: int) -> bool:
+        return bool(self.classes & classes)
+
+    @property
+    def entropy(self) -> float:
+        """Entropia = log2(dimensione del pool di caratteri) * lunghezza"""
+        pool_size = 0
+        if self.classes & LOWER:
+            pool_size += 26
+        if self.classes & UPPER:
+            pool_size += 26
+        if self.classes & DIGIT:
+            pool_size += 10
+        if self.classes & SPECIAL:
+            pool_size += 18
+        if pool_size > 0:
+            return math.log2(pool_size) * self.length
+        return 0
+
+def scan_password(password: str) -> CharacterProfile:
+    """
+    Scansione della password in un solo passaggio
+
+    Raccoglie le classi di caratteri e le ripetizioni carattere per
+    carattere; le sequenze sono cercate confrontando ogni terna della
+    password minuscola con SEQUENCE_TRIGRAMS.
+    """
+    classes = 0
+    upper_after_first = False
+    repeated = False
+    before_previous = previous = None
+    for position, char in enumerate(password):
+        char_classes = _ASCII_CLASSES.get(char)
+        if char_classes is None:
+            char_classes = _classify(char)
+        classes |= char_classes
+        if position and char_classes & UPPER:
+            upper_after_first = True
+        if char == previous == before_previous:
+            repeated = True
+        before_previous, previous = previous, char
+
+    # lower() può cambiare la lunghezza (es. 'İ'): le terne vanno cercate sul risultato
+    lowered = password.lower()
+    sequential = any(lowered[i:i + 3] in SEQUENCE_TRIGRAMS for i in range(len(lowered) - 2))
+
+    return CharacterProfile(
+        length=len(password),
+        classes=classes,
+        upper_after_first=upper_after_first,
+        repeated=repeated,
+        sequential=sequential,
+    )
 
 class PasswordStrength(Enum):
     VERY_WEAK = 0
@@ -41,11 +167,22 @@ class PasswordValidator:
             "shadow", "baseball", "696969", "12345678", "hottie", "loveme",
             "batman", "trustno1", "zaq12wsx", "qazwsx", "michael", "michelle"
         }
+        
+        # Analisi recenti (LRU): la chiave è un hash con chiave casuale della
+        # password, così la memoria non conserva le password in chiaro
+        self._memo: "OrderedDict[bytes, PasswordAnalysis]" = OrderedDict()
+        self._memo_key = secrets.token_bytes(16)
+        self._memo_lock = threading.Lock()
+        # Indice delle password compromesse usato per le analisi ricordate
+        self._memo_corpus: Optional[str] = None
     
     def analyze_password(self, password: str) -> PasswordAnalysis:
         """
         Analizza la forza di una password usando standard di sicurezza moderni
         
+        Le analisi recenti vengono riusate: il risultato è condiviso e non va
+        modificato.
+        
         Args:
             password: La password da analizzare
             
@@ -62,8 +199,63 @@ class PasswordValidator:
                 color="#F44336"  # Rosso per indicare pericolo
             )
         
+        key = hashlib.blake2b(password.encode("utf-8", "surrogatepass"),
+                              digest_size=16, key=self._memo_key).digest()
+        corpus = get_breach_corpus()
+        corpus_identity = corpus.identity if corpus is not None else None
+        with self._memo_lock:
+            # Un nuovo indice delle password compromesse cambia il criterio no_common
+            if corpus_identity != self._memo_corpus:
+                self._memo.clear()
+                self._memo_corpus = corpus_identity
+            analysis = self._memo.get(key)
+            if analysis is not None:
+                self._memo.move_to_end(key)
+                return analysis
+        
+        analysis = self._analyze(password)
+        with self._memo_lock:
+            self._memo[key] = analysis
+            if len(self._memo) > ANALYSIS_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return analysis
+    
+    def analyze_many(self, passwords: Sequence[str], workers: Optional[int] = None) -> List[PasswordAnalysis]:
+        """
+        Analizza molte password (audit del vault) con risultati identici a
+        analyze_password
+        
+        Usa NumPy se installato, altrimenti per lotti molto grandi un pool di
+        processi; vedi core.strength_batch. Le analisi con gli stessi criteri
+        sono condivise e non vanno modificate.
+        
+        Args:
+            passwords: Password in chiaro da analizzare
+            workers: Processi del pool (default: numero di CPU)
+        """
+        from .strength_batch import analyze_many
+        return analyze_many(self, passwords, workers)
+    
+    def is_common(self, password: str) -> bool:
+        """
+        True se la password è comune o compare in una violazione nota
+        
+        Oltre a common_passwords consulta l'indice delle password compromesse
+        configurato in security.breach_corpus (vedi core.breach_corpus), se
+        è stato costruito.
+        """
+        if password.lower() in self.common_passwords:
+            return True
+        corpus = get_breach_corpus()
+        return corpus is not None and corpus.contains(password)
+    
+    def _analyze(self, password: str) -> PasswordAnalysis:
+        """Analisi completa di una password non vuota"""
         # Esegue tutti i controlli di sicurezza
-        criteria = self._check_criteria(password)
+        return self._analysis_from_criteria(self._check_criteria(password), password)
+    
+    def _analysis_from_criteria(self, criteria: Dict[str, bool], password: str = "") -> PasswordAnalysis:
+        """Punteggio, livello, suggerimenti e colore dai criteri soddisfatti"""
         # Calcola un punteggio da 0 a 100 basato sui criteri soddisfatti
         score = self._calculate_score(password, criteria)
         # Determina il livello di forza generale
@@ -86,24 +278,25 @@ class PasswordValidator:
         Verifica tutti i criteri di sicurezza per una password
         Implementa le linee guida NIST e OWASP per la sicurezza delle password
         """
+        profile = scan_password(password)
         return {
             # Criteri di lunghezza progressivi
-            "length_8": len(password) >= 8,    # Minimo assoluto
-            "length_12": len(password) >= 12,  # Raccomandato
-            "length_16": len(password) >= 16,  # Ottimale per sicurezza massima
+            "length_8": profile.length >= 8,    # Minimo assoluto
+            "length_12": profile.length >= 12,  # Raccomandato
+            "length_16": profile.length >= 16,  # Ottimale per sicurezza massima
             
             # Varietà di caratteri (aumenta lo spazio delle possibilità)
-            "uppercase": bool(re.search(r'[A-Z]', password)),           # Lettere maiuscole
-            "lowercase": bool(re.search(r'[a-z]', password)),           # Lettere minuscole  
-            "numbers": bool(re.search(r'\d', password)),                # Cifre numeriche
-            "special_chars": bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password)),  # Simboli
+            "uppercase": profile.has(ASCII_UPPER),      # Lettere maiuscole
+            "lowercase": profile.has(ASCII_LOWER),      # Lettere minuscole
+            "numbers": profile.has(DECIMAL),            # Cifre numeriche
+            "special_chars": profile.has(SPECIAL),      # Simboli
             
             # Controlli avanzati per evitare pattern prevedibili
-            "no_common": password.lower() not in self.common_passwords,    # Non è una password comune
-            "no_repeated": not self._has_repeated_chars(password),          # Evita ripetizioni eccessive
-            "no_sequential": not self._has_sequential_chars(password),      # Evita sequenze prevedibili
-            "mixed_case": self._has_mixed_case(password),                   # Maiuscole e minuscole mischiate
-            "entropy": self._calculate_entropy(password) > 50              # Entropia sufficiente
+            "no_common": not self.is_common(password),                      # Non è comune né compromessa
+            "no_repeated": not profile.repeated,                            # Evita ripetizioni eccessive
+            "no_sequential": not profile.sequential,                        # Evita sequenze prevedibili
+            "mixed_case": profile.upper_after_first and profile.has(LOWER), # Maiuscole e minuscole mischiate
+            "entropy": profile.entropy > 50                                 # Entropia sufficiente
         }
     
     def _calculate_score(self, password: str, criteria: Dict[str, bool]) -> int:
@@ -224,73 +417,6 @@ class PasswordValidator:
             PasswordStrength.VERY_STRONG: "#4CAF50"   # Verde intenso - Eccellente
         }
         return colors[strength]
-    
-    def _has_repeated_chars(self, password: str) -> bool:
-        """
-        Verifica se la password contiene 3 o più caratteri identici consecutivi
-        Pattern come 'aaa' o '111' rendono la password più vulnerabile
-        """
-        for i in range(len(password) - 2):
-            if password[i] == password[i+1] == password[i+2]:
-                return True
-        return False
-    
-    def _has_sequential_chars(self, password: str) -> bool:
-        """
-        Cerca sequenze consecutive prevedibili nella password
-        Include sequenze numeriche, alfabetiche e di tastiera
-        """
-        # Definisce le sequenze comuni da evitare
-        sequences = [
-            "0123456789",                            # Sequenza numerica
-            "abcdefghijklmnopqrstuvwxyz",           # Alfabeto
-            "qwertyuiopasdfghjklzxcvbnm"            # Layout tastiera QWERTY
-        ]
-        
-        password_lower = password.lower()
-        for seq in sequences:
-            # Controlla sequenze di 3+ caratteri in entrambe le direzioni
-            for i in range(len(seq) - 2):
-                substring = seq[i:i+3]
-                # Verifica sia la sequenza normale che quella inversa
-                if substring in password_lower or substring[::-1] in password_lower:
-                    return True
-        return False
-    
-    def _has_mixed_case(self, password: str) -> bool:
-        """
-        Verifica se la password ha maiuscole e minuscole distribuite
-        Non solo la prima lettera maiuscola, ma un mix reale
-        """
-        # Esclude il primo carattere per evitare il bias della prima lettera maiuscola
-        has_upper = any(c.isupper() for c in password[1:])
-        has_lower = any(c.islower() for c in password)
-        return has_upper and has_lower
-    
-    def _calculate_entropy(self, password: str) -> float:
-        """
-        Calcola l'entropia della password (misura della casualità)
-        Maggiore entropia = password più difficile da indovinare
-        """
-        if not password:
-            return 0
-        
-        # Determina il pool di caratteri
-        pool_size = 0
-        if any(c.islower() for c in password):
-            pool_size += 26
-        if any(c.isupper() for c in password):
-            pool_size += 26
-        if any(c.isdigit() for c in password):
-            pool_size += 10
-        if any(c in "!@#$%^&*(),.?\":{}|<>" for c in password):
-            pool_size += 18
-        
-        # Entropia = log2(pool_size) * lunghezza
-        import math
-        if pool_size > 0:
-            return math.log2(pool_size) * len(password)
-        return 0
 
 class SecurePasswordGenerator:
     """Generatore di password sicure"""
@@ -307,7 +433,7 @@ class SecurePasswordGenerator:
         lowercase = string.ascii_lowercase
         uppercase = string.ascii_uppercase
         digits = string.digits
-        symbols = "!@#$%^&*(),.?\":{}|<>" if include_symbols else ""
+        symbols = SPECIAL_CHARS if include_symbols else ""
         
         # Garantisci almeno un carattere di ogni tipo
         password = [
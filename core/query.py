@@ -0,0 +1,260 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from core.notes_index import tokenize
+from core.password_strength import PasswordStrength
+
+# Nomi accettati prima dei due punti -> campo del predicato
+FIELD_ALIASES = {
+    "site": "site",
+    "sito": "site",
+    "user": "username",
+    "username": "username",
+    "notes": "notes",
+    "note": "notes",
+    "updated": "updated",
+    "weak": "weak",
+}
+
+# Livelli di forza considerati deboli da weak:true
+WEAK_LEVELS = frozenset(level.value for level in PasswordStrength if level.value < PasswordStrength.GOOD.value)
+ALL_LEVELS = frozenset(level.value for level in PasswordStrength)
+
+TRUE_VALUES = {"true", "yes", "si", "sì", "1"}
+FALSE_VALUES = {"false", "no", "0"}
+
+# campo:valore, campo:"valore con spazi", "testo con spazi" oppure testo libero
+TOKEN_PATTERN = re.compile(r'(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+DATE_PATTERN = re.compile(r"(<=|>=|<|>|=)?(\d{4}-\d{2}-\d{2})")
+
+
+@dataclass
+class Predicate:
+    """Condizione su un campo della password"""
+    field: str      # text, site, username, notes, updated, weak
+    value: object   # testo, intervallo (inizio, fine) per updated, bool per weak
+
+
+@dataclass
+class ParsedQuery:
+    """Risultato dell'analisi di una query di ricerca"""
+    predicates: List[Predicate] = field(default_factory=list)
+    terms: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Testo libero della query"""
+        return " ".join(self.terms)
+
+    @property
+    def is_plain(self) -> bool:
+        """True se la query è solo testo libero (ricerca fuzzy ordinata)"""
+        return not self.predicates
+
+    @property
+    def is_invalid(self) -> bool:
+        """True se la query è fatta solo di predicati non validi (nessun risultato)"""
+        return bool(self.errors) and not self.predicates and not self.terms
+
+
+def _date_range(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Converte "<2025-01-01", ">=2024-06-01", "2024-12-24"... in un intervallo
+    [inizio, fine) di date ISO, confrontabile direttamente con updated_at
+    """
+    match = DATE_PATTERN.fullmatch(value)
+    try:
+        day = date.fromisoformat(match.group(2)) if match else None
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValueError(f"data non valida '{value}' (usa AAAA-MM-GG, anche con < > <= >=)")
+
+    operator = match.group(1) or "="
+    start = day.isoformat()
+    next_day = (day + timedelta(days=1)).isoformat()
+
+    return {
+        "<": (None, start),
+        "<=": (None, next_day),
+        ">": (next_day, None),
+        ">=": (start, None),
+        "=": (start, next_day),
+    }[operator]
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """
+    Analizza una query di ricerca
+
+    Sintassi: testo libero e predicati campo:valore, tutti in AND.
+    - site:bank, user:ops, notes:"codice pin" (sottostringa; per le note prefissi di parola)
+    - updated:<2025-01-01, updated:>=2024-06-01, updated:2024-12-24
+    - weak:true / weak:false
+
+    I predicati non validi vengono ignorati e descritti in `errors`.
+    """
+    parsed = ParsedQuery()
+
+    for match in TOKEN_PATTERN.finditer(query or ""):
+        name, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        field_name = FIELD_ALIASES.get(name.lower()) if name else None
+
+        if field_name is None:
+            # Nessun campo (o campo sconosciuto, es. un URL): testo libero
+            parsed.terms.append(match.group(0).strip('"') if name is None else match.group(0))
+            continue
+
+        try:
+            if field_name == "updated":
+                parsed.predicates.append(Predicate(field_name, _date_range(value)))
+            elif field_name == "weak":
+                flag = value.lower()
+                if flag not in TRUE_VALUES and flag not in FALSE_VALUES:
+                    raise ValueError(f"valore non valido '{value}' (usa true o false)")
+                parsed.predicates.append(Predicate(field_name, flag in TRUE_VALUES))
+            elif value.strip():
+                parsed.predicates.append(Predicate(field_name, value))
+        except ValueError as e:
+            parsed.errors.append(f"{name}: {e}")
+
+    # Il testo libero in una query con predicati diventa un predicato a sua volta
+    if parsed.predicates:
+        parsed.predicates.extend(Predicate("text", term) for term in parsed.terms)
+
+    return parsed
+
+
+class QueryPlan:
+    """
+    Piano di esecuzione di una query compilata
+
+    `lookups` sono ricerche sugli indici che restituiscono insiemi di
+    documenti: vengono intersecati partendo dal più piccolo, fermandosi al
+    primo insieme vuoto. `scans` sono i predicati senza indice, verificati
+    solo sulle password rimaste dopo le intersezioni.
+    """
+
+    def __init__(self, search_index):
+        self.search_index = search_index
+        self.lookups: List[Tuple[str, Callable[[], Set[int]]]] = []
+        self.scans: List[Tuple[str, Callable[[Dict], bool]]] = []
+
+    def describe(self) -> List[str]:
+        """Passi del piano in forma leggibile (debug)"""
+        return ([f"indice: {name}" for name, _ in self.lookups] +
+                [f"scansione: {name}" for name, _ in self.scans])
+
+    def execute(self, limit: Optional[int] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[Dict]]:
+        """
+        Esegue il piano
+
+        Returns:
+            Le password trovate in ordine di inserimento, None se annullata
+        """
+        sets = []
+        for _, lookup in self.lookups:
+            if is_cancelled and is_cancelled():
+                return None
+            docs = lookup()
+            if not docs:
+                return []
+            sets.append(docs)
+
+        if sets:
+            sets.sort(key=len)
+            docs = set(sets[0])
+            for other in sets[1:]:
+                docs &= other
+                if not docs:
+                    return []
+        else:
+            docs = self.search_index.all_docs()
+
+        if not self.scans:
+            return self.search_index.entries_for_docs(docs, limit)
+
+        results = []
+        for count, entry in enumerate(self.search_index.entries_for_docs(docs)):
+            if is_cancelled and count % 200 == 0 and is_cancelled():
+                return None
+            if all(predicate(entry) for _, predicate in self.scans):
+                results.append(entry)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+
+def _notes_contain(terms: List[str]) -> Callable[[Dict], bool]:
+    """Predicato di scansione equivalente alla ricerca per prefissi sulle note"""
+    def predicate(entry: Dict) -> bool:
+        tokens = tokenize(entry.get("notes", ""))
+        return all(any(token.startswith(term) for token in tokens) for term in terms)
+    return predicate
+
+
+def compile_query(parsed: ParsedQuery, search_index, notes_index,
+                  rate_password: Callable[[Dict], Optional[int]]) -> QueryPlan:
+    """
+    Compila una query analizzata in un piano sugli indici di PasswordDatabase
+
+    Args:
+        parsed: Query analizzata da parse_query
+        search_index: SearchIndex su sito/username, data di modifica e forza
+        notes_index: NotesIndex sulle note
+        rate_password: Calcola (e conserva nell'indice) il livello di forza di
+            una password non ancora valutata, None se non disponibile
+    """
+    plan = QueryPlan(search_index)
+
+    for predicate in parsed.predicates:
+        kind, value = predicate.field, predicate.value
+
+        if kind in ("site", "username"):
+            plan.lookups.append((f"{kind} contiene '{value}'",
+                                 lambda kind=kind, value=value: search_index.field_docs(kind, value)))
+
+        elif kind == "notes":
+            terms = tokenize(value)
+            if not terms:
+                continue
+            if notes_index.ready:
+                plan.lookups.append((f"note: {' '.join(terms)}",
+                                     lambda value=value: search_index.docs_for_ids(notes_index.search(value) or ())))
+            else:
+                # Indice delle note ancora in costruzione
+                plan.scans.append((f"note: {' '.join(terms)}", _notes_contain(terms)))
+
+        elif kind == "text":
+            def text_docs(value=value) -> Set[int]:
+                docs = search_index.field_docs("site", value) | search_index.field_docs("username", value)
+                note_ids = notes_index.search(value)
+                if note_ids:
+                    docs |= search_index.docs_for_ids(note_ids)
+                return docs
+            plan.lookups.append((f"testo '{value}'", text_docs))
+
+        elif kind == "updated":
+            start, end = value
+            plan.lookups.append((f"updated_at in [{start or '...'}, {end or '...'})",
+                                 lambda start=start, end=end: search_index.updated_docs(start, end)))
+
+        elif kind == "weak":
+            levels = WEAK_LEVELS if value else ALL_LEVELS - WEAK_LEVELS
+            unrated = search_index.unrated_docs()
+            plan.lookups.append((f"forza in {sorted(levels)}",
+                                 lambda levels=levels, unrated=unrated: search_index.strength_docs(levels) | unrated))
+            if unrated:
+                # Valutazione in corso dopo il login: le voci mancanti si valutano una per una
+                def rated_in(entry: Dict, levels=levels) -> bool:
+                    strength = search_index.strength_of(entry["id"])
+                    if strength is None:
+                        strength = rate_password(entry)
+                    return strength in levels
+                plan.scans.append((f"forza in {sorted(levels)} (voci non ancora valutate)", rated_in))
+
+    return plan
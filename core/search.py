@@ -0,0 +1,123 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+class SearchPipeline:
+    """
+    Pipeline di ricerca per i campi di input della UI
+
+    - debounce: la ricerca parte solo dopo `delay_ms` senza nuove modifiche
+    - i tasti che non cambiano il testo (frecce, modificatori) vengono ignorati
+    - ogni nuova query rende obsolete quelle precedenti (timer annullati,
+      ricerche in coda cancellate, quelle in corso possono interrompersi)
+    - viene applicato solo il risultato della query più recente
+
+    La ricerca gira su un thread dedicato; il risultato viene consegnato nel
+    thread principale tramite `after()` del widget scheduler.
+    """
+
+    def __init__(self, scheduler, search_fn: Callable[[str, Callable[[], bool]], Any],
+                 on_result: Callable[[str, Any], None], delay_ms: int = 150, poll_ms: int = 15):
+        """
+        Args:
+            scheduler: Widget Tk usato per after()/after_cancel()
+            search_fn: Funzione (query, is_cancelled) -> risultato, eseguita in background
+            on_result: Callback (query, risultato) chiamata nel thread principale
+            delay_ms: Ritardo di debounce in millisecondi
+            poll_ms: Intervallo di controllo del completamento della ricerca
+        """
+        self.scheduler = scheduler
+        self.search_fn = search_fn
+        self.on_result = on_result
+        self.delay_ms = delay_ms
+        self.poll_ms = poll_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search")
+        self._generation = 0
+        self._last_query: Optional[str] = None
+        self._timer = None
+        self._future: Optional[Future] = None
+        self._closed = False
+
+    def submit(self, query: str, force: bool = False) -> bool:
+        """
+        Programma una ricerca per la query
+
+        Returns:
+            bool: False se la query è uguale all'ultima e la ricerca è stata ignorata
+        """
+        if self._closed or (not force and query == self._last_query):
+            return False
+
+        self._last_query = query
+        generation = self._invalidate()
+        self._timer = self.scheduler.after(self.delay_ms, lambda: self._start(generation, query))
+        return True
+
+    def run_now(self, query: str) -> Any:
+        """
+        Esegue subito la ricerca nel thread chiamante, annullando quelle in sospeso
+
+        Usato quando i dati cambiano e il risultato serve immediatamente.
+        """
+        self._last_query = query
+        self._invalidate()
+        return self.search_fn(query, lambda: False)
+
+    def cancel(self):
+        """Annulla la ricerca in sospeso o in corso"""
+        self._invalidate()
+
+    def shutdown(self):
+        """Ferma la pipeline (da chiamare alla distruzione della vista)"""
+        self._invalidate()
+        self._closed = True
+        self._executor.shutdown(wait=False)
+
+    def _invalidate(self) -> int:
+        """Rende obsolete tutte le ricerche avviate finora"""
+        self._generation += 1
+
+        if self._timer is not None:
+            try:
+                self.scheduler.after_cancel(self._timer)
+            except Exception:
+                pass
+            self._timer = None
+
+        # Una ricerca ancora in coda può essere cancellata del tutto
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+        return self._generation
+
+    def _is_stale(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _start(self, generation: int, query: str):
+        """Avvia la ricerca in background al termine del debounce"""
+        self._timer = None
+        if self._closed or self._is_stale(generation):
+            return
+
+        self._future = self._executor.submit(self.search_fn, query, lambda: self._is_stale(generation))
+        self._poll(generation, query, self._future)
+
+    def _poll(self, generation: int, query: str, future: Future):
+        """Controlla il completamento e applica il risultato se ancora attuale"""
+        if self._closed or self._is_stale(generation):
+            return
+
+        if not future.done():
+            self._timer = self.scheduler.after(self.poll_ms, lambda: self._poll(generation, query, future))
+            return
+
+        self._timer = None
+        self._future = None
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"Errore durante la ricerca: {e}")
+            return
+
+        self.on_result(query, result)
@@ -0,0 +1,743 @@
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from core.fuzzy_search import (TYPO_MIN_LENGTH, TYPO_MIN_OVERLAP, FuzzyQuery, rank, top_k, typo_score,
+                               word_starts)
+
+# Campi di una password su cui si può cercare
+SEARCH_FIELDS = ("site", "username")
+
+# Lunghezza degli n-grammi indicizzati
+NGRAM_SIZE = 3
+
+
+def normalize(text: str) -> str:
+    """Normalizza un campo o una query per il confronto"""
+    return (text or "").lower()
+
+
+# Numero di query recenti di cui si conservano i risultati
+RESULT_CACHE_SIZE = 32
+
+
+def trigrams(text: str) -> Set[str]:
+    """Insieme dei trigrammi di una stringa già normalizzata"""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class QueryMatches:
+    """
+    Risultati di una query conservati nella cache dell'indice
+
+    `exact` e `fuzzy` sono gli insiemi completi (in ordine di documento)
+    delle sottostringhe e delle sottosequenze trovate, None se non ancora
+    calcolati; `ranked` contiene l'ordinamento già prodotto per ogni limite.
+    """
+
+    __slots__ = ("exact", "fuzzy", "ranked")
+
+    def __init__(self, exact: Optional[List[int]] = None):
+        self.exact = exact
+        self.fuzzy: Optional[List[int]] = None
+        self.ranked: Dict[Optional[int], List[int]] = {}
+
+
+class SearchIndex:
+    """
+    Indice di ricerca per sottostringa su sito e username
+
+    I campi vengono normalizzati una sola volta all'inserimento e ogni
+    trigramma punta all'insieme dei documenti che lo contengono. Una query
+    di 3+ caratteri interseca le posting list dei suoi trigrammi (partendo
+    dalla più corta) e verifica solo i candidati rimasti; le query di 1-2
+    caratteri usano una scansione lineare sui campi già normalizzati.
+
+    Per la ricerca fuzzy ordinata ogni carattere punta ai documenti che lo
+    contengono: una sottosequenza è possibile solo nei documenti che hanno
+    tutti i caratteri della query, e solo quelli vengono verificati. Le query
+    di 1-2 caratteri, che corrisponderebbero a quasi tutto il vault, sono
+    ordinate per fasce tramite i prefissi di sito e parole già indicizzati.
+
+    Le ricerche sono incrementali: i risultati delle ultime query restano in
+    una piccola cache LRU, valida finché l'indice non cambia versione. Quando
+    la query estende una già calcolata ("git" -> "gith") vengono filtrati solo
+    i risultati di quella, e tornare indietro con backspace è immediato.
+
+    L'indice è aggiornato in modo incrementale da PasswordDatabase e può
+    essere interrogato da un thread di ricerca (accesso protetto da lock).
+
+    La costruzione iniziale può avvenire in un thread separato: le password
+    e i loro documenti sono subito disponibili, ma finché l'indice non è
+    pronto (`ready` è False) le ricerche usano una scansione lineare e le
+    modifiche ricevute nel frattempo vengono riapplicate a costruzione finita.
+    """
+
+    # Strutture prodotte dalla costruzione e sostituite in blocco da rebuild_async
+    _INDEX_ATTRIBUTES = ("_fields", "_haystacks", "_postings", "_char_postings", "_site_prefixes",
+                         "_word_prefixes", "_updated")
+
+    def __init__(self, cache_size: int = RESULT_CACHE_SIZE):
+        self._lock = threading.RLock()
+        self._next_doc = 0
+        self._doc_ids: Dict[str, int] = {}                 # id password -> documento
+        self._entries: Dict[int, Dict] = {}                # documento -> password
+        self._fields: Dict[int, Tuple[str, ...]] = {}      # documento -> campi normalizzati
+        self._haystacks: Dict[int, str] = {}               # documento -> campi uniti per il confronto
+        self._postings: Dict[str, Set[int]] = {}           # trigramma -> documenti
+        self._char_postings: Dict[str, Set[int]] = {}      # carattere -> documenti
+        self._site_prefixes: Dict[str, Set[int]] = {}      # inizio del sito -> documenti
+        self._word_prefixes: Dict[str, Set[int]] = {}      # inizio di una parola -> documenti
+        self._updated: List[Tuple[str, int]] = []          # (updated_at, documento) ordinati
+        self._levels: Dict[int, int] = {}                  # documento -> livello di forza (solo in memoria)
+        self._strengths: Dict[int, Set[int]] = {}          # livello di forza -> documenti
+        self._boosts: Dict[int, float] = {}                # documento -> bonus di rilevanza
+        self._bulk_loading = False
+        self._dirty: Set[int] = set()                      # documenti modificati durante la costruzione
+        self._generation = 0
+        self.ready = True
+        self.version = 0
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, QueryMatches]" = OrderedDict()
+        self._cache_version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, entries: Iterable[Dict]):
+        """Ricostruisce l'indice da zero nel thread chiamante (import massivi)"""
+        with self._lock:
+            self.clear()
+            # Durante il caricamento l'ordinamento per data si fa una volta sola
+            self._bulk_loading = True
+            try:
+                for entry in entries:
+                    self._insert(entry)
+            finally:
+                self._bulk_loading = False
+                self._updated.sort()
+
+    def rebuild_async(self, entries: Iterable[Dict], on_ready: Optional[Callable[[], None]] = None):
+        """
+        Ricostruisce l'indice in un thread di background (login)
+
+        Le password ricevono subito il loro documento, quindi ricerche e
+        bonus funzionano da subito; trigrammi, prefissi e indici dei campi
+        vengono costruiti a parte e attivati in blocco.
+
+        Args:
+            entries: Password da indicizzare (viene presa una copia della lista)
+            on_ready: Callback chiamata dal thread di background a indice pronto
+        """
+        with self._lock:
+            self.clear()
+            for entry in entries:
+                doc = self._next_doc
+                self._next_doc += 1
+                self._doc_ids[entry["id"]] = doc
+                self._entries[doc] = entry
+            snapshot = list(self._entries.items())
+            generation = self._generation
+            self.ready = False
+
+        def build():
+            built = SearchIndex(self.cache_size)
+            built._bulk_loading = True
+            for doc, entry in snapshot:
+                built._entries[doc] = entry
+                built._index(doc, entry)
+            built._bulk_loading = False
+            built._updated.sort()
+
+            with self._lock:
+                # Un logout o un nuovo login nel frattempo rendono inutile questo indice
+                if generation != self._generation:
+                    return
+                self._swap(built)
+            if on_ready:
+                on_ready()
+
+        threading.Thread(target=build, name="search-index", daemon=True).start()
+
+    def _swap(self, built: "SearchIndex"):
+        """Attiva un indice costruito in background e reindicizza le voci modificate nel frattempo"""
+        for doc in self._dirty:
+            if doc in built._entries:
+                built._unindex(doc)
+                del built._entries[doc]
+                built._fields.pop(doc, None)
+                built._haystacks.pop(doc, None)
+            if doc in self._entries:
+                built._entries[doc] = self._entries[doc]
+                built._index(doc, self._entries[doc])
+        if self._dirty:
+            # Le query corte scorrono i campi uniti in ordine di inserimento
+            built._haystacks = {doc: built._haystacks[doc] for doc in sorted(built._haystacks)}
+
+        for attribute in self._INDEX_ATTRIBUTES:
+            setattr(self, attribute, getattr(built, attribute))
+        self._dirty = set()
+        self.ready = True
+        self.version += 1
+
+    def clear(self):
+        """Svuota l'indice e annulla eventuali costruzioni in corso (logout)"""
+        with self._lock:
+            self._generation += 1
+            self._dirty = set()
+            self.ready = True
+            self._next_doc = 0
+            self._doc_ids.clear()
+            self._entries.clear()
+            self._fields.clear()
+            self._haystacks.clear()
+            self._postings.clear()
+            self._char_postings.clear()
+            self._site_prefixes.clear()
+            self._word_prefixes.clear()
+            self._updated.clear()
+            self._levels.clear()
+            self._strengths.clear()
+            self._boosts.clear()
+            self.version += 1
+
+    def add(self, entry: Dict):
+        """Indicizza una nuova password"""
+        with self._lock:
+            if entry["id"] in self._doc_ids:
+                self.update(entry)
+                return
+            self._insert(entry)
+
+    def update(self, entry: Dict):
+        """Reindicizza una password modificata mantenendone la posizione"""
+        with self._lock:
+            doc = self._doc_ids.get(entry["id"])
+            if doc is None:
+                self._insert(entry)
+                return
+
+            if self.ready:
+                self._unindex(doc)
+                self._index(doc, entry)
+            else:
+                self._dirty.add(doc)
+            self._entries[doc] = entry
+            self.version += 1
+
+    def remove(self, entry_id: str):
+        """Rimuove una password dall'indice"""
+        with self._lock:
+            doc = self._doc_ids.pop(entry_id, None)
+            if doc is None:
+                return
+
+            if self.ready:
+                self._unindex(doc)
+                del self._fields[doc]
+                del self._haystacks[doc]
+            else:
+                self._dirty.add(doc)
+            self._discard_level(doc)
+            self._boosts.pop(doc, None)
+            del self._entries[doc]
+            self.version += 1
+
+    def set_boosts(self, boosts: Dict[str, float]):
+        """
+        Imposta i bonus di rilevanza per id password (es. frecency)
+
+        Gli ordinamenti in cache vengono scartati, le corrispondenze trovate
+        restano valide: non cambiano con i bonus.
+        """
+        with self._lock:
+            doc_ids = self._doc_ids
+            self._boosts = {doc_ids[entry_id]: boost for entry_id, boost in boosts.items() if entry_id in doc_ids}
+            for matches in self._cache.values():
+                matches.ranked.clear()
+
+    def strength_of(self, entry_id: str) -> Optional[int]:
+        """Livello di forza di una password, None se non ancora valutata"""
+        with self._lock:
+            doc = self._doc_ids.get(entry_id)
+            return self._levels.get(doc) if doc is not None else None
+
+    def set_strength(self, entry_id: str, level: Optional[int]):
+        """
+        Imposta il livello di forza di una password
+
+        I livelli restano solo in memoria: vengono calcolati dal database
+        sulle password decrittate e non sono mai salvati nel vault.
+        """
+        with self._lock:
+            doc = self._doc_ids.get(entry_id)
+            if doc is not None:
+                self._set_level(doc, level)
+
+    def set_strengths(self, rated: Iterable[Tuple[Dict, int]]):
+        """
+        Imposta i livelli di forza calcolati in blocco (in background al login)
+
+        Una voce sostituita nel frattempo da una modifica viene saltata: il
+        suo livello è già stato impostato con la nuova password.
+        """
+        with self._lock:
+            doc_ids, entries = self._doc_ids, self._entries
+            for entry, level in rated:
+                doc = doc_ids.get(entry["id"])
+                if doc is not None and entries[doc] is entry:
+                    self._set_level(doc, level)
+
+    def set_boost(self, entry_id: str, boost: float):
+        """
+        Aggiorna il bonus di rilevanza di una sola password (un accesso)
+
+        Vengono scartati solo gli ordinamenti in cache (al massimo cache_size
+        query), non le corrispondenze: il costo non dipende dal vault.
+        """
+        with self._lock:
+            doc = self._doc_ids.get(entry_id)
+            if doc is None:
+                return
+            if boost:
+                self._boosts[doc] = boost
+            else:
+                self._boosts.pop(doc, None)
+            for matches in self._cache.values():
+                matches.ranked.clear()
+
+    def get_entries(self, entry_ids: Iterable[str]) -> List[Dict]:
+        """Password indicizzate con gli id indicati, in ordine di inserimento"""
+        return self.entries_for_docs(self.docs_for_ids(entry_ids))
+
+    def docs_for_ids(self, entry_ids: Iterable[str]) -> Set[int]:
+        """Documenti delle password con gli id indicati"""
+        with self._lock:
+            doc_ids = self._doc_ids
+            return {doc_ids[entry_id] for entry_id in entry_ids if entry_id in doc_ids}
+
+    def entries_for_docs(self, docs: Iterable[int], limit: Optional[int] = None) -> List[Dict]:
+        """Password dei documenti indicati, in ordine di inserimento"""
+        with self._lock:
+            entries = self._entries
+            ordered = sorted(doc for doc in docs if doc in entries)
+            if limit is not None:
+                ordered = ordered[:limit]
+            return [entries[doc] for doc in ordered]
+
+    def all_docs(self) -> Set[int]:
+        """Tutti i documenti indicizzati"""
+        with self._lock:
+            return set(self._entries)
+
+    def field_docs(self, field: str, text: str) -> Set[int]:
+        """Documenti in cui il campo indicato (site o username) contiene il testo"""
+        position = SEARCH_FIELDS.index(field)
+        text = normalize(text).strip()
+
+        with self._lock:
+            if not self.ready:
+                return {doc for doc, entry in self._entries.items()
+                        if text in normalize(entry.get(field, ""))}
+            fields = self._fields
+            if not text:
+                return set(fields)
+            candidates = self._candidates(text) if len(text) >= NGRAM_SIZE else fields
+            return {doc for doc in candidates if text in fields[doc][position]}
+
+    def updated_docs(self, start: Optional[str] = None, end: Optional[str] = None) -> Set[int]:
+        """Documenti con updated_at nell'intervallo [start, end) (date ISO)"""
+        with self._lock:
+            if not self.ready:
+                return {doc for doc, entry in self._entries.items()
+                        if (not start or entry.get("updated_at", "") >= start)
+                        and (not end or entry.get("updated_at", "") < end)}
+            updated = self._updated
+            low = bisect_left(updated, (start,)) if start else 0
+            high = bisect_left(updated, (end,)) if end else len(updated)
+            return {doc for _, doc in updated[low:high]}
+
+    def strength_docs(self, levels: Iterable[int]) -> Set[int]:
+        """Documenti con livello di forza tra quelli indicati"""
+        with self._lock:
+            found: Set[int] = set()
+            for level in levels:
+                found |= self._strengths.get(level, set())
+            return found
+
+    def unrated_docs(self) -> Set[int]:
+        """Documenti non ancora valutati (forza in calcolo dopo il login)"""
+        with self._lock:
+            levels = self._levels
+            return {doc for doc in self._entries if doc not in levels}
+
+    def search(self, query: str, is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[Dict]]:
+        """
+        Cerca le password il cui sito o username contiene la query
+
+        Returns:
+            Le password trovate nell'ordine di inserimento, None se la
+            ricerca è stata annullata
+        """
+        query = normalize(query).strip()
+
+        with self._lock:
+            if not query:
+                return list(self._entries.values())
+
+            if not self.ready:
+                docs = self._linear_scan(query, is_cancelled)
+            elif len(query) < NGRAM_SIZE:
+                # I documenti sono già in ordine di inserimento
+                docs = self._scan(query, list(self._haystacks), is_cancelled)
+            else:
+                docs = self._scan(query, sorted(self._candidates(query)), is_cancelled)
+
+            if docs is None:
+                return None
+            entries = self._entries
+            return [entries[doc] for doc in docs]
+
+    def search_ranked(self, query: str, limit: Optional[int] = None,
+                      is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[Dict]]:
+        """
+        Ricerca fuzzy ordinata per rilevanza
+
+        Trova la query come sottostringa o sottosequenza ("gthb" -> github) e,
+        per query di almeno TYPO_MIN_LENGTH caratteri che non riempiono il
+        limite, anche come errore di battitura (trigrammi in comune).
+
+        Args:
+            query: Testo da cercare
+            limit: Numero massimo di risultati (None = tutti)
+            is_cancelled: Callback per interrompere la ricerca
+
+        Returns:
+            Le password dalla più rilevante, None se la ricerca è stata annullata
+        """
+        query = normalize(query).strip()
+
+        with self._lock:
+            if not query:
+                entries = list(self._entries.values())
+                return entries if limit is None else entries[:limit]
+
+            if not self.ready:
+                # Indice ancora in costruzione: ordinamento sui campi normalizzati al volo
+                ranked = rank(query, ((doc, self._entry_fields(entry)) for doc, entry in self._entries.items()),
+                              limit, is_cancelled, self._boosts)
+                if ranked is None:
+                    return None
+                return [self._entries[doc] for _, doc in ranked]
+
+            matches = self._cached(query)
+            if limit not in matches.ranked:
+                if len(query) < NGRAM_SIZE:
+                    docs = self._short_query_docs(query, limit, is_cancelled)
+                else:
+                    docs = self._rank_matches(query, matches, limit, is_cancelled)
+                if docs is None:
+                    return None
+                matches.ranked[limit] = docs
+
+            entries = self._entries
+            return [entries[doc] for doc in matches.ranked[limit]]
+
+    def _cached(self, query: str) -> QueryMatches:
+        """Risultati in cache per la query (creati vuoti se assenti)"""
+        if self._cache_version != self.version:
+            # Qualsiasi modifica all'indice rende obsoleti i risultati salvati
+            self._cache.clear()
+            self._cache_version = self.version
+
+        matches = self._cache.get(query)
+        if matches is None:
+            matches = QueryMatches()
+            self._cache[query] = matches
+        self._cache.move_to_end(query)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return matches
+
+    def _narrowing_base(self, query: str, attribute: str) -> Optional[List[int]]:
+        """
+        Risultati di una query precedente che la query estende
+
+        Se la query inizia con una query già calcolata, le sue corrispondenze
+        (sottostringhe o sottosequenze) sono un sottoinsieme di quelle: basta
+        filtrare quel risultato invece di partire dall'indice.
+        """
+        best_length, best = 0, None
+        for previous, matches in self._cache.items():
+            docs = getattr(matches, attribute)
+            if (docs is not None and len(previous) > best_length
+                    and len(previous) < len(query) and query.startswith(previous)):
+                best_length, best = len(previous), docs
+        return best
+
+    def _rank_matches(self, query: str, matches: QueryMatches, limit: Optional[int],
+                      is_cancelled: Optional[Callable[[], bool]]) -> Optional[List[int]]:
+        """Ordina le corrispondenze di una query di 3+ caratteri"""
+        fields = self._fields
+
+        if matches.exact is None:
+            base = self._narrowing_base(query, "exact")
+            exact = self._scan(query, base if base is not None else sorted(self._candidates(query)),
+                               is_cancelled)
+            if exact is None:
+                return None
+            matches.exact = exact
+
+        # Le sottostringhe esatte precedono sempre le sottosequenze: se
+        # bastano a riempire il limite le sottosequenze non servono
+        ranked = rank(query, ((doc, fields[doc]) for doc in matches.exact), limit, is_cancelled, self._boosts)
+        if ranked is None:
+            return None
+
+        if limit is None or len(ranked) < limit:
+            if matches.fuzzy is None:
+                fuzzy_docs = self._subsequence_docs(FuzzyQuery(query), is_cancelled,
+                                                    self._narrowing_base(query, "fuzzy"))
+                if fuzzy_docs is None:
+                    return None
+                matches.fuzzy = fuzzy_docs
+
+            exact_docs = set(matches.exact)
+            fuzzy = rank(query, ((doc, fields[doc]) for doc in matches.fuzzy if doc not in exact_docs),
+                         limit, is_cancelled, self._boosts)
+            if fuzzy is None:
+                return None
+            ranked = top_k(ranked + fuzzy, limit)
+
+        if len(query) >= TYPO_MIN_LENGTH and (limit is None or len(ranked) < limit):
+            found = {doc for _, doc in ranked}
+            ranked = top_k(ranked + self._typo_matches(query, found), limit)
+
+        return [doc for _, doc in ranked]
+
+    def _insert(self, entry: Dict):
+        doc = self._next_doc
+        self._next_doc += 1
+        self._doc_ids[entry["id"]] = doc
+        self._entries[doc] = entry
+        if self.ready:
+            self._index(doc, entry)
+        else:
+            self._dirty.add(doc)
+        self.version += 1
+
+    def _index(self, doc: int, entry: Dict):
+        fields = self._entry_fields(entry)
+        self._fields[doc] = fields
+        # Il separatore impedisce corrispondenze a cavallo tra due campi
+        self._haystacks[doc] = "\x00".join(fields)
+
+        self._index_attributes(doc, entry)
+
+        postings = self._postings
+        for gram in set().union(*(trigrams(value) for value in fields)):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {doc}
+            else:
+                posting.add(doc)
+
+        for postings, keys in zip((self._char_postings, self._site_prefixes, self._word_prefixes),
+                                  (set().union(*fields),) + self._prefix_keys(fields)):
+            for key in keys:
+                posting = postings.get(key)
+                if posting is None:
+                    postings[key] = {doc}
+                else:
+                    posting.add(doc)
+
+    def _index_attributes(self, doc: int, entry: Dict):
+        """Indice per data di modifica usato dalle query sui campi"""
+        key = (entry.get("updated_at", ""), doc)
+        if self._bulk_loading:
+            self._updated.append(key)
+        else:
+            insort(self._updated, key)
+
+    def _unindex_attributes(self, doc: int, entry: Dict):
+        key = (entry.get("updated_at", ""), doc)
+        position = bisect_left(self._updated, key)
+        if position < len(self._updated) and self._updated[position] == key:
+            del self._updated[position]
+
+    def _set_level(self, doc: int, level: Optional[int]):
+        self._discard_level(doc)
+        if level is not None:
+            self._levels[doc] = level
+            self._strengths.setdefault(level, set()).add(doc)
+
+    def _discard_level(self, doc: int):
+        level = self._levels.pop(doc, None)
+        if level is None:
+            return
+        posting = self._strengths.get(level)
+        if posting is not None:
+            posting.discard(doc)
+            if not posting:
+                del self._strengths[level]
+
+    def _unindex(self, doc: int):
+        if doc in self._entries:
+            self._unindex_attributes(doc, self._entries[doc])
+
+        fields = self._fields.get(doc, ())
+        for gram in set().union(*(trigrams(value) for value in fields)):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc)
+                if not posting:
+                    del self._postings[gram]
+
+        for postings, keys in zip((self._char_postings, self._site_prefixes, self._word_prefixes),
+                                  (set().union(*fields),) + self._prefix_keys(fields)):
+            for key in keys:
+                posting = postings.get(key)
+                if posting is not None:
+                    posting.discard(doc)
+                    if not posting:
+                        del postings[key]
+
+    @staticmethod
+    def _prefix_keys(fields: Tuple[str, ...]) -> Tuple[Set[str], Set[str]]:
+        """Prefissi corti (1-2 caratteri) del sito e di ogni parola dei campi"""
+        sizes = range(1, NGRAM_SIZE)
+        site = fields[0] if fields else ""
+        site_keys = {site[:size] for size in sizes if len(site) >= size}
+        word_keys = {value[start:start + size]
+                     for value in fields
+                     for start in word_starts(value)
+                     for size in sizes
+                     if start + size <= len(value)}
+        return site_keys, word_keys
+
+    def _candidates(self, query: str) -> Set[int]:
+        """Documenti che contengono tutti i trigrammi della query"""
+        postings = []
+        for gram in trigrams(query):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def _subsequence_docs(self, fuzzy: FuzzyQuery, is_cancelled: Optional[Callable[[], bool]],
+                          base: Optional[List[int]] = None) -> Optional[List[int]]:
+        """
+        Documenti in cui un campo contiene la query come sottosequenza
+
+        Senza `base` i candidati sono i documenti che hanno tutti i caratteri
+        della query; con `base` (risultato di una query che questa estende)
+        viene verificato solo quello.
+        """
+        if base is not None:
+            docs = base
+        else:
+            postings = []
+            for char in fuzzy.chars:
+                posting = self._char_postings.get(char)
+                if not posting:
+                    return []
+                postings.append(posting)
+
+            postings.sort(key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            if fuzzy.length == 1:
+                return sorted(candidates)
+            docs = sorted(candidates)
+
+        # Il pattern esclude il separatore: la sottosequenza resta in un solo campo
+        haystacks = self._haystacks
+        search = fuzzy.pattern.search
+        matches = []
+        for start in range(0, len(docs), 5000):
+            if is_cancelled and is_cancelled():
+                return None
+            matches.extend(doc for doc in docs[start:start + 5000] if search(haystacks[doc]))
+        return matches
+
+    def _short_query_docs(self, query: str, limit: Optional[int],
+                          is_cancelled: Optional[Callable[[], bool]]) -> Optional[List[int]]:
+        """
+        Risultati di una query di 1-2 caratteri, ordinati per fasce
+
+        Prima i siti che iniziano con la query, poi le parole che iniziano
+        con la query, infine le altre corrispondenze; dentro una fascia vengono
+        prima le password con bonus, poi vale l'ordine di inserimento. Le
+        fasce si leggono dagli indici dei prefissi e ci si ferma appena il
+        limite è raggiunto.
+        """
+        site_docs = self._site_prefixes.get(query, set())
+        word_docs = self._word_prefixes.get(query, set())
+
+        boosts = self._boosts
+
+        def boosted(docs: Iterable[int]) -> List[int]:
+            return sorted(docs, key=lambda doc: -boosts.get(doc, 0.0)) if boosts else list(docs)
+
+        results: List[int] = []
+        for tier in (site_docs, word_docs - site_docs):
+            results.extend(boosted(sorted(tier)))
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+
+        rest = self._subsequence_docs(FuzzyQuery(query), is_cancelled)
+        if rest is None:
+            return None
+        seen = site_docs | word_docs
+        results.extend(boosted(doc for doc in rest if doc not in seen))
+        return results if limit is None else results[:limit]
+
+    def _typo_matches(self, query: str, exclude: Set[int]) -> List[Tuple[float, int]]:
+        """Documenti che condividono abbastanza trigrammi con la query"""
+        grams = trigrams(query)
+        counts = Counter()
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting:
+                counts.update(posting)
+
+        threshold = len(grams) * TYPO_MIN_OVERLAP
+        boosts = self._boosts
+        return [(typo_score(count / len(grams)) + boosts.get(doc, 0.0), doc)
+                for doc, count in counts.items()
+                if count >= threshold and doc not in exclude]
+
+    @staticmethod
+    def _entry_fields(entry: Dict) -> Tuple[str, ...]:
+        return tuple(normalize(entry.get(field, "")) for field in SEARCH_FIELDS)
+
+    def _linear_scan(self, query: str, is_cancelled: Optional[Callable[[], bool]],
+                     block_size: int = 5000) -> Optional[List[int]]:
+        """Sottostringa verificata su tutte le password, senza indice (costruzione in corso)"""
+        entries = list(self._entries.items())
+        matches = []
+        for start in range(0, len(entries), block_size):
+            if is_cancelled and is_cancelled():
+                return None
+            matches.extend(doc for doc, entry in entries[start:start + block_size]
+                           if query in "\x00".join(self._entry_fields(entry)))
+        return matches
+
+    def _scan(self, query: str, docs: List[int], is_cancelled: Optional[Callable[[], bool]],
+              block_size: int = 5000) -> Optional[List[int]]:
+        """Verifica la sottostringa sui documenti indicati, a blocchi annullabili"""
+        haystacks = self._haystacks
+        matches = []
+        for start in range(0, len(docs), block_size):
+            if is_cancelled and is_cancelled():
+                return None
+            matches.extend(doc for doc in docs[start:start + block_size] if query in haystacks[doc])
+        return matches
@@ -0,0 +1,206 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Ordinamenti disponibili -> etichetta mostrata nel selettore
+SORT_ORDERS = {
+    "frecency": "Più usate",
+    "insertion": "Inserimento",
+    "site": "Sito (A-Z)",
+    "username": "Username (A-Z)",
+    "updated": "Ultima modifica",
+    "strength": "Forza (deboli prima)",
+}
+
+DEFAULT_SORT_ORDER = "frecency"
+
+# Le voci non ancora valutate vanno in fondo all'ordinamento per forza
+UNRATED_STRENGTH = 99
+
+
+def _fold(text: str) -> str:
+    return (text or "").casefold()
+
+
+# Chiavi precalcolate (quelle di "frecency" e "strength" dipendono da dati tenuti
+# in memoria e sono fornite da PasswordDatabase): l'id finale rende ogni chiave
+# unica e l'ordine stabile
+SORT_KEYS: Dict[str, Callable[[Dict], Tuple]] = {
+    "site": lambda entry: (_fold(entry["site"]), _fold(entry["username"]), entry["id"]),
+    "username": lambda entry: (_fold(entry["username"]), _fold(entry["site"]), entry["id"]),
+    "updated": lambda entry: (entry.get("updated_at", ""), entry["id"]),
+}
+
+
+def strength_key(strength_of: Callable[[str], Optional[int]]) -> Callable[[Dict], Tuple]:
+    """Chiave dell'ordinamento per forza, con i livelli letti da strength_of(id)"""
+    def key(entry: Dict) -> Tuple:
+        strength = strength_of(entry["id"])
+        return (strength if strength is not None else UNRATED_STRENGTH, _fold(entry["site"]), entry["id"])
+    return key
+
+# Ordinamenti mostrati dal valore più alto (le modifiche più recenti prima)
+DESCENDING_ORDERS = {"updated"}
+
+
+class SortIndex:
+    """
+    Lista di password mantenuta ordinata su una chiave precalcolata
+
+    Le chiavi (casefold) sono calcolate una sola volta per voce; inserimenti
+    e modifiche trovano la posizione con bisect invece di riordinare tutto.
+    """
+
+    def __init__(self, key_fn: Callable[[Dict], Tuple], descending: bool = False):
+        self.key_fn = key_fn
+        self.descending = descending
+        self._keys: List[Tuple] = []
+        self._entries: List[Dict] = []
+        self._key_by_id: Dict[str, Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, entries: List[Dict]):
+        """Ricostruisce l'indice con un unico ordinamento"""
+        pairs = sorted(((self.key_fn(entry), entry) for entry in entries), key=lambda pair: pair[0])
+        self._keys = [key for key, _ in pairs]
+        self._entries = [entry for _, entry in pairs]
+        self._key_by_id = {entry["id"]: key for key, entry in pairs}
+
+    def add(self, entry: Dict) -> int:
+        """Inserisce una voce nella sua posizione, restituita come posizione di visualizzazione"""
+        key = self.key_fn(entry)
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._entries.insert(position, entry)
+        self._key_by_id[entry["id"]] = key
+        return self._display_position(position)
+
+    def remove(self, entry_id: str) -> Optional[int]:
+        """Rimuove una voce, restituendo la posizione di visualizzazione che occupava"""
+        key = self._key_by_id.pop(entry_id, None)
+        if key is None:
+            return None
+        position = bisect_left(self._keys, key)
+        display_position = self._display_position(position)
+        del self._keys[position]
+        del self._entries[position]
+        return display_position
+
+    def update(self, entry: Dict) -> int:
+        """Riposiziona una voce modificata"""
+        self.remove(entry["id"])
+        return self.add(entry)
+
+    def position(self, entry_id: str) -> Optional[int]:
+        """Posizione di visualizzazione di una voce"""
+        key = self._key_by_id.get(entry_id)
+        if key is None:
+            return None
+        return self._display_position(bisect_left(self._keys, key))
+
+    def items(self) -> List[Dict]:
+        """Copia della lista nell'ordine di visualizzazione"""
+        return self._entries[::-1] if self.descending else list(self._entries)
+
+    def _display_position(self, position: int) -> int:
+        if self.descending:
+            # Dopo un inserimento la lista è già cresciuta, dopo una rimozione non ancora
+            return len(self._entries) - 1 - position
+        return position
+
+
+class SortedViews:
+    """
+    Viste ordinate sulle password dell'utente
+
+    Ogni ordinamento viene costruito al primo utilizzo e poi mantenuto in
+    modo incrementale a ogni modifica, quindi cambiare ordinamento costa
+    solo la copia della lista già ordinata. Le viste possono essere lette
+    anche dal thread di ricerca (accesso protetto da lock).
+    """
+
+    def __init__(self, source: Callable[[], List[Dict]],
+                 keys: Optional[Dict[str, Callable[[Dict], Tuple]]] = None):
+        """
+        Args:
+            source: Restituisce le password in ordine di inserimento
+            keys: Ordinamenti aggiuntivi rispetto a SORT_KEYS
+        """
+        self.source = source
+        self.keys = dict(SORT_KEYS)
+        if keys:
+            self.keys.update(keys)
+        self._lock = threading.RLock()
+        self._indexes: Dict[str, SortIndex] = {}
+        self._deferred: Dict[str, Dict[str, Dict]] = {}   # ordinamento -> id -> voce da riposizionare
+
+    def items(self, order: str) -> List[Dict]:
+        """Password nell'ordinamento indicato (riposiziona le voci rimandate con defer)"""
+        with self._lock:
+            if order not in self.keys:
+                return list(self.source())
+            index = self._index(order)
+            for entry in self._deferred.pop(order, {}).values():
+                index.update(entry)
+            return index.items()
+
+    def position(self, order: str, entry_id: str) -> Optional[int]:
+        """Posizione di una password nell'ordinamento indicato (None = in ordine di inserimento)"""
+        with self._lock:
+            if order not in self.keys:
+                return None
+            return self._index(order).position(entry_id)
+
+    def add(self, entry: Dict):
+        with self._lock:
+            for index in self._indexes.values():
+                index.add(entry)
+
+    def update(self, entry: Dict, orders: Optional[Tuple[str, ...]] = None):
+        """Riposiziona una voce modificata (solo negli ordinamenti indicati, se presenti)"""
+        with self._lock:
+            for order, index in self._indexes.items():
+                if orders is None or order in orders:
+                    self._deferred.get(order, {}).pop(entry["id"], None)
+                    index.update(entry)
+
+    def defer(self, entry: Dict, order: str):
+        """
+        Segna una voce la cui chiave è cambiata senza riposizionarla subito
+
+        La lista mostrata resta nell'ordine attuale e le posizioni restituite
+        da position() restano coerenti con quella; la voce viene riposizionata
+        alla prossima lettura completa della vista con items().
+        """
+        with self._lock:
+            if order in self._indexes:
+                self._deferred.setdefault(order, {})[entry["id"]] = entry
+
+    def remove(self, entry_id: str):
+        with self._lock:
+            for index in self._indexes.values():
+                index.remove(entry_id)
+            for deferred in self._deferred.values():
+                deferred.pop(entry_id, None)
+
+    def invalidate(self, order: str):
+        """Scarta una vista, ricostruita al prossimo utilizzo (chiavi cambiate in blocco)"""
+        with self._lock:
+            self._indexes.pop(order, None)
+            self._deferred.pop(order, None)
+
+    def clear(self):
+        """Scarta tutte le viste (login, logout)"""
+        with self._lock:
+            self._indexes.clear()
+            self._deferred.clear()
+
+    def _index(self, order: str) -> SortIndex:
+        index = self._indexes.get(order)
+        if index is None:
+            index = SortIndex(self.keys[order], descending=order in DESCENDING_ORDERS)
+            index.rebuild(self.source())
+            self._indexes[order] = index
+        return index
@@ -0,0 +1,112 @@
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Import mostrati nel rapporto, dal più lento
+TOP_IMPORTS = 15
+
+
+class StartupProfiler:
+    """
+    Tempi di avvio dell'applicazione (main.py --profile-startup)
+
+    Registra le fasi di inizializzazione, il tempo proprio di ogni import
+    (senza quello dei moduli che a sua volta importa) e il momento in cui
+    la finestra di login diventa visibile. Disattivato non fa nulla, quindi
+    le chiamate possono restare nel codice.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []        # (fase, ms)
+        self.marks: List[Tuple[str, float]] = []         # (evento, ms dall'avvio)
+        self.imports: Dict[str, float] = {}              # modulo -> ms
+        self._original_import = None
+        self._children: List[float] = []   # tempo degli import annidati, per livello
+
+    def enable(self):
+        """Attiva il profilo e inizia a misurare gli import"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        """Ferma la misura degli import (le misure raccolte restano)"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Misura una fase di inizializzazione"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def mark(self, name: str):
+        """Registra un evento con il tempo trascorso dall'avvio"""
+        if self.enabled:
+            self.marks.append((name, (time.perf_counter() - self.start) * 1000))
+
+    def elapsed(self, name: str) -> Optional[float]:
+        """Tempo dall'avvio di un evento registrato, in ms"""
+        for mark, ms in self.marks:
+            if mark == name:
+                return ms
+        return None
+
+    def report(self) -> str:
+        lines = ["Profilo di avvio:"]
+        for name, ms in self.marks:
+            lines.append(f"  {ms:8.1f} ms  {name}")
+        if self.phases:
+            lines.append("Fasi di inizializzazione:")
+            for name, ms in self.phases:
+                lines.append(f"  {ms:8.1f} ms  {name}")
+        if self.imports:
+            lines.append(f"Import più lenti, tempo proprio (totale {sum(self.imports.values()):.1f} ms):")
+            slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+            for name, ms in slowest[:TOP_IMPORTS]:
+                lines.append(f"  {ms:8.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            try:
+                module = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                pass
+        # Moduli già caricati: nessun costo da misurare
+        if module in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        # Tempo proprio del modulo: gli import annidati sono attribuiti a loro stessi
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.imports[module] = self.imports.get(module, 0.0) + elapsed - children
+
+
+# Istanza globale, attivata da main.py con --profile-startup
+startup_profiler = StartupProfiler()
@@ -0,0 +1,189 @@
+import math
+import os
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .password_strength import (
+    ASCII_UPPER, ASCII_LOWER, CRITERIA, DECIMAL, DIGIT, LOWER, SEQUENCE_TRIGRAMS,
+    SPECIAL, UPPER, PasswordAnalysis, PasswordValidator, _classify,
+)
+
+# Password per blocco vettoriale: le password sono ordinate per lunghezza,
+# quindi ogni blocco ha poco riempimento
+CHUNK_SIZE = 4096
+
+# Senza NumPy il pool di processi conviene solo oltre questa dimensione
+PROCESS_POOL_THRESHOLD = 50000
+
+# Codici Unicode: 21 bit, quindi una terna sta in un intero a 64 bit
+CODE_BITS = 21
+
+# log2 della dimensione del pool di caratteri per ogni combinazione di
+# classi (minuscole, maiuscole, cifre, simboli), calcolato come nel caso scalare
+_POOL_SIZES = (26, 26, 10, 18)
+_LOG2_POOL = [
+    math.log2(pool) if pool else 0.0
+    for pool in (sum(size for bit, size in enumerate(_POOL_SIZES) if combo >> bit & 1)
+                 for combo in range(16))
+]
+
+
+def _load_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def analyze_many(validator: PasswordValidator, passwords: Sequence[str],
+                 workers: Optional[int] = None) -> List[PasswordAnalysis]:
+    """
+    Analisi di molte password, identica a validator.analyze_password
+
+    Con NumPy i criteri sono calcolati su matrici di codici Unicode; senza,
+    i lotti oltre PROCESS_POOL_THRESHOLD sono divisi fra più processi e gli
+    altri analizzati uno alla volta.
+    """
+    passwords = list(passwords)
+    if not passwords:
+        return []
+
+    np = _load_numpy()
+    if np is not None:
+        return _analyze_vectorized(np, validator, passwords)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(passwords) >= PROCESS_POOL_THRESHOLD:
+        return _analyze_in_pool(validator, passwords, workers)
+    return [validator.analyze_password(password) for password in passwords]
+
+
+def _analyze_vectorized(np, validator: PasswordValidator, passwords: List[str]) -> List[PasswordAnalysis]:
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=len(passwords))
+    order = np.argsort(lengths, kind="stable")
+
+    masks = np.zeros(len(passwords), dtype=np.int64)
+    for start in range(0, len(passwords), CHUNK_SIZE):
+        indexes = order[start:start + CHUNK_SIZE]
+        chunk = [passwords[i] for i in indexes]
+        masks[indexes] = _criteria_masks(np, chunk, lengths[indexes], validator.is_common)
+
+    # Il risultato dipende solo dai criteri: una analisi per combinazione
+    combos, inverse = np.unique(masks, return_inverse=True)
+    by_combo = [validator._analysis_from_criteria(_criteria_dict(int(mask))) for mask in combos]
+    results = [by_combo[i] for i in inverse.tolist()]
+
+    for i in np.flatnonzero(lengths == 0).tolist():
+        results[i] = validator.analyze_password("")
+    return results
+
+
+def _criteria_masks(np, passwords: List[str], lengths, is_common: Callable[[str], bool]) -> "np.ndarray":
+    """Criteri soddisfatti da ogni password, come bit nell'ordine di CRITERIA"""
+    codes, valid = _encode(np, passwords, lengths)
+    classes = _classes(np, codes)
+    classes[~valid] = 0
+    union = np.bitwise_or.reduce(classes, axis=1)
+
+    upper_after_first = (classes[:, 1:] & UPPER).any(axis=1)
+    repeated = ((codes[:, 2:] == codes[:, 1:-1]) & (codes[:, 1:-1] == codes[:, :-2]) & valid[:, 2:]).any(axis=1)
+
+    # Come nel caso scalare, le sequenze si cercano sulla password minuscola
+    lowered = [password.lower() for password in passwords]
+    lower_lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+    lower_codes, lower_valid = _encode(np, lowered, lower_lengths)
+    wide = lower_codes.astype(np.uint64)
+    trigrams = (wide[:, :-2] << (2 * CODE_BITS)) | (wide[:, 1:-1] << CODE_BITS) | wide[:, 2:]
+    sequential = (np.isin(trigrams, _trigram_keys(np)) & lower_valid[:, 2:]).any(axis=1)
+
+    # Lista comune e indice delle password compromesse, una ricerca per password
+    no_common = np.fromiter((not is_common(password) for password in passwords),
+                            dtype=bool, count=len(passwords))
+
+    pool = np.zeros(len(passwords), dtype=np.int64)
+    for bit, char_class in enumerate((LOWER, UPPER, DIGIT, SPECIAL)):
+        pool |= ((union & char_class) != 0).astype(np.int64) << bit
+    entropy = np.asarray(_LOG2_POOL)[pool] * lengths
+
+    criteria = (
+        lengths >= 8, lengths >= 12, lengths >= 16,
+        (union & ASCII_UPPER) != 0, (union & ASCII_LOWER) != 0,
+        (union & DECIMAL) != 0, (union & SPECIAL) != 0,
+        no_common, ~repeated, ~sequential,
+        upper_after_first & ((union & LOWER) != 0),
+        entropy > 50,
+    )
+    masks = np.zeros(len(passwords), dtype=np.int64)
+    for bit, met in enumerate(criteria):
+        masks |= met.astype(np.int64) << bit
+    return masks
+
+
+def _encode(np, passwords: List[str], lengths):
+    """Matrice dei codici Unicode (riempita con zeri) e maschera delle posizioni valide"""
+    width = int(lengths.max()) if len(lengths) else 0
+    if width == 0:
+        return np.zeros((len(passwords), 0), dtype=np.uint32), np.zeros((len(passwords), 0), dtype=bool)
+    # Le stringhe NumPy sono UTF-32: i codici si leggono direttamente dalla memoria
+    codes = np.array(passwords, dtype=f"<U{width}").view(np.uint32).reshape(len(passwords), width)
+    valid = np.arange(width) < lengths[:, None]
+    return codes, valid
+
+
+def _classes(np, codes) -> "np.ndarray":
+    """Classi di ogni carattere (tabella per ASCII, _classify per gli altri)"""
+    table = _ascii_table(np)
+    classes = table[np.minimum(codes, 127)]
+    non_ascii = codes > 127
+    if non_ascii.any():
+        values = codes[non_ascii]
+        unique = np.unique(values)
+        unique_classes = np.fromiter((_classify(chr(code)) for code in unique.tolist()),
+                                     dtype=np.int64, count=len(unique))
+        classes[non_ascii] = unique_classes[np.searchsorted(unique, values)]
+    return classes
+
+
+_tables: Dict[str, object] = {}
+
+
+def _ascii_table(np):
+    table = _tables.get("ascii")
+    if table is None:
+        table = np.array([_classify(chr(code)) for code in range(128)], dtype=np.int64)
+        _tables["ascii"] = table
+    return table
+
+
+def _trigram_keys(np):
+    keys = _tables.get("trigrams")
+    if keys is None:
+        keys = np.array(sorted((ord(a) << (2 * CODE_BITS)) | (ord(b) << CODE_BITS) | ord(c)
+                               for a, b, c in SEQUENCE_TRIGRAMS), dtype=np.uint64)
+        _tables["trigrams"] = keys
+    return keys
+
+
+def _criteria_dict(mask: int) -> Dict[str, bool]:
+    return {name: bool(mask >> bit & 1) for bit, name in enumerate(CRITERIA)}
+
+
+def _analyze_chunk(common_passwords: set, passwords: List[str]) -> List[PasswordAnalysis]:
+    """Analisi di un blocco in un processo del pool"""
+    # L'indice delle password compromesse viene aperto dalla configurazione, come nel processo principale
+    validator = PasswordValidator()
+    validator.common_passwords = common_passwords
+    return [validator._analyze(password) if password else validator.analyze_password(password)
+            for password in passwords]
+
+
+def _analyze_in_pool(validator: PasswordValidator, passwords: List[str], workers: int) -> List[PasswordAnalysis]:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn: un fork del processo con la finestra Tk aperta non è sicuro
+    size = math.ceil(len(passwords) / (workers * 4))
+    chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = pool.map(_analyze_chunk, [validator.common_passwords] * len(chunks), chunks)
+        return [analysis for chunk in results for analysis in chunk]
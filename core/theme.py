@@ -1,5 +1,7 @@
+import weakref
 import customtkinter as ctk
-from typing import Dict, Any, Callable, List
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Hashable, List, Mapping
 from dataclasses import dataclass
 from enum import Enum
 
@@ -25,11 +27,166 @@ class ColorScheme:
     error: str
     info: str
 
+# Palette di default per modalità (i temi in config.json le personalizzano)
+DEFAULT_PALETTES = {
+    "dark": {
+        'background': '#1a1a1a',
+        'surface': '#2d2d30',
+        'secondary': '#3e3e42',
+        'primary': '#0d7377',
+        'accent': '#14a085',
+        'text': '#ffffff',
+        'text_secondary': '#cccccc',
+        'border': '#404040',
+        'hover': '#4a4a4e',
+        'error': '#f44336',
+        'success': '#4caf50',
+        'warning': '#ff9800'
+    },
+    "light": {
+        'background': '#f8f9fa',
+        'surface': '#ffffff',
+        'secondary': '#f1f3f4',
+        'primary': '#1976d2',
+        'accent': '#2196f3',
+        'text': '#212529',
+        'text_secondary': '#6c757d',
+        'border': '#dee2e6',
+        'hover': '#e9ecef',
+        'error': '#dc3545',
+        'success': '#28a745',
+        'warning': '#ffc107'
+    }
+}
+
+# Colori derivati: nome -> (colore di partenza, quanto scurirlo)
+DERIVED_COLORS = {
+    'error_hover': ('error', 0.15),
+    'success_hover': ('success', 0.15),
+    'warning_hover': ('warning', 0.15),
+    'primary_hover': ('primary', 0.15),
+}
+
+def shade(color: str, amount: float) -> str:
+    """Scurisce un colore #rrggbb della frazione indicata (invariato se non è in quel formato)"""
+    try:
+        value = color.lstrip('#')
+        if len(value) != 6:
+            return color
+        channels = [int(value[i:i + 2], 16) for i in (0, 2, 4)]
+    except (AttributeError, ValueError):
+        return color
+    return '#' + ''.join(f"{max(0, min(255, round(channel * (1 - amount)))):02x}" for channel in channels)
+
+class ObserverRegistry:
+    """
+    Registro degli observer del tema con riferimenti deboli
+
+    Gli observer sono indicizzati in un dict: registrazione, rimozione e
+    controllo di presenza costano O(1) e l'ordine di notifica resta quello
+    di registrazione. I metodi legati (il caso dei widget) sono tenuti con
+    WeakMethod, quindi il registro non mantiene in vita un widget mai
+    distrutto con destroy(): alla sua raccolta l'observer sparisce da solo.
+    Le funzioni semplici sono tenute con riferimento forte, come prima.
+    """
+
+    def __init__(self):
+        self._refs: Dict[Hashable, Any] = {}
+        self.registered = 0     # registrazioni totali
+        self.removed = 0        # rimozioni esplicite
+        self.collected = 0      # observer spariti perché il loro oggetto è stato raccolto
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, callback: Callable) -> bool:
+        return self._key(callback) in self._refs
+
+    def add(self, callback: Callable) -> bool:
+        """Registra un observer; False se era già registrato"""
+        key = self._key(callback)
+        if key in self._refs:
+            return False
+
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            def on_collected(ref, key=key):
+                # L'id di un oggetto raccolto può essere riusato: si rimuove solo il proprio riferimento
+                if self._refs.get(key) is ref:
+                    del self._refs[key]
+                    self.collected += 1
+            self._refs[key] = weakref.WeakMethod(callback, on_collected)
+        else:
+            self._refs[key] = callback
+        self.registered += 1
+        return True
+
+    def discard(self, callback: Callable) -> bool:
+        """Rimuove un observer; False se non era registrato"""
+        if self._refs.pop(self._key(callback), None) is None:
+            return False
+        self.removed += 1
+        return True
+
+    def callbacks(self) -> List[Callable]:
+        """Copia degli observer ancora vivi, in ordine di registrazione"""
+        live = []
+        for ref in list(self._refs.values()):
+            callback = ref() if isinstance(ref, weakref.WeakMethod) else ref
+            if callback is not None:
+                live.append(callback)
+        return live
+
+    def counts_by_class(self) -> Dict[str, int]:
+        """Observer vivi per classe dell'oggetto proprietario (diagnostica)"""
+        counts: Dict[str, int] = {}
+        for callback in self.callbacks():
+            owner = getattr(callback, "__self__", None)
+            name = type(owner).__name__ if owner is not None else "function"
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """Contatori del registro"""
+        return {
+            "live": len(self._refs),
+            "registered": self.registered,
+            "removed": self.removed,
+            "collected": self.collected,
+        }
+
+    def clear(self):
+        self._refs.clear()
+
+    @staticmethod
+    def _key(callback: Callable) -> Hashable:
+        # Ogni accesso a widget._update_theme crea un nuovo oggetto metodo:
+        # la chiave è la coppia (oggetto, funzione), non il metodo
+        owner = getattr(callback, "__self__", None)
+        function = getattr(callback, "__func__", None)
+        if owner is not None and function is not None:
+            return id(owner), function
+        return callback
+
+
+# Intervallo del passaggio batch di applicazione del tema (un frame a ~60 Hz)
+THEME_APPLY_DELAY_MS = 16
+
 class ThemeManager:
-    """Gestore centralizzato dei temi con observer pattern"""
+    """
+    Gestore centralizzato dei temi con observer pattern
+    
+    I widget non applicano il tema da soli: si accodano con request_apply e
+    un unico passaggio per frame legge la palette una volta e la applica a
+    tutti i widget in attesa. Cambi di tema ravvicinati confluiscono nello
+    stesso passaggio e i widget che hanno già la palette finale non vengono
+    riconfigurati.
+    """
     
     def __init__(self):
-        self.observers = []
+        self.observers = ObserverRegistry()
+        self._pending_widgets: Dict[int, Any] = {}   # id widget -> widget in attesa del passaggio
+        self._apply_job = None
+        self.apply_passes = 0
         # Inizializza con il tema corrente di CustomTkinter
         current_mode = ctk.get_appearance_mode().lower()
         self.mode = current_mode
@@ -40,6 +197,13 @@ class ThemeManager:
             self.config = config_manager
         except ImportError:
             self.config = None
+        
+        # Palette precalcolate, ricalcolate quando la configurazione viene ricaricata
+        self._palettes: Dict[str, Mapping[str, str]] = {}
+        self.palette_version = 0
+        self._compile_palettes()
+        if self.config:
+            self.config.add_reload_listener(self._on_config_reload)
     
     def set_mode(self, mode: str):
         """Imposta la modalità del tema"""
@@ -59,59 +223,79 @@ class ThemeManager:
         """Ottiene la modalità corrente"""
         return self.mode
     
-    def get_colors(self):
-        """Ottiene i colori del tema corrente"""
-        # Prova a caricare colori personalizzati dalla configurazione
-        if self.config:
-            custom_colors = self.config.get(f'themes.{self.mode}', {})
-            if custom_colors:
-                return custom_colors
+    def get_colors(self) -> Mapping[str, str]:
+        """
+        Ottiene i colori del tema corrente
+        
+        La palette è precalcolata e immutabile: la lettura costa O(1) e può
+        essere fatta a ogni hover senza ricostruire dizionari.
+        """
+        return self._palettes[self.mode]
+    
+    @property
+    def palette_key(self):
+        """Identifica la palette attiva: cambia con la modalità o ricaricando la configurazione"""
+        return self.mode, self.palette_version
+    
+    def _compile_palettes(self):
+        """Precalcola le palette di tutte le modalità (avvio e ricarica della configurazione)"""
+        palettes = {}
+        for mode, defaults in DEFAULT_PALETTES.items():
+            colors = dict(defaults)
+            # I colori personalizzati sostituiscono quelli di default
+            if self.config:
+                colors.update(self.config.themes.colors(mode))
+            
+            # Colori derivati, se non indicati esplicitamente
+            for name, (base, amount) in DERIVED_COLORS.items():
+                if name not in colors:
+                    colors[name] = shade(colors[base], amount)
+            palettes[mode] = MappingProxyType(colors)
+        
+        self._palettes = palettes
+        self.palette_version += 1
+    
+    def _on_config_reload(self):
+        """Ricalcola le palette e riapplica il tema dopo config_manager.reload()"""
+        self._compile_palettes()
+        self._notify_observers()
+    
+    def request_apply(self, widget):
+        """Accoda un widget al prossimo passaggio di applicazione del tema"""
+        self._pending_widgets[id(widget)] = widget
+        if self._apply_job is not None:
+            return
+        
+        try:
+            # Pianificato sulla finestra principale, che sopravvive al widget
+            self._apply_job = widget._root().after(THEME_APPLY_DELAY_MS, self._run_apply_pass)
+        except Exception:
+            self._run_apply_pass()
+    
+    def _run_apply_pass(self):
+        """Applica la palette corrente a tutti i widget in attesa"""
+        self._apply_job = None
+        pending, self._pending_widgets = self._pending_widgets, {}
+        if not pending:
+            return
         
-        # Colori di default
-        if self.mode == "dark":
-            return {
-                'background': '#1a1a1a',
-                'surface': '#2d2d30',
-                'secondary': '#3e3e42',
-                'primary': '#0d7377',
-                'accent': '#14a085',
-                'text': '#ffffff',
-                'text_secondary': '#cccccc',
-                'border': '#404040',
-                'hover': '#4a4a4e',
-                'error': '#f44336',
-                'success': '#4caf50',
-                'warning': '#ff9800'
-            }
-        else:  # light mode
-            return {
-                'background': '#f8f9fa',
-                'surface': '#ffffff',
-                'secondary': '#f1f3f4',
-                'primary': '#1976d2',
-                'accent': '#2196f3',
-                'text': '#212529',
-                'text_secondary': '#6c757d',
-                'border': '#dee2e6',
-                'hover': '#e9ecef',
-                'error': '#dc3545',
-                'success': '#28a745',
-                'warning': '#ffc107'
-            }
+        colors = self.get_colors()
+        palette_key = self.palette_key
+        for widget in pending.values():
+            widget._apply_theme(colors, palette_key)
+        self.apply_passes += 1
     
     def add_observer(self, callback: Callable):
-        """Registra un observer per i cambi di tema"""
-        if callback not in self.observers:
-            self.observers.append(callback)
+        """Registra un observer per i cambi di tema (O(1), riferimento debole per i metodi)"""
+        self.observers.add(callback)
     
     def remove_observer(self, callback: Callable):
-        """Rimuove un observer"""
-        if callback in self.observers:
-            self.observers.remove(callback)
+        """Rimuove un observer (O(1))"""
+        self.observers.discard(callback)
     
     def _notify_observers(self):
         """Notifica tutti gli observer del cambio tema"""
-        for callback in self.observers[:]:  # Copia la lista per evitare problemi di concorrenza
+        for callback in self.observers.callbacks():  # Copia per evitare problemi di concorrenza
             try:
                 callback()
             except Exception:
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+class ViewCache:
+    """
+    Cache LRU delle viste dell'applicazione
+
+    Le viste già costruite non vengono distrutte quando se ne esce: restano
+    nascoste (pack_forget) e tornano visibili senza ricostruire i widget.
+    Oltre la capacità la vista usata meno di recente viene distrutta; le
+    viste legate all'utente vanno invalidate esplicitamente (logout).
+
+    Una vista può definire on_show(), chiamato quando torna visibile dalla
+    cache, per aggiornare i dati che possono essere cambiati nel frattempo.
+    """
+
+    def __init__(self, capacity: int, destroy: Callable):
+        """
+        Args:
+            capacity: Numero massimo di viste mantenute (visibile compresa)
+            destroy: Funzione che distrugge una vista rimossa dalla cache
+        """
+        self.capacity = max(1, capacity)
+        self.destroy = destroy
+        self._views: "OrderedDict[str, object]" = OrderedDict()
+        self.current_name: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+        # Chiamati con (nome vista, fase) attorno a ogni cambio di vista (diagnostica)
+        self.transition_listeners: List[Callable[[str, str], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._views
+
+    @property
+    def current(self):
+        """Vista attualmente visibile"""
+        return self._views.get(self.current_name) if self.current_name else None
+
+    def names(self) -> List[str]:
+        """Nomi delle viste in cache, dalla meno usata di recente"""
+        return list(self._views)
+
+    def show(self, name: str, factory: Callable[[], object]):
+        """
+        Mostra una vista, riusandola se è in cache
+
+        Args:
+            name: Nome della vista (chiave della cache)
+            factory: Crea la vista se non è in cache (senza mostrarla)
+
+        Returns:
+            La vista mostrata
+        """
+        self._notify(name, "before")
+        current = self.current
+        view = self._views.get(name)
+        if view is not None and not self._alive(view):
+            # Distrutta dall'esterno: va ricostruita
+            del self._views[name]
+            view = None
+
+        if current is not None and current is not view:
+            current.pack_forget()
+
+        if view is None:
+            self.misses += 1
+            view = factory()
+            self._views[name] = view
+        else:
+            self.hits += 1
+            if hasattr(view, 'on_show'):
+                view.on_show()
+
+        self._views.move_to_end(name)
+        self.current_name = name
+        view.pack(fill="both", expand=True)
+
+        self._evict()
+        self._notify(name, "after")
+        return view
+
+    def invalidate(self, *names: str):
+        """Distrugge le viste indicate (tutte se non se ne indica nessuna)"""
+        for name in list(names or self._views):
+            view = self._views.pop(name, None)
+            if view is None:
+                continue
+            if name == self.current_name:
+                self.current_name = None
+            self._destroy(view)
+            self._notify(name, "invalidated")
+
+    def _evict(self):
+        """Distrugge le viste nascoste meno usate oltre la capacità"""
+        while len(self._views) > self.capacity:
+            name = next(iter(self._views))
+            if name == self.current_name:
+                break
+            self._destroy(self._views.pop(name))
+
+    def _notify(self, name: str, phase: str):
+        for listener in list(self.transition_listeners):
+            try:
+                listener(name, phase)
+            except Exception as e:
+                print(f"Errore nel listener di navigazione: {e}")
+
+    def _destroy(self, view):
+        try:
+            self.destroy(view)
+        except Exception as e:
+            print(f"Errore distruggendo la vista: {e}")
+
+    @staticmethod
+    def _alive(view) -> bool:
+        try:
+            return bool(view.winfo_exists())
+        except Exception:
+            return False
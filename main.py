@@ -1,7 +1,7 @@
 import os
 import sys
 import subprocess
-import customtkinter as ctk
+import argparse
 from pathlib import Path
 import atexit
 
@@ -48,12 +48,36 @@ sys.path.insert(0, str(current_dir))
 # Registra cleanup
 atexit.register(cleanup_on_exit)
 
+def parse_args(argv=None):
+    """Opzioni da riga di comando"""
+    parser = argparse.ArgumentParser(description="Password manager")
+    parser.add_argument("--install-deps", action="store_true",
+                        help="installa le dipendenze mancanti prima dell'avvio")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="mostra i tempi di import e inizializzazione fino alla finestra di login")
+    return parser.parse_args(argv)
+
 def main():
     """Punto di ingresso principale dell'applicazione"""
+    args = parse_args()
+    
+    # Il profilo parte prima di qualunque import pesante
+    from core.startup import startup_profiler
+    if args.profile_startup:
+        startup_profiler.enable()
+    
     app = None
     try:
-        # Installa dipendenze se necessario
-        install_dependencies()
+        # Il controllo delle dipendenze (import e pip) costa a ogni avvio: solo su richiesta
+        if args.install_deps:
+            with startup_profiler.phase("installazione dipendenze"):
+                install_dependencies()
+        
+        try:
+            import customtkinter as ctk
+        except ImportError as e:
+            print(f"Dipendenza mancante: {e.name}. Avvia con --install-deps per installarla.")
+            return
         
         # Crea le directory necessarie
         data_dir = current_dir / "data"
@@ -66,18 +90,22 @@ def main():
         ctk.set_default_color_theme("blue")
         
         # Carica configurazione
-        from core.config import config_manager
+        with startup_profiler.phase("configurazione"):
+            from core.config import config_manager
         print(f"Configurazione caricata da: {config_manager.config_file}")
         
         # Inizializza il theme manager dopo aver configurato CustomTkinter
-        from core.theme import theme_manager
-        theme_manager.set_mode("light")  # Assicura sincronizzazione
+        with startup_profiler.phase("tema"):
+            from core.theme import theme_manager
+            theme_manager.set_mode("light")  # Assicura sincronizzazione
         
         # Importa l'app solo dopo aver configurato tutto
-        from core.app import PasswordManagerApp
+        with startup_profiler.phase("import applicazione"):
+            from core.app import PasswordManagerApp
         
         # Crea e avvia l'applicazione
-        app = PasswordManagerApp()
+        with startup_profiler.phase("creazione finestra e login"):
+            app = PasswordManagerApp()
         
         # Gestisci graceful shutdown
         def on_closing():
@@ -0,0 +1,111 @@
+"""
+Verifica dell'audit del vault e dei risultati salvati crittografati
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import hashlib
+import hmac
+import json
+import tempfile
+import time
+import unittest
+
+from cryptography.fernet import Fernet
+
+from core.audit import AUDIT_FILE_VERSION, FINGERPRINT_CONTEXT, VaultAuditor
+from core.database import PasswordDatabase
+
+MASTER = "Master-Password-1!"
+PASSWORDS = {
+    "github.com": "Xq7!vR2#pL9@wT4z",
+    "gitlab.com": "Xq7!vR2#pL9@wT4z",   # riutilizzata
+    "mail.example.com": "password",      # comune e debole
+    "bank.example.it": "Tz8$kM3^nB6&hJ1q",
+}
+
+
+class AuditCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.database = PasswordDatabase(directory.name)
+        self.database.register_user("mario", MASTER)
+        self.database.login("mario", MASTER)
+        for site, password in PASSWORDS.items():
+            self.database.add_password(site, "mario", password)
+        self._wait_background()
+        self.auditor = VaultAuditor(self.database)
+        self.path = self.database.users_dir / "mario.audit.json"
+
+    def _wait_background(self):
+        # Indici e livelli di forza vengono calcolati in background dopo il login
+        deadline = time.monotonic() + 5
+        while not (self.database.strengths_ready and self.database.search_index.ready) \
+                and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _key_id(self, key):
+        fingerprint_key = hmac.new(key, FINGERPRINT_CONTEXT, hashlib.sha256).digest()
+        return hmac.new(fingerprint_key, b"key-id", hashlib.sha256).hexdigest()[:16]
+
+    def _entry_id(self, site):
+        return next(entry["id"] for entry in self.database.get_passwords() if entry["site"] == site)
+
+    def _issues(self, report):
+        return {entry.site: set(entry.issues) for entry in report.entries}
+
+    def test_report_and_incremental_rerun(self):
+        first = self.auditor.run()
+        self.assertEqual((first.analyzed, first.cached), (4, 0))
+        issues = self._issues(first)
+        self.assertIn("reused", issues["github.com"])
+        self.assertIn("reused", issues["gitlab.com"])
+        self.assertTrue({"weak", "breached"} <= issues["mail.example.com"])
+        self.assertEqual(issues["bank.example.it"], set())
+
+        second = self.auditor.run()
+        self.assertEqual((second.analyzed, second.cached), (0, 4))
+        self.assertEqual(self._issues(second), issues)
+
+        self.database.update_password(self._entry_id("mail.example.com"), "mail.example.com", "mario",
+                                      "Nw5%cX8*fG2!yH7s")
+        third = self.auditor.run()
+        self.assertEqual((third.analyzed, third.cached), (1, 3))
+        self.assertEqual(self._issues(third)["mail.example.com"], set())
+
+    def test_cache_file_is_encrypted(self):
+        report = self.auditor.run()
+        text = self.path.read_text(encoding="utf-8")
+        data = json.loads(text)
+        self.assertEqual(data["version"], AUDIT_FILE_VERSION)
+        self.assertEqual(set(data), {"version", "key_id", "data"})
+        for entry in report.entries:
+            self.assertNotIn(entry.fingerprint, text)
+            self.assertNotIn(entry.id, text)
+        for password in PASSWORDS.values():
+            self.assertNotIn(password, text)
+
+    def test_reload_with_wrong_key_discards_cache(self):
+        self.auditor.run()
+        key = self.database.current_key
+        self.assertEqual(len(self.auditor._load_cache(self.path, key, self._key_id(key))), 4)
+
+        wrong_key = Fernet.generate_key()
+        # Identificativo di un'altra chiave: scartato senza tentare la decrittazione
+        self.assertEqual(self.auditor._load_cache(self.path, wrong_key, self._key_id(wrong_key)), {})
+        # Identificativo corretto ma chiave sbagliata: la decrittazione fallisce
+        self.assertEqual(self.auditor._load_cache(self.path, wrong_key, self._key_id(key)), {})
+
+    def test_plaintext_v1_file_is_ignored(self):
+        self.path.write_text(json.dumps({"version": 1, "entries": {}}), encoding="utf-8")
+        report = self.auditor.run()
+        self.assertEqual(report.cached, 0)
+        self.assertEqual(json.loads(self.path.read_text(encoding="utf-8"))["version"], AUDIT_FILE_VERSION)
+
+    def test_cancelled_audit(self):
+        self.assertIsNone(self.auditor.run(is_cancelled=lambda: True))
+
+
+if __name__ == "__main__":
+    unittest.main()
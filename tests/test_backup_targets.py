@@ -0,0 +1,208 @@
+"""
+Verifica di S3Target su uno storage S3 simulato (moto), al posto di MinIO
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core.backup import BackupCatalog
+from core.backup_targets import S3_MIN_PART_SIZE, BackupTarget, LocalDirectoryTarget, S3Target, file_sha256
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+BUCKET = "vault-backups"
+
+
+@unittest.skipIf(mock_aws is None, "boto3 e moto richiesti per il target S3 simulato")
+class S3TargetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+
+        self.target = S3Target("minio", BUCKET, prefix="backups", access_key="test", secret_key="test",
+                               chunk_size=S3_MIN_PART_SIZE, max_workers=1)
+        self.client = self.target._get_client()
+        self.client.create_bucket(Bucket=BUCKET)
+        self.real_upload_part = self.client.upload_part
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # Tre parti: due da 5 MiB e una più piccola
+        self.source = Path(directory.name) / "backup.json"
+        self.source.write_bytes(os.urandom(2 * S3_MIN_PART_SIZE + 1234))
+        self.state = {"size": self.source.stat().st_size, "sha256": file_sha256(self.source)}
+        self.checkpoints = 0
+
+    def _checkpoint(self):
+        self.checkpoints += 1
+
+    def _upload(self):
+        return self.target.upload(self.source, "backup.json", self.state, self._checkpoint)
+
+    def _wrap_upload_part(self, fail_on=(), bad_etag_on=()):
+        """Sostituisce upload_part: registra le parti inviate e simula errori"""
+        original = self.real_upload_part
+        sent = []
+
+        def upload_part(**kwargs):
+            number = kwargs["PartNumber"]
+            if number in fail_on:
+                raise ConnectionError(f"connessione interrotta alla parte {number}")
+            sent.append(number)
+            response = original(**kwargs)
+            if number in bad_etag_on:
+                response = dict(response, ETag='"00000000000000000000000000000000"')
+            return response
+
+        self.client.upload_part = upload_part
+        return sent
+
+    def _remote_bytes(self) -> bytes:
+        return self.client.get_object(Bucket=BUCKET, Key="backups/backup.json")["Body"].read()
+
+    def test_base_target_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BackupTarget("base")
+
+    def test_small_file_single_put(self):
+        self.source.write_bytes(b"piccolo backup")
+        self.state = {"size": self.source.stat().st_size, "sha256": file_sha256(self.source)}
+
+        success, location = self._upload()
+
+        self.assertTrue(success, location)
+        self.assertEqual(location, f"s3://{BUCKET}/backups/backup.json")
+        self.assertEqual(self._remote_bytes(), b"piccolo backup")
+        self.assertEqual(self.state["parts"]["0"]["etag"], hashlib.md5(b"piccolo backup").hexdigest())
+
+    def test_multipart_resume_uploads_only_missing_parts(self):
+        self._wrap_upload_part(fail_on={3})
+        success, message = self._upload()
+        self.assertFalse(success)
+        self.assertIn("parte 3", message)
+        self.assertIn("upload_id", self.state)
+        self.assertEqual(sorted(self.state["parts"]), ["0", "1"])
+
+        sent = self._wrap_upload_part()
+        success, location = self._upload()
+
+        self.assertTrue(success, location)
+        self.assertEqual(sent, [3])
+        self.assertNotIn("upload_id", self.state)
+        self.assertEqual(self._remote_bytes(), self.source.read_bytes())
+
+    def test_resume_reuploads_parts_with_mismatched_etag(self):
+        self._wrap_upload_part(fail_on={3})
+        self._upload()
+        # Il catalogo non corrisponde più al server: la parte va ricaricata
+        self.state["parts"]["1"]["etag"] = "etag-non-valido"
+
+        sent = self._wrap_upload_part()
+        success, location = self._upload()
+
+        self.assertTrue(success, location)
+        self.assertEqual(sorted(sent), [2, 3])
+        self.assertEqual(self._remote_bytes(), self.source.read_bytes())
+
+    def test_wrong_etag_from_server_fails_upload(self):
+        self._wrap_upload_part(bad_etag_on={2})
+
+        success, message = self._upload()
+
+        self.assertFalse(success)
+        self.assertIn("ETag della parte 2", message)
+        self.assertNotIn("1", self.state["parts"])
+
+    def test_expired_upload_restarts(self):
+        self._wrap_upload_part(fail_on={2})
+        self._upload()
+        self.client.abort_multipart_upload(Bucket=BUCKET, Key="backups/backup.json",
+                                           UploadId=self.state["upload_id"])
+        expired = self.state["upload_id"]
+
+        sent = self._wrap_upload_part()
+        success, location = self._upload()
+
+        self.assertTrue(success, location)
+        self.assertEqual(sorted(sent), [1, 2, 3])
+        self.assertNotEqual(self.state.get("upload_id"), expired)
+        self.assertEqual(self._remote_bytes(), self.source.read_bytes())
+
+
+class S3TargetWithoutBoto3Test(unittest.TestCase):
+
+    def test_missing_boto3_error_message(self):
+        target = S3Target("minio", BUCKET)
+        with mock.patch.dict(sys.modules, {"boto3": None}):
+            with self.assertRaises(RuntimeError) as error:
+                target._get_client()
+        self.assertIn("requirements-s3.txt", str(error.exception))
+
+
+class BackupCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.source = self.directory / "backup.json"
+        self.source.write_bytes(os.urandom(64 * 1024 + 321))
+        self.catalog = BackupCatalog(self.directory / "catalog.json")
+        self.catalog.register(self.source)
+        self.target = LocalDirectoryTarget("copia", str(self.directory / "remoto"), chunk_size=4096, max_workers=4)
+
+    def _saved_parts(self):
+        data = json.loads(self.catalog.catalog_file.read_text(encoding="utf-8"))
+        return data["backups"]["backup.json"]["targets"]["copia"]["parts"]
+
+    def test_target_works_on_a_copy_of_the_state(self):
+        state = self.catalog.target_state("backup.json", self.target)
+        state["parts"]["0"] = {"sha256": "x"}
+        self.assertEqual(self.catalog.get_uploads("backup.json")["copia"]["parts"], {})
+
+        self.catalog.update_target_state("backup.json", "copia", state)
+        uploads = self.catalog.get_uploads("backup.json")
+        self.assertEqual(uploads["copia"]["parts"], {"0": {"sha256": "x"}})
+        uploads["copia"]["parts"].clear()
+        self.assertEqual(self._saved_parts(), {"0": {"sha256": "x"}})
+
+    def test_checkpoints_while_catalog_is_saved_concurrently(self):
+        state = self.catalog.target_state("backup.json", self.target)
+        stop = threading.Event()
+
+        def save_loop():
+            while not stop.is_set():
+                self.catalog.save()
+
+        saver = threading.Thread(target=save_loop)
+        saver.start()
+        try:
+            with mock.patch("builtins.print") as printed:
+                success, location = self.target.upload(
+                    self.source, "backup.json", state,
+                    lambda: self.catalog.update_target_state("backup.json", "copia", state))
+        finally:
+            stop.set()
+            saver.join()
+
+        self.assertTrue(success, location)
+        printed.assert_not_called()
+        self.assertEqual(len(self._saved_parts()), len(state["parts"]))
+        self.assertEqual(Path(location).read_bytes(), self.source.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Verifica dell'indice delle password compromesse (Bloom + tabella ordinata letta con mmap)
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import hashlib
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core import breach_corpus
+from core.breach_corpus import (DIGEST_SIZE, BreachCorpus, build_index, close_breach_corpora,
+                                get_breach_corpus)
+from core.config import config_manager
+from core.password_strength import PasswordValidator
+
+
+def sha1(text: str) -> bytes:
+    return hashlib.sha1(text.encode()).digest()
+
+
+class BreachCorpusTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.addCleanup(close_breach_corpora)
+
+        rng = random.Random(21)
+        self.plain = [f"segreta{number}" for number in range(3000)]
+        # Righe di un export SHA-1 (con conteggio, come Have I Been Pwned) e duplicati
+        self.hashed = ["Esatta-Maiuscola", "hunter2!"]
+        lines = self.plain + [f"{sha1(password).hex().upper()}:{rng.randint(1, 99)}" for password in self.hashed]
+        lines += self.plain[:100] + [""]
+        self.source = self.directory / "lista.txt"
+        self.source.write_text("\n".join(lines), encoding="utf-8")
+        self.index = self.directory / "corpus.idx"
+
+    def _build(self, **kwargs) -> BreachCorpus:
+        success, message = build_index(self.source, self.index, **kwargs)
+        self.assertTrue(success, message)
+        corpus = BreachCorpus(self.index)
+        self.addCleanup(corpus.close)
+        return corpus
+
+    def test_membership_is_exact(self):
+        corpus = self._build()
+        self.assertEqual(len(corpus), len(self.plain) + len(self.hashed))
+        for password in self.plain[::37] + self.hashed:
+            self.assertIn(password, corpus)
+        # In chiaro si indicizza il minuscolo: trovata anche con maiuscole
+        self.assertIn("SEGRETA12", corpus)
+        # Gli hash sono della password esatta
+        self.assertNotIn("esatta-maiuscola", corpus)
+        for number in range(3000, 6000):
+            self.assertNotIn(f"segreta{number}", corpus)
+
+    def test_every_table_digest_is_found(self):
+        corpus = self._build(false_positive_rate=0.3)
+        table = self.index.read_bytes()[corpus._table_offset:]
+        digests = [table[start:start + DIGEST_SIZE] for start in range(0, len(table), DIGEST_SIZE)]
+        self.assertEqual(digests, sorted(digests))
+        rng = random.Random(4)
+        missing = [rng.randbytes(DIGEST_SIZE) for _ in range(2000)]
+        for probes in (0, breach_corpus.INTERPOLATION_PROBES):
+            # 0 tentativi: solo bisezione, stesso risultato dell'interpolazione
+            with self.subTest(probes=probes), mock.patch.object(breach_corpus, "INTERPOLATION_PROBES", probes):
+                self.assertTrue(all(corpus.contains_digest(digest) for digest in digests))
+                self.assertFalse(any(corpus.contains_digest(digest) for digest in missing))
+
+    def test_small_build_chunks_merge(self):
+        corpus = self._build(chunk_size=64)
+        self.assertEqual(len(corpus), len(self.plain) + len(self.hashed))
+        self.assertIn(self.plain[-1], corpus)
+
+    def test_invalid_files_are_rejected(self):
+        invalid = self.directory / "non_valido.idx"
+        invalid.write_bytes(b"PMBC" + bytes(60))
+        with self.assertRaises(ValueError):
+            BreachCorpus(invalid)
+
+        self._build()
+        truncated = self.directory / "troncato.idx"
+        truncated.write_bytes(self.index.read_bytes()[:-DIGEST_SIZE])
+        with self.assertRaises(ValueError):
+            BreachCorpus(truncated)
+
+    def test_rebuild_closes_open_index_and_resets_validator_memo(self):
+        self._build()
+        validator = PasswordValidator()
+        with mock.patch.dict(config_manager._compiled.flat, {"security.breach_corpus": str(self.index)}):
+            first = get_breach_corpus()
+            self.assertIs(get_breach_corpus(), first)
+            self.assertTrue(validator.analyze_password("Nuova-Violata-9").criteria_met["no_common"])
+
+            self.source.write_text("nuova-violata-9\n", encoding="utf-8")
+            self.assertTrue(build_index(self.source, self.index)[0])
+
+            self.assertIsNone(first._map)
+            second = get_breach_corpus()
+            self.assertIsNot(second, first)
+            self.assertNotEqual(second.identity, first.identity)
+            self.assertFalse(validator.analyze_password("Nuova-Violata-9").criteria_met["no_common"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Verifica di CompiledConfig e della ricarica del file di configurazione
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.config import DEFAULT_STRENGTH_LEVELS, CompiledConfig, ConfigManager
+
+RAW = {
+    "app": {"title": "Vault", "geometry": {"width": 1200}, "config_watch_ms": 500},
+    "ui": {"fonts": {"body": {"size": 13}}, "spacing": {"medium": 12}},
+    "password_generator": {"strength_levels": {"0": "Pessima"}},
+    "messages": {"errors": {"login_failed": "No"}},
+}
+
+
+class CompiledConfigTest(unittest.TestCase):
+
+    def setUp(self):
+        self.compiled = CompiledConfig(RAW)
+
+    def test_flat_paths_include_sections(self):
+        self.assertEqual(self.compiled.flat["app.geometry.width"], 1200)
+        self.assertIs(self.compiled.flat["app.geometry"], RAW["app"]["geometry"])
+        self.assertNotIn("app.geometry.height", self.compiled.flat)
+
+    def test_typed_sections_with_defaults(self):
+        app = self.compiled.app
+        self.assertEqual((app.title, app.width, app.height, app.config_watch_ms), ("Vault", 1200, 700, 500))
+        self.assertEqual(self.compiled.ui.font("body").size, 13)
+        self.assertEqual(self.compiled.ui.font("body").weight, "normal")
+        self.assertEqual(self.compiled.ui.font("missing").size, 12)
+        self.assertEqual(self.compiled.messages.strength_name(0), "Pessima")
+        self.assertEqual(self.compiled.messages.strength_name(5), DEFAULT_STRENGTH_LEVELS[5])
+        self.assertEqual(self.compiled.messages.strength_name(9), "Sconosciuta")
+
+    def test_sections_are_read_only(self):
+        with self.assertRaises(TypeError):
+            self.compiled.ui.spacing["medium"] = 1
+        with self.assertRaises(AttributeError):
+            self.compiled.app.title = "altro"
+
+
+class ConfigManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "config.json"
+        self.writes = 0
+        self._write(json.dumps(RAW))
+        self.manager = ConfigManager(str(self.path))
+        self.reloads = 0
+        self.manager.add_reload_listener(self._on_reload)
+
+    def _on_reload(self):
+        self.reloads += 1
+
+    def _write(self, text):
+        self.path.write_text(text, encoding="utf-8")
+        # Il controllo usa mtime e dimensione: ogni scrittura avanza l'mtime di un secondo
+        # per non dipendere dalla risoluzione del file system
+        self.writes += 1
+        stamp = self.path.stat().st_mtime_ns + self.writes * 10 ** 9
+        os.utime(self.path, ns=(stamp, stamp))
+
+    def test_get_and_format(self):
+        self.assertEqual(self.manager.get("app.title"), "Vault")
+        self.assertEqual(self.manager.get("app.missing", 7), 7)
+        self.assertEqual(self.manager.get_spacing("medium"), 12)
+        self.assertEqual(self.manager.format_message("messages.errors.login_failed", extra=1), "No")
+
+    def test_unchanged_file_is_not_reloaded(self):
+        self.assertFalse(self.manager.check_for_changes())
+        self.assertEqual(self.reloads, 0)
+
+    def test_changed_file_is_reloaded(self):
+        self._write(json.dumps(dict(RAW, app={"title": "Nuovo"})))
+        self.assertTrue(self.manager.check_for_changes())
+        self.assertEqual(self.manager.app.title, "Nuovo")
+        self.assertEqual(self.reloads, 1)
+        self.assertFalse(self.manager.check_for_changes())
+
+    def test_broken_file_keeps_current_config(self):
+        self._write('{"app": ')
+        self.assertFalse(self.manager.check_for_changes())
+        self.assertEqual(self.manager.app.title, "Vault")
+        self.assertEqual(self.reloads, 0)
+
+    def test_missing_file_uses_defaults(self):
+        manager = ConfigManager(str(self.path.with_name("assente.json")))
+        self.assertEqual(manager.app.title, "Password Manager")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Stress test dei leak: login -> ricerca -> logout ripetuti senza crescita della memoria
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import unittest
+
+from core.diagnostics import (
+    MAX_GROWTH_PER_CYCLE, WARMUP_CYCLES, Diagnostics, _display_available, growth_per_cycle,
+    stress_database, stress_views,
+)
+
+CYCLES = 10
+SIZE = 100
+
+
+class GrowthPerCycleTest(unittest.TestCase):
+
+    def test_slope_after_warmup(self):
+        values = [0, 5000, 9000] + [1000 + 100 * cycle for cycle in range(6)]
+        self.assertAlmostEqual(growth_per_cycle(values, warmup=3), 100)
+
+    def test_flat_series(self):
+        self.assertEqual(growth_per_cycle([42] * 10), 0)
+
+    def test_too_few_values(self):
+        self.assertEqual(growth_per_cycle([1]), 0)
+
+
+class StressTest(unittest.TestCase):
+
+    def setUp(self):
+        self.diagnostics = Diagnostics(keep_snapshots=False)
+        self.addCleanup(self.diagnostics.stop)
+
+    def _assert_no_growth(self, label: str):
+        samples = self.diagnostics.cycles(label)
+        self.assertEqual(len(samples), CYCLES)
+        growth = growth_per_cycle([sample.traced_bytes for sample in samples])
+        self.assertLessEqual(growth, MAX_GROWTH_PER_CYCLE, self.diagnostics.report(label))
+
+    def test_database_cycles(self):
+        stress_database(self.diagnostics, CYCLES, SIZE)
+        self._assert_no_growth("database")
+
+    @unittest.skipUnless(_display_available(), "display richiesto per i cicli delle viste")
+    def test_view_cycles(self):
+        stress_views(self.diagnostics, CYCLES, SIZE)
+        self._assert_no_growth("views")
+        widgets = [sample.widget_total for sample in self.diagnostics.cycles("views")][WARMUP_CYCLES:]
+        self.assertLessEqual(widgets[-1], widgets[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
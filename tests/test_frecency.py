@@ -0,0 +1,134 @@
+"""
+Verifica di FrecencyTracker (decadimento, classifica, salvataggio) e del riposizionamento rimandato
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.frecency import BOOST_PER_USE, EPOCH, MAX_BOOST, FrecencyTracker
+from core.sort_index import SortedViews
+from tests.test_search_index import ids, make_entries
+
+DAY = 86400.0
+# Istanti assoluti (time.time()) usati dai test
+T0 = EPOCH + 100 * DAY
+
+
+class FrecencyTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "mario.usage.json"
+        self.tracker = FrecencyTracker(half_life_days=14, flush_every=1000)
+        self.tracker.load(self.path)
+
+    def test_score_halves_every_half_life(self):
+        self.tracker.record("a", now=T0)
+        self.tracker.record("a", now=T0)
+        self.assertAlmostEqual(self.tracker.score("a", now=T0), 2.0)
+        self.assertAlmostEqual(self.tracker.score("a", now=T0 + 14 * DAY), 1.0)
+        self.assertAlmostEqual(self.tracker.score("a", now=T0 + 28 * DAY), 0.5)
+        self.assertEqual(self.tracker.score("mai-usata", now=T0), 0.0)
+
+    def test_recent_access_beats_old_frequent_use(self):
+        for _ in range(3):
+            self.tracker.record("vecchia", now=T0)
+        self.tracker.record("recente", now=T0 + 60 * DAY)
+        self.assertEqual(self.tracker.top(2), ["recente", "vecchia"])
+
+    def test_ranking_stays_sorted(self):
+        for number, entry_id in enumerate("abcabca"):
+            self.tracker.record(entry_id, now=T0 + number)
+        # b e c hanno due accessi ciascuno, quelli di c sono più recenti
+        self.assertEqual(self.tracker.top(3), ["a", "c", "b"])
+        self.tracker.remove("a")
+        self.assertEqual(self.tracker.top(3), ["c", "b"])
+
+    def test_boost(self):
+        self.tracker.record("a", now=T0)
+        self.assertAlmostEqual(self.tracker.boost("a", now=T0), BOOST_PER_USE)
+        for _ in range(20):
+            self.tracker.record("a", now=T0)
+        self.assertEqual(self.tracker.boost("a", now=T0), MAX_BOOST)
+        self.assertEqual(self.tracker.boosts(now=T0), {"a": MAX_BOOST})
+        self.assertEqual(self.tracker.boost("b", now=T0), 0.0)
+
+    def test_persistence_round_trip(self):
+        # Al caricamento i punteggi troppo decaduti rispetto ad adesso vengono scartati
+        self.tracker.record("a")
+        self.tracker.record("b")
+        self.tracker.record("b")
+        self.tracker.record("vecchia", now=T0)
+        success, _ = self.tracker.flush()
+        self.assertTrue(success)
+
+        loaded = FrecencyTracker(half_life_days=14)
+        loaded.load(self.path, valid_ids={"b", "vecchia"})
+        self.assertNotIn("a", loaded)
+        self.assertNotIn("vecchia", loaded)
+        self.assertAlmostEqual(loaded.score("b"), 2.0, places=3)
+
+    def test_changed_half_life_is_converted(self):
+        self.tracker.record("a")
+        self.tracker.flush()
+        loaded = FrecencyTracker(half_life_days=7)
+        loaded.load(self.path)
+        # Il punteggio attuale non cambia, da qui decade con la nuova emivita
+        self.assertAlmostEqual(loaded.score("a"), self.tracker.score("a"), places=3)
+
+    def test_corrupt_file_is_ignored(self):
+        self.path.write_text("{non json", encoding="utf-8")
+        self.tracker.load(self.path)
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_flush_only_when_changed(self):
+        self.tracker.flush()
+        self.assertFalse(self.path.exists())
+        self.tracker.record("a", now=T0)
+        self.tracker.flush()
+        self.assertEqual(set(json.loads(self.path.read_text(encoding="utf-8"))["values"]), {"a"})
+
+
+class DeferredPositionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = make_entries(50)
+        self.tracker = FrecencyTracker(flush_every=1000)
+        self.views = SortedViews(lambda: self.entries, {"frecency": self.tracker.sort_key})
+
+    def test_deferred_access_keeps_visible_order(self):
+        visible = ids(self.views.items("frecency"))
+        accessed = self.entries[30]
+        self.tracker.record(accessed["id"])
+        self.views.defer(accessed, "frecency")
+
+        # Le posizioni restano quelle della lista mostrata
+        self.assertEqual(self.views.position("frecency", accessed["id"]), visible.index(accessed["id"]))
+        added = dict(self.entries[0], id="nuova")
+        self.entries.append(added)
+        self.views.add(added)
+        visible.insert(self.views.position("frecency", "nuova"), "nuova")
+        self.assertEqual(ids(self.views._indexes["frecency"].items()), visible)
+
+        # Alla prossima lettura completa la voce usata passa in cima
+        refreshed = ids(self.views.items("frecency"))
+        self.assertEqual(refreshed[0], accessed["id"])
+        self.assertEqual(sorted(refreshed), sorted(visible))
+        self.assertEqual(refreshed, ids(sorted(self.entries, key=self.tracker.sort_key)))
+
+    def test_removed_entry_drops_deferral(self):
+        accessed = self.entries[10]
+        self.views.items("frecency")
+        self.tracker.record(accessed["id"])
+        self.views.defer(accessed, "frecency")
+        self.entries.remove(accessed)
+        self.views.remove(accessed["id"])
+        self.assertNotIn(accessed["id"], ids(self.views.items("frecency")))
+
+
+if __name__ == "__main__":
+    unittest.main()
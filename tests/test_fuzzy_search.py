@@ -0,0 +1,75 @@
+"""
+Verifica della ricerca fuzzy: punteggi e primi K risultati
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import random
+import unittest
+
+from core.fuzzy_search import FuzzyQuery, rank, score_text, top_k
+from core.search_index import SearchIndex
+from tests.test_search_index import ids, make_entries
+
+
+class ScoreTest(unittest.TestCase):
+
+    def score(self, query, text):
+        return score_text(FuzzyQuery(query), text)
+
+    def test_exact_beats_subsequence(self):
+        self.assertGreater(self.score("git", "gitlab.com"), self.score("git", "gxixt.com"))
+
+    def test_prefix_beats_word_start_beats_middle(self):
+        prefix = self.score("mail", "mail.example.com")
+        boundary = self.score("mail", "www.mail.com")
+        middle = self.score("mail", "gmail.com")
+        self.assertGreater(prefix, boundary)
+        self.assertGreater(boundary, middle)
+
+    def test_too_many_gaps_is_no_match(self):
+        self.assertEqual(self.score("abc", "a----------b---------c"), 0)
+        self.assertEqual(self.score("xyz", "github.com"), 0)
+
+    def test_subsequence_stays_in_one_field(self):
+        query = FuzzyQuery("gb")
+        self.assertIsNone(query.pattern.search("g\x00b"))
+        self.assertIsNotNone(query.pattern.search("gitlab"))
+
+
+class TopKTest(unittest.TestCase):
+
+    def test_bounded_top_k_matches_full_sort(self):
+        rng = random.Random(3)
+        # Molti punteggi uguali: a parità vince il documento più vecchio
+        scored = [(float(rng.randint(0, 20)), doc) for doc in range(500)]
+        full = top_k(scored, None)
+        for limit in (1, 5, 50, 499, 1000):
+            with self.subTest(limit=limit):
+                self.assertEqual(top_k(scored, limit), full[:limit])
+        self.assertEqual(full, sorted(scored, key=lambda item: (-item[0], item[1])))
+
+    def test_rank_limit_and_boosts(self):
+        candidates = [(doc, (site, "")) for doc, site in enumerate(("gitlab.com", "github.com", "legit.org"))]
+        self.assertEqual([doc for _, doc in rank("git", candidates)], [0, 1, 2])
+        self.assertEqual([doc for _, doc in rank("git", candidates, limit=1)], [0])
+        boosted = rank("git", candidates, boosts={2: 1000.0})
+        self.assertEqual(boosted[0][1], 2)
+
+    def test_rank_cancelled(self):
+        self.assertIsNone(rank("git", [(0, ("github", ""))], is_cancelled=lambda: True))
+
+
+class SearchRankedTest(unittest.TestCase):
+
+    def test_limited_results_are_prefix_of_unlimited(self):
+        index = SearchIndex()
+        index.rebuild(make_entries(400))
+        for query in ("g", "gi", "git", "gthb", "mail", "rossi", "examp1e"):
+            full = ids(index.search_ranked(query))
+            for limit in (1, 10, 50):
+                with self.subTest(query=query, limit=limit):
+                    self.assertEqual(ids(index.search_ranked(query, limit)), full[:limit])
+
+
+if __name__ == "__main__":
+    unittest.main()
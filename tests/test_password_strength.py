@@ -0,0 +1,99 @@
+"""
+Verifica di scan_password e della memoria delle analisi di PasswordValidator
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import math
+import random
+import re
+import unittest
+
+from core.password_strength import ANALYSIS_MEMO_SIZE, PasswordValidator
+
+SPECIAL_CHARS = "!@#$%^&*(),.?\":{}|<>"
+SEQUENCES = ("0123456789", "abcdefghijklmnopqrstuvwxyz", "qwertyuiopasdfghjklzxcvbnm")
+
+# Casi limite: Unicode, lower() che cambia la lunghezza, cifre non ASCII
+SAMPLES = ["", "a", "aaa", "abc", "CBA", "qwe", "Password1!", "pässwörd", "İstanbul123", "ÀÉÎõü",
+           "٣٤٥abc", "x\U0001F600y", "AAAbbb111", "ewq", "zyx987", "Zz", "MiaPassword!2024", "ẞtraße",
+           "ⅠⅡⅢ", "Tab\tSpace ", "12ab", "Ab"]
+ALPHABET = "aAbBzZ09!?.xyq wİßé٣😀"
+
+
+def reference_criteria(validator, password):
+    """Criteri calcolati come nella versione originale, con una regex o un ciclo per ciascuno"""
+    lowered = password.lower()
+    pool = ((26 if any(c.islower() for c in password) else 0)
+            + (26 if any(c.isupper() for c in password) else 0)
+            + (10 if any(c.isdigit() for c in password) else 0)
+            + (18 if any(c in SPECIAL_CHARS for c in password) else 0))
+    entropy = math.log2(pool) * len(password) if pool else 0
+    return {
+        "length_8": len(password) >= 8,
+        "length_12": len(password) >= 12,
+        "length_16": len(password) >= 16,
+        "uppercase": bool(re.search(r"[A-Z]", password)),
+        "lowercase": bool(re.search(r"[a-z]", password)),
+        "numbers": bool(re.search(r"\d", password)),
+        "special_chars": bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password)),
+        "no_common": not validator.is_common(password),
+        "no_repeated": not any(password[i] == password[i + 1] == password[i + 2]
+                               for i in range(len(password) - 2)),
+        "no_sequential": not any(seq[i:i + 3] in lowered or seq[i:i + 3][::-1] in lowered
+                                 for seq in SEQUENCES for i in range(len(seq) - 2)),
+        "mixed_case": any(c.isupper() for c in password[1:]) and any(c.islower() for c in password),
+        "entropy": entropy > 50,
+    }
+
+
+def random_passwords(count, seed=5):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 24))) for _ in range(count)]
+
+
+class ScanPasswordTest(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = PasswordValidator()
+
+    def test_single_pass_matches_reference(self):
+        for password in SAMPLES + random_passwords(500):
+            with self.subTest(password=password):
+                self.assertEqual(self.validator._check_criteria(password),
+                                 reference_criteria(self.validator, password))
+
+    def test_common_password(self):
+        self.assertFalse(self.validator._check_criteria("Password")["no_common"])
+
+
+class AnalysisMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = PasswordValidator()
+
+    def test_repeated_analysis_is_reused(self):
+        first = self.validator.analyze_password("MiaPassword!2024")
+        self.assertIs(self.validator.analyze_password("MiaPassword!2024"), first)
+        self.assertIsNot(self.validator.analyze_password("MiaPassword!2025"), first)
+
+    def test_memo_is_bounded_lru(self):
+        passwords = [f"Password-{number}" for number in range(ANALYSIS_MEMO_SIZE + 10)]
+        first = self.validator.analyze_password(passwords[0])
+        for password in passwords[1:]:
+            self.validator.analyze_password(password)
+        self.assertEqual(len(self.validator._memo), ANALYSIS_MEMO_SIZE)
+        self.assertIsNot(self.validator.analyze_password(passwords[0]), first)
+
+    def test_memo_does_not_keep_plaintext(self):
+        self.validator.analyze_password("Segreta-123!")
+        for key in self.validator._memo:
+            self.assertEqual(len(key), 16)
+            self.assertNotIn(b"Segreta", key)
+        # Un altro validatore usa un'altra chiave: le impronte non sono confrontabili
+        other = PasswordValidator()
+        other.analyze_password("Segreta-123!")
+        self.assertNotEqual(list(other._memo), list(self.validator._memo))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Verifica del linguaggio di query: analisi e piano eseguito sugli indici
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import unittest
+
+from core.notes_index import NotesIndex, tokenize
+from core.query import WEAK_LEVELS, Predicate, compile_query, parse_query
+from core.search_index import SearchIndex
+from tests.test_search_index import ids, make_entries
+
+NOTES = ("codice pin 1234", "conto corrente bancomat", "", "Banca di famiglia", "recupero account ops")
+
+
+def brute_force(entries, levels, *, site=None, user=None, notes=None, start=None, end=None, weak=None):
+    """Risultato atteso: ogni predicato verificato voce per voce"""
+    results = []
+    for entry in entries:
+        if site and site.lower() not in entry["site"].lower():
+            continue
+        if user and user.lower() not in entry["username"].lower():
+            continue
+        if notes and not all(any(token.startswith(term) for token in tokenize(entry["notes"]))
+                             for term in tokenize(notes)):
+            continue
+        if start and entry["updated_at"] < start or end and entry["updated_at"] >= end:
+            continue
+        if weak is not None and (levels[entry["id"]] in WEAK_LEVELS) != weak:
+            continue
+        results.append(entry["id"])
+    return results
+
+
+class ParseQueryTest(unittest.TestCase):
+
+    def test_plain_text(self):
+        parsed = parse_query("github mario")
+        self.assertTrue(parsed.is_plain)
+        self.assertEqual(parsed.text, "github mario")
+
+    def test_predicates_and_aliases(self):
+        parsed = parse_query('site:bank user:ops notes:"codice pin" weak:si updated:<2025-01-01 extra')
+        self.assertEqual(parsed.predicates, [
+            Predicate("site", "bank"),
+            Predicate("username", "ops"),
+            Predicate("notes", "codice pin"),
+            Predicate("weak", True),
+            Predicate("updated", (None, "2025-01-01")),
+            Predicate("text", "extra"),
+        ])
+        self.assertEqual(parsed.errors, [])
+
+    def test_date_operators(self):
+        self.assertEqual(parse_query("updated:2024-12-24").predicates[0].value, ("2024-12-24", "2024-12-25"))
+        self.assertEqual(parse_query("updated:<=2024-12-31").predicates[0].value, (None, "2025-01-01"))
+        self.assertEqual(parse_query("updated:>2024-02-28").predicates[0].value, ("2024-02-29", None))
+
+    def test_invalid_predicates(self):
+        parsed = parse_query("updated:ieri weak:forse")
+        self.assertEqual(len(parsed.errors), 2)
+        self.assertTrue(parsed.is_invalid)
+        self.assertFalse(parse_query("updated:ieri github").is_invalid)
+
+    def test_unknown_field_is_text(self):
+        parsed = parse_query("https://example.com")
+        self.assertTrue(parsed.is_plain)
+        self.assertEqual(parsed.terms, ["https://example.com"])
+
+
+class QueryPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = make_entries(300)
+        for number, entry in enumerate(self.entries):
+            entry["notes"] = NOTES[number % len(NOTES)]
+        self.levels = {entry["id"]: number % 6 for number, entry in enumerate(self.entries)}
+
+        self.search_index = SearchIndex()
+        self.search_index.rebuild(self.entries)
+        self.search_index.set_strengths((entry, self.levels[entry["id"]]) for entry in self.entries)
+        self.notes_index = NotesIndex()
+        self.notes_index.rebuild(self.entries)
+        self.rated = []
+
+    def _rate(self, entry):
+        self.rated.append(entry["id"])
+        return self.levels[entry["id"]]
+
+    def run_query(self, query, limit=None):
+        plan = compile_query(parse_query(query), self.search_index, self.notes_index, self._rate)
+        return ids(plan.execute(limit))
+
+    def test_predicates_match_brute_force(self):
+        cases = {
+            "site:git": dict(site="git"),
+            "user:ops site:.com": dict(user="ops", site=".com"),
+            "notes:banc": dict(notes="banc"),
+            'notes:"codice pin"': dict(notes="codice pin"),
+            "updated:>=2024-06-01 updated:<2024-09-01": dict(start="2024-06-01", end="2024-09-01"),
+            "weak:true site:mail": dict(weak=True, site="mail"),
+            "weak:false": dict(weak=False),
+            "site:nessuno": dict(site="nessuno"),
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(self.run_query(query), brute_force(self.entries, self.levels, **expected))
+        self.assertEqual(self.rated, [])
+
+    def test_limit(self):
+        full = self.run_query("site:git")
+        self.assertEqual(self.run_query("site:git", limit=5), full[:5])
+
+    def test_notes_scan_while_index_builds(self):
+        expected = self.run_query("notes:banc site:.com")
+        self.notes_index = NotesIndex()
+        self.assertFalse(self.notes_index.ready)
+        plan = compile_query(parse_query("notes:banc site:.com"), self.search_index, self.notes_index, self._rate)
+        self.assertEqual(plan.describe()[-1], "scansione: note: banc")
+        self.assertEqual(ids(plan.execute()), expected)
+
+    def test_weak_rates_unrated_entries(self):
+        expected = self.run_query("weak:true")
+        for entry in self.entries[:10]:
+            self.search_index.set_strength(entry["id"], None)
+        self.assertEqual(self.run_query("weak:true"), expected)
+        self.assertEqual(self.rated, [entry["id"] for entry in self.entries[:10]])
+
+    def test_indexed_predicates_need_no_scan(self):
+        plan = compile_query(parse_query("site:git user:ops"), self.search_index, self.notes_index, self._rate)
+        self.assertEqual(len(plan.lookups), 2)
+        self.assertEqual(plan.scans, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
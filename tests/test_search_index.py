@@ -0,0 +1,147 @@
+"""
+Verifica di SearchIndex: la ricerca con l'indice dà gli stessi risultati della scansione lineare
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import random
+import time
+import unittest
+from unittest import mock
+
+from core.search_index import SearchIndex
+
+SITES = ("github.com", "gitlab.com", "mail.google.com", "bank-online.it", "amazon.it",
+         "login.microsoft.com", "ebay.com", "Posta Certificata", "intranet.example.org")
+USERS = ("mario.rossi", "ops", "admin@example.com", "Anna_Bianchi", "dev-team")
+QUERIES = ("", "g", "gi", "git", "github", "gthb", "hub", "mail", ".com", "rossi", "anna",
+           "posta cert", "example", "bank-on", "zzz", "admin@", "ops", "a", "crosoft")
+
+
+def make_entries(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{
+        "id": f"id{number}",
+        "site": f"{rng.choice(SITES)}{rng.choice(('', str(number)))}",
+        "username": f"{rng.choice(USERS)}{number % 13}",
+        "updated_at": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+    } for number in range(size)]
+
+
+def ids(entries):
+    return [entry["id"] for entry in entries]
+
+
+def linear_search(entries, query):
+    """Risultato atteso: sottostringa su sito o username, senza indice"""
+    query = query.lower().strip()
+    return [entry["id"] for entry in entries
+            if query in entry["site"].lower() or query in entry["username"].lower()]
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = make_entries(400)
+        self.index = SearchIndex()
+        self.index.rebuild(self.entries)
+
+    def _building_index(self):
+        """Indice in costruzione: il lock tenuto dal test impedisce al thread di attivarlo"""
+        index = SearchIndex()
+        index._lock.acquire()
+        self.addCleanup(index._lock.release)
+        index.rebuild_async(self.entries)
+        self.assertFalse(index.ready)
+        return index
+
+    def test_indexed_search_matches_linear_search(self):
+        for query in QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(ids(self.index.search(query)), linear_search(self.entries, query))
+
+    def test_search_while_building_matches_indexed_search(self):
+        building = self._building_index()
+        for query in QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(ids(building.search(query)), ids(self.index.search(query)))
+                self.assertEqual(building.field_docs("site", query), self.index.field_docs("site", query))
+
+    def test_ranked_search_while_building_keeps_indexed_order(self):
+        building = self._building_index()
+        for query in QUERIES:
+            if len(query) < 3:
+                # Le query corte con indice sono ordinate per fasce di prefisso
+                continue
+            with self.subTest(query=query):
+                linear = ids(building.search_ranked(query))
+                indexed = ids(self.index.search_ranked(query))
+                # L'indice aggiunge solo gli errori di battitura, in coda per punteggio
+                self.assertEqual([entry_id for entry_id in indexed if entry_id in set(linear)], linear)
+
+    def test_changes_during_build_are_applied_on_swap(self):
+        index = SearchIndex()
+        with index._lock:
+            index.rebuild_async(self.entries)
+            index.add({"id": "new", "site": "github.com", "username": "nuovo", "updated_at": "2025-01-01"})
+            index.update(dict(self.entries[0], site="renamed.example"))
+            index.remove(self.entries[1]["id"])
+        deadline = time.monotonic() + 5
+        while not index.ready and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(index.ready)
+
+        expected = SearchIndex()
+        expected.rebuild(index.search(""))
+        for query in QUERIES + ("renamed", "nuovo"):
+            with self.subTest(query=query):
+                self.assertEqual(ids(index.search(query)), ids(expected.search(query)))
+                self.assertEqual(ids(index.search_ranked(query, limit=20)),
+                                 ids(expected.search_ranked(query, limit=20)))
+
+    def test_incremental_updates(self):
+        self.index.remove("id0")
+        self.index.update(dict(self.entries[2], site="zzz-renamed"))
+        self.assertNotIn("id0", ids(self.index.search("")))
+        self.assertEqual(ids(self.index.search("zzz-ren")), ["id2"])
+
+    def test_updated_docs_range(self):
+        docs = self.index.updated_docs("2024-06-01", "2024-07-01")
+        expected = {doc for doc, entry in enumerate(self.entries)
+                    if "2024-06-01" <= entry["updated_at"] < "2024-07-01"}
+        self.assertEqual(docs, expected)
+
+
+class NarrowingSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = make_entries(400)
+        self.index = SearchIndex()
+        self.index.rebuild(self.entries)
+
+    def test_extended_query_filters_previous_result(self):
+        self.index.search_ranked("git")
+        with mock.patch.object(self.index, "_candidates", wraps=self.index._candidates) as candidates:
+            narrowed = ids(self.index.search_ranked("gith"))
+        candidates.assert_not_called()
+
+        fresh = SearchIndex()
+        fresh.rebuild(self.entries)
+        self.assertEqual(narrowed, ids(fresh.search_ranked("gith")))
+
+    def test_backspace_reuses_cached_ranking(self):
+        first = ids(self.index.search_ranked("gitl", limit=10))
+        self.index.search_ranked("gitla", limit=10)
+        with mock.patch.object(self.index, "_rank_matches") as rank_matches:
+            self.assertEqual(ids(self.index.search_ranked("gitl", limit=10)), first)
+        rank_matches.assert_not_called()
+
+    def test_changes_invalidate_cache(self):
+        self.index.search_ranked("gith")
+        self.index.add({"id": "new", "site": "github.io", "username": "nuovo", "updated_at": ""})
+        self.assertIn("new", ids(self.index.search_ranked("githu")))
+        self.index.remove("new")
+        self.assertNotIn("new", ids(self.index.search_ranked("gith")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Verifica di SortIndex e SortedViews: le viste incrementali restano uguali a un ordinamento completo
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import random
+import unittest
+
+from core.sort_index import DESCENDING_ORDERS, SORT_KEYS, SortedViews, SortIndex
+from tests.test_search_index import ids, make_entries
+
+
+def full_sort(entries, order):
+    return sorted(entries, key=SORT_KEYS[order], reverse=order in DESCENDING_ORDERS)
+
+
+class SortIndexTest(unittest.TestCase):
+
+    def test_incremental_changes_match_full_sort(self):
+        rng = random.Random(11)
+        entries = make_entries(200)
+        for order in SORT_KEYS:
+            with self.subTest(order=order):
+                current = {entry["id"]: entry for entry in entries[:150]}
+                index = SortIndex(SORT_KEYS[order], descending=order in DESCENDING_ORDERS)
+                index.rebuild(list(current.values()))
+
+                for entry in entries[150:]:
+                    position = index.add(entry)
+                    current[entry["id"]] = entry
+                    self.assertEqual(index.items()[position], entry)
+                for entry_id in rng.sample(sorted(current), 30):
+                    position = index.position(entry_id)
+                    self.assertEqual(index.remove(entry_id), position)
+                    del current[entry_id]
+                for entry_id in rng.sample(sorted(current), 30):
+                    changed = dict(current[entry_id], site=f"z{rng.random()}", updated_at="2030-01-01")
+                    current[entry_id] = changed
+                    position = index.update(changed)
+                    self.assertEqual(index.items()[position], changed)
+
+                expected = full_sort(current.values(), order)
+                self.assertEqual(ids(index.items()), ids(expected))
+                for position, entry in enumerate(expected):
+                    self.assertEqual(index.position(entry["id"]), position)
+
+    def test_unknown_id(self):
+        index = SortIndex(SORT_KEYS["site"])
+        self.assertIsNone(index.remove("missing"))
+        self.assertIsNone(index.position("missing"))
+
+
+class SortedViewsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = make_entries(100)
+        self.views = SortedViews(lambda: self.entries)
+
+    def test_views_follow_changes(self):
+        self.assertEqual(ids(self.views.items("site")), ids(full_sort(self.entries, "site")))
+        added = dict(self.entries[0], id="new", site="aaa.example")
+        self.entries.append(added)
+        self.views.add(added)
+        self.assertEqual(self.views.position("site", "new"), 0)
+        self.entries.remove(added)
+        self.views.remove("new")
+        self.assertEqual(ids(self.views.items("site")), ids(full_sort(self.entries, "site")))
+
+    def test_insertion_order_is_source_order(self):
+        self.assertEqual(ids(self.views.items("insertion")), ids(self.entries))
+        self.assertIsNone(self.views.position("insertion", "id0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
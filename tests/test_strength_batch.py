@@ -0,0 +1,48 @@
+"""
+Verifica di analyze_many: l'analisi in blocco coincide con analyze_password
+
+Esecuzione: python -m pytest tests  (oppure python -m unittest discover tests)
+"""
+import unittest
+from unittest import mock
+
+from core import strength_batch
+from core.password_strength import PasswordValidator
+from tests.test_password_strength import SAMPLES, random_passwords
+
+
+def as_tuple(analysis):
+    return (analysis.strength, analysis.score, analysis.suggestions, analysis.criteria_met, analysis.color)
+
+
+class AnalyzeManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = PasswordValidator()
+        self.passwords = SAMPLES + random_passwords(2000, seed=9) + ["password", "Qwerty", "MiaPassword!2024"]
+        self.expected = [as_tuple(self.validator.analyze_password(password)) for password in self.passwords]
+
+    def assert_same_analyses(self, analyses):
+        self.assertEqual(len(analyses), len(self.passwords))
+        for password, analysis, expected in zip(self.passwords, analyses, self.expected):
+            self.assertEqual(as_tuple(analysis), expected, password)
+
+    @unittest.skipIf(strength_batch._load_numpy() is None, "NumPy richiesto per l'analisi vettoriale")
+    def test_vectorized_matches_scalar(self):
+        self.assert_same_analyses(strength_batch.analyze_many(self.validator, self.passwords))
+
+    @unittest.skipIf(strength_batch._load_numpy() is None, "NumPy richiesto per l'analisi vettoriale")
+    def test_vectorized_over_several_chunks(self):
+        with mock.patch.object(strength_batch, "CHUNK_SIZE", 64):
+            self.assert_same_analyses(strength_batch.analyze_many(self.validator, self.passwords))
+
+    def test_scalar_fallback_matches(self):
+        with mock.patch.object(strength_batch, "_load_numpy", return_value=None):
+            self.assert_same_analyses(strength_batch.analyze_many(self.validator, self.passwords, workers=1))
+
+    def test_empty_input(self):
+        self.assertEqual(self.validator.analyze_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
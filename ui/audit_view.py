@@ -0,0 +1,218 @@
+import threading
+from typing import Callable, Dict, Optional
+from core.fonts import font_registry
+from core.components import ThemedFrame, ThemedLabel, ThemedButton, show_message
+from core.audit import ISSUES, AuditReport, VaultAuditor, report_to_rows
+from core.database import PasswordDatabase
+from core.config import config_manager
+from ui.password_list import CompactPasswordTable
+
+# Intervallo di controllo dell'audit in corso
+AUDIT_POLL_MS = 100
+
+
+class AuditTable(CompactPasswordTable):
+    """Tabella del report di audit: clic sull'intestazione per ordinare, di nuovo per invertire"""
+
+    COLUMNS = ("site", "username", "strength", "reuse", "age", "issues")
+    HEADINGS = {
+        "site": "Sito",
+        "username": "Username",
+        "strength": "Forza",
+        "reuse": "Riutilizzi",
+        "age": "Età",
+        "issues": "Problemi",
+    }
+    COLUMN_WIDTHS = {"site": 170, "username": 150, "strength": 95, "reuse": 80, "age": 70, "issues": 220}
+    STYLE = "Audit.Treeview"
+
+    def __init__(self, master, on_select: Callable, on_sort: Optional[Callable[[str], None]] = None,
+                 sort_order: Optional[str] = None, **kwargs):
+        self.descending = False
+        super().__init__(master, on_select, on_sort, sort_order, **kwargs)
+
+    def set_sort(self, column: str, descending: bool):
+        self.descending = descending
+        self.set_sort_order(column)
+
+    def _row_values(self, item: Dict):
+        strength = item.get("strength")
+        age_days = item.get("age_days")
+        return (
+            item["site"],
+            item["username"],
+            config_manager.messages.strength_name(strength) if strength is not None else "-",
+            item.get("reuse_count") or "-",
+            f"{age_days} g" if age_days is not None else "-",
+            ", ".join(ISSUES[issue] for issue in item.get("issues", [])) or "✓",
+        )
+
+    def _update_headings(self):
+        for column in self.COLUMNS:
+            text = self.HEADINGS[column]
+            if column == self.sort_order:
+                text += " ▼" if self.descending else " ▲"
+            self.tree.heading(column, text=text)
+
+
+class AuditView(ThemedFrame):
+    """Vista del report di audit del vault"""
+
+    def __init__(self, master, database: PasswordDatabase, on_close: Callable):
+        super().__init__(master, style="background")
+
+        self.database = database
+        self.on_close = on_close
+        self.auditor = VaultAuditor(database)
+        self.report: Optional[AuditReport] = None
+        self.sort_column = "issues"
+        self.descending = False
+        self._audit_thread: Optional[threading.Thread] = None
+        self._audit_cancelled = False
+
+        self._create_ui()
+        self._start_audit()
+
+    def _create_ui(self):
+        # Header con titolo e pulsanti - usa configurazione
+        header_frame = ThemedFrame(self, style="surface")
+        header_frame.pack(fill="x", padx=20, pady=(20, 0))
+
+        title_label = ThemedLabel(header_frame, text=config_manager.get('audit.title', '🛡️ Audit del Vault'),
+                                  style="primary")
+        title_label.configure(font=font_registry.sized(24, "bold"))
+        title_label.pack(side="left", pady=15)
+
+        close_button = ThemedButton(
+            header_frame,
+            text=config_manager.get('audit.close_button', '✕ Chiudi'),
+            command=self.on_close,
+            style="secondary",
+            width=100,
+            height=35
+        )
+        close_button.pack(side="right", pady=15, padx=15)
+
+        self.run_button = ThemedButton(
+            header_frame,
+            text=config_manager.get('audit.run_button', '🔍 Esegui Audit'),
+            command=self._start_audit,
+            style="primary",
+            width=140,
+            height=35
+        )
+        self.run_button.pack(side="right", pady=15)
+
+        # Riepilogo: numero di voci per problema e stato dell'audit
+        info_frame = ThemedFrame(self, style="background")
+        info_frame.pack(fill="x", padx=20, pady=(10, 10))
+
+        self.summary_label = ThemedLabel(info_frame, text="", style="primary")
+        self.summary_label.configure(font=font_registry.get("header"))
+        self.summary_label.pack(anchor="w")
+
+        self.status_label = ThemedLabel(info_frame, text="", style="secondary")
+        self.status_label.configure(font=font_registry.get("small"))
+        self.status_label.pack(anchor="w")
+
+        self.table = AuditTable(self, on_select=self._on_select, on_sort=self._on_sort,
+                                sort_order=self.sort_column)
+        self.table.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+
+        self.detail_label = ThemedLabel(self, text="", style="secondary")
+        self.detail_label.configure(font=font_registry.get("body"), anchor="w", justify="left")
+        self.detail_label.pack(fill="x", padx=20, pady=(0, 20))
+
+    def _start_audit(self):
+        """Avvia l'audit su un thread separato (le voci non cambiate vengono riusate)"""
+        if self._audit_thread is not None and self._audit_thread.is_alive():
+            return
+
+        user = self.database.current_user
+        outcome: Dict = {"progress": (0, 0)}
+        self._audit_cancelled = False
+
+        def is_cancelled() -> bool:
+            # Interrompe l'audit se la vista viene chiusa o l'utente esce
+            return self._audit_cancelled or self.database.current_user != user
+
+        def on_progress(done: int, total: int):
+            outcome["progress"] = (done, total)
+
+        def worker():
+            try:
+                outcome["result"] = self.auditor.run(is_cancelled=is_cancelled, on_progress=on_progress)
+            except Exception as e:
+                outcome["error"] = str(e)
+
+        self._audit_thread = threading.Thread(target=worker, daemon=True)
+        self._audit_thread.start()
+        self.run_button.configure(state="disabled")
+        self.status_label.configure(text="Audit in corso...")
+        self.after(AUDIT_POLL_MS, lambda: self._poll_audit(self._audit_thread, outcome))
+
+    def _poll_audit(self, thread: threading.Thread, outcome: Dict):
+        """Controlla periodicamente lo stato dell'audit in corso"""
+        if not self.winfo_exists():
+            return
+
+        if thread.is_alive():
+            done, total = outcome["progress"]
+            if total:
+                self.status_label.configure(text=f"Audit in corso... {done}/{total} password analizzate")
+            self.after(AUDIT_POLL_MS, lambda: self._poll_audit(thread, outcome))
+            return
+
+        self.run_button.configure(state="normal")
+        if "error" in outcome:
+            self.status_label.configure(text="")
+            show_message(self, "Audit", f"Errore durante l'audit: {outcome['error']}", "error")
+            return
+
+        report = outcome.get("result")
+        if report is None:
+            self.status_label.configure(text="Audit interrotto")
+            return
+        self._show_report(report)
+
+    def _show_report(self, report: AuditReport):
+        self.report = report
+        counts = report.counts()
+        summary = " | ".join(f"{ISSUES[issue]}: {count}" for issue, count in counts.items()
+                             if count or issue != "unreadable")
+        self.summary_label.configure(text=summary)
+        self.status_label.configure(
+            text=f"{len(report.entries)} password, {report.analyzed} analizzate e {report.cached} "
+                 f"invariate dall'audit precedente ({report.elapsed_ms:.0f} ms)"
+        )
+        self.detail_label.configure(text="")
+        self._refresh_table()
+
+    def _refresh_table(self, keep_scroll: bool = False):
+        if self.report is None:
+            return
+        self.table.set_sort(self.sort_column, self.descending)
+        self.table.set_items(report_to_rows(self.report, self.sort_column, self.descending),
+                             empty_text="Nessuna password nel vault", keep_scroll=keep_scroll)
+
+    def _on_sort(self, column: str):
+        # Secondo clic sulla stessa colonna: ordine inverso
+        self.descending = not self.descending if column == self.sort_column else False
+        self.sort_column = column
+        self._refresh_table()
+
+    def _on_select(self, item: Dict):
+        issues = [ISSUES[issue] for issue in item.get("issues", [])]
+        details = f"{item['site']} — {item['username']}: " + (", ".join(issues) if issues else "nessun problema")
+        if item.get("reuse_count"):
+            details += f"\nStessa password usata in altre {item['reuse_count']} voci"
+        self.detail_label.configure(text=details)
+
+    def on_show(self):
+        """Chiamato quando la vista torna visibile dalla cache dell'app"""
+        # Le password possono essere cambiate: l'audit rianalizza solo quelle modificate
+        self._start_audit()
+
+    def destroy(self):
+        self._audit_cancelled = True
+        super().destroy()
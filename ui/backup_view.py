@@ -1,8 +1,10 @@
 import customtkinter as ctk
+import threading
 from tkinter import filedialog
 from typing import Callable, List, Dict
 from pathlib import Path
-from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message
+from core.fonts import font_registry
+from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message, show_toast
 from core.backup import BackupManager
 from core.database import PasswordDatabase
 from core.config import config_manager
@@ -20,6 +22,10 @@ class BackupView(ThemedFrame):
         
         self._create_ui()
         self._refresh_backup_list()
+        
+        # Riprendi in background eventuali upload interrotti verso i target
+        if self.backup_manager.targets:
+            self._run_replication(self.backup_manager.resume_pending_uploads)
     
     def _create_ui(self):
         # Header con titolo e pulsante chiudi - usa configurazione
@@ -30,7 +36,7 @@ class BackupView(ThemedFrame):
         close_button_text = config_manager.get('backup.close_button', '✕ Chiudi')
         
         title_label = ThemedLabel(header_frame, text=title_text, style="primary")
-        title_label.configure(font=ctk.CTkFont(size=24, weight="bold"))
+        title_label.configure(font=font_registry.sized(24, "bold"))
         title_label.pack(side="left", pady=15)
         
         close_button = ThemedButton(
@@ -53,9 +59,9 @@ class BackupView(ThemedFrame):
             count=len(self.database.get_passwords())
         )
         
-        user_info = ThemedLabel(info_frame, text=user_info_text, style="secondary")
-        user_info.configure(font=ctk.CTkFont(size=12))
-        user_info.pack(anchor="w")
+        self.user_info_label = ThemedLabel(info_frame, text=user_info_text, style="secondary")
+        self.user_info_label.configure(font=font_registry.get("body"))
+        self.user_info_label.pack(anchor="w")
         
         # Frame principale con scrolling per contenuto lungo
         main_scroll = ctk.CTkScrollableFrame(self, corner_radius=0)
@@ -92,7 +98,7 @@ class BackupView(ThemedFrame):
         header.pack(fill="x", padx=20, pady=(15, 10))
         
         title = ThemedLabel(header, text="📤 Esporta Password", style="primary")
-        title.configure(font=ctk.CTkFont(size=18, weight="bold"))
+        title.configure(font=font_registry.get("header"))
         title.pack(side="left")
         
         # Stato export
@@ -100,9 +106,9 @@ class BackupView(ThemedFrame):
         status_text = f"{len(passwords)} password pronte per l'export" if passwords else "Nessuna password da esportare"
         status_color = "primary" if passwords else "secondary"
         
-        status = ThemedLabel(header, text=status_text, style=status_color)
-        status.configure(font=ctk.CTkFont(size=11))
-        status.pack(side="right")
+        self.export_status_label = ThemedLabel(header, text=status_text, style=status_color)
+        self.export_status_label.configure(font=font_registry.get("small"))
+        self.export_status_label.pack(side="right")
         
         # Contenuto sezione
         content = ThemedFrame(section_frame, style="surface")
@@ -114,7 +120,7 @@ class BackupView(ThemedFrame):
             text="💡 Crea un backup crittografato di tutte le tue password.\nIl file sarà protetto dalla tua password master e potrà essere importato in futuro.",
             style="secondary"
         )
-        desc.configure(font=ctk.CTkFont(size=12), justify="left")
+        desc.configure(font=font_registry.get("body"), justify="left")
         desc.pack(anchor="w", pady=(0, 15))
         
         # Pulsante export
@@ -141,7 +147,7 @@ class BackupView(ThemedFrame):
         header.pack(fill="x", padx=20, pady=(15, 10))
         
         title = ThemedLabel(header, text="📥 Importa Password", style="primary")
-        title.configure(font=ctk.CTkFont(size=18, weight="bold"))
+        title.configure(font=font_registry.get("header"))
         title.pack(side="left")
         
         # Contenuto sezione
@@ -154,7 +160,7 @@ class BackupView(ThemedFrame):
             text="📂 Ripristina le password da un backup precedente.\nLe password già esistenti verranno saltate automaticamente.",
             style="secondary"
         )
-        desc.configure(font=ctk.CTkFont(size=12), justify="left")
+        desc.configure(font=font_registry.get("body"), justify="left")
         desc.pack(anchor="w", pady=(0, 15))
         
         # Selezione file
@@ -162,7 +168,7 @@ class BackupView(ThemedFrame):
         file_section.pack(fill="x", pady=(0, 15))
         
         file_label = ThemedLabel(file_section, text="📁 Seleziona file di backup:", style="primary")
-        file_label.configure(font=ctk.CTkFont(size=12, weight="bold"))
+        file_label.configure(font=font_registry.get("bold"))
         file_label.pack(anchor="w", pady=(0, 8))
         
         file_input_frame = ThemedFrame(file_section, style="surface")
@@ -190,7 +196,7 @@ class BackupView(ThemedFrame):
         password_section.pack(fill="x", pady=(0, 15))
         
         pass_label = ThemedLabel(password_section, text="🔑 Password master del backup:", style="primary")
-        pass_label.configure(font=ctk.CTkFont(size=12, weight="bold"))
+        pass_label.configure(font=font_registry.get("bold"))
         pass_label.pack(anchor="w", pady=(0, 8))
         
         password_input_frame = ThemedFrame(password_section, style="surface")
@@ -236,7 +242,7 @@ class BackupView(ThemedFrame):
         header.pack(fill="x", padx=20, pady=(15, 10))
         
         title = ThemedLabel(header, text="📋 Backup Disponibili", style="primary")
-        title.configure(font=ctk.CTkFont(size=18, weight="bold"))
+        title.configure(font=font_registry.get("header"))
         title.pack(side="left")
         
         # Pulsante refresh
@@ -268,13 +274,13 @@ class BackupView(ThemedFrame):
             passwords = self.database.get_passwords()
             
             if not passwords:
-                show_message(self, "Attenzione", "Nessuna password da esportare", "warning")
+                show_toast(self, "Nessuna password da esportare", "warning")
                 return
             
             # Ottieni tutte le password decriptate
             decrypted_passwords = []
             for pwd in passwords:
-                decrypted, _ = self.database.get_decrypted_password(pwd["site"], pwd["username"])
+                decrypted, _ = self.database.get_decrypted_password(pwd["site"], pwd["username"], track_access=False)
                 if decrypted:
                     pwd_copy = pwd.copy()
                     pwd_copy["password"] = decrypted
@@ -312,7 +318,7 @@ class BackupView(ThemedFrame):
         
         # Titolo
         title = ThemedLabel(frame, text="🔒 Conferma Password Master", style="primary")
-        title.configure(font=ctk.CTkFont(size=14, weight="bold"))
+        title.configure(font=font_registry.sized(14, "bold"))
         title.pack(pady=(0, 15))
         
         # Descrizione migliorata
@@ -322,7 +328,7 @@ per importare le password in futuro."""
         
         desc = ThemedLabel(frame, text=desc_text, style="secondary")
         desc.configure(
-            font=ctk.CTkFont(size=12),
+            font=font_registry.get("body"),
             justify="center",
             wraplength=380
         )
@@ -358,6 +364,10 @@ la password master utilizzata per proteggerlo."""
                 
                 show_message(self, "✅ Backup Creato", success_message, "success")
                 self._refresh_backup_list()
+                
+                # Replica il nuovo backup sui target configurati senza bloccare la UI
+                if self.backup_manager.targets:
+                    self._run_replication(lambda: self.backup_manager.replicate_backup(result))
             else:
                 show_message(self, "Errore", f"Errore durante la creazione del backup:\n\n{result}", "error")
         
@@ -388,6 +398,38 @@ la password master utilizzata per proteggerlo."""
         # Bind Enter key
         password_entry.bind("<Return>", lambda e: confirm_export())
     
+    def _run_replication(self, job: Callable):
+        """Esegue una replica su un thread separato e aggiorna la lista al termine"""
+        outcome = {}
+        
+        def worker():
+            try:
+                outcome["result"] = job()
+            except Exception as e:
+                outcome["result"] = (False, str(e))
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        self._refresh_backup_list()
+        self.after(500, lambda: self._poll_replication(thread, outcome))
+    
+    def _poll_replication(self, thread: threading.Thread, outcome: Dict):
+        """Controlla periodicamente lo stato della replica in corso"""
+        if not self.winfo_exists():
+            return
+        
+        if thread.is_alive():
+            # Aggiorna l'avanzamento mostrato nella lista
+            self._refresh_backup_list()
+            self.after(1000, lambda: self._poll_replication(thread, outcome))
+            return
+        
+        self._refresh_backup_list()
+        
+        result = outcome.get("result")
+        if isinstance(result, tuple) and not result[0]:
+            show_message(self, "Replica Backup", result[1], "warning")
+    
     def _browse_backup_file(self):
         """Apre un dialog per selezionare un file di backup"""
         file_path = filedialog.askopenfilename(
@@ -412,11 +454,11 @@ la password master utilizzata per proteggerlo."""
         password = self.import_password_entry.get().strip()
         
         if not filepath:
-            show_message(self, "Errore", "Seleziona un file di backup", "error")
+            show_toast(self, config_manager.get('messages.errors.file_selection_required', "Seleziona un file di backup"), "error")
             return
         
         if not password:
-            show_message(self, "Errore", "Inserisci la password master", "error")
+            show_toast(self, config_manager.get('messages.errors.password_required', "Inserisci la password master"), "error")
             return
         
         success, message, data = self.backup_manager.import_passwords(filepath, password)
@@ -450,7 +492,7 @@ la password master utilizzata per proteggerlo."""
         
         # Titolo
         title_label = ThemedLabel(frame, text="📥 Conferma Import", style="primary")
-        title_label.configure(font=ctk.CTkFont(size=16, weight="bold"))
+        title_label.configure(font=font_registry.sized(16, "bold"))
         title_label.pack(pady=(0, 15))
         
         # Informazioni backup migliorata
@@ -469,7 +511,7 @@ Vuoi procedere con l'importazione?"""
         
         info_label = ThemedLabel(frame, text=info_text, style="secondary")
         info_label.configure(
-            font=ctk.CTkFont(size=12),
+            font=font_registry.get("body"),
             justify="left",
             wraplength=440
         )
@@ -511,7 +553,8 @@ Vuoi procedere con l'importazione?"""
         try:
             for pwd_data in backup_data['passwords']:
                 # Controlla se la password esiste già
-                existing = self.database.get_decrypted_password(pwd_data['site'], pwd_data['username'])
+                existing = self.database.get_decrypted_password(pwd_data['site'], pwd_data['username'],
+                                                               track_access=False)
                 
                 if existing[0]:  # Se esiste già
                     skipped_count += 1
@@ -560,6 +603,22 @@ ora disponibili nella lista delle password."""
 Verifica che il file di backup sia valido e riprova."""
             show_message(self, "Errore Import", error_msg, "error")
     
+    def on_show(self):
+        """Chiamato quando la vista torna visibile dalla cache dell'app"""
+        # Le password possono essere cambiate dalla dashboard nel frattempo
+        count = len(self.database.get_passwords())
+        self.user_info_label.configure(text=config_manager.format_message(
+            'backup.user_info_template',
+            username=self.username,
+            count=count
+        ))
+        self.export_status_label.configure(
+            text=f"{count} password pronte per l'export" if count else "Nessuna password da esportare"
+        )
+        self.export_status_label.style = "primary" if count else "secondary"
+        self.export_status_label._apply_theme()
+        self._refresh_backup_list()
+    
     def _refresh_backup_list(self):
         """Aggiorna la lista dei backup esistenti"""
         try:
@@ -577,7 +636,7 @@ Verifica che il file di backup sia valido e riprova."""
                 empty_frame.pack(fill="x", pady=20, padx=10)
                 
                 empty_icon = ThemedLabel(empty_frame, text="📂", style="secondary")
-                empty_icon.configure(font=ctk.CTkFont(size=24))
+                empty_icon.configure(font=font_registry.sized(24))
                 empty_icon.pack(pady=(10, 5))
                 
                 empty_label = ThemedLabel(
@@ -585,7 +644,7 @@ Verifica che il file di backup sia valido e riprova."""
                     text="Nessun backup trovato\nCrea il tuo primo backup utilizzando il pulsante sopra",
                     style="secondary"
                 )
-                empty_label.configure(font=ctk.CTkFont(size=12), justify="center")
+                empty_label.configure(font=font_registry.get("body"), justify="center")
                 empty_label.pack(pady=(0, 10))
                 return
             
@@ -611,22 +670,39 @@ Verifica che il file di backup sia valido e riprova."""
         
         # Nome file
         filename_label = ThemedLabel(info_frame, text=f"📁 {backup['filename']}", style="primary")
-        filename_label.configure(font=ctk.CTkFont(size=13, weight="bold"))
+        filename_label.configure(font=font_registry.sized(13, "bold"))
         filename_label.pack(anchor="w")
         
         # Dettagli
         details_text = f"👤 {backup['metadata']['username']} | 🗓️ {backup['metadata']['export_date_formatted']}"
         details_label = ThemedLabel(info_frame, text=details_text, style="secondary")
-        details_label.configure(font=ctk.CTkFont(size=11))
+        details_label.configure(font=font_registry.get("small"))
         details_label.pack(anchor="w", pady=(2, 0))
         
         # Dimensione file
         size_mb = backup['size'] / (1024 * 1024)
         size_text = f"💾 {size_mb:.2f} MB"
         size_label = ThemedLabel(info_frame, text=size_text, style="secondary")
-        size_label.configure(font=ctk.CTkFont(size=10))
+        size_label.configure(font=font_registry.sized(10))
         size_label.pack(anchor="w", pady=(2, 0))
         
+        # Stato della replica sui target configurati
+        uploads = backup.get('uploads') or {}
+        if uploads:
+            status_icons = {"complete": "✅", "uploading": "⏳", "pending": "🕓", "failed": "❌"}
+            upload_parts = []
+            for target_name, state in uploads.items():
+                icon = status_icons.get(state.get("status"), "❔")
+                text = f"{icon} {target_name}"
+                if state.get("status") in ("uploading", "failed"):
+                    total_chunks = max(1, -(-state.get("size", 0) // max(1, state.get("chunk_size", 1))))
+                    text += f" {len(state.get('parts', {}))}/{total_chunks}"
+                upload_parts.append(text)
+            
+            uploads_label = ThemedLabel(info_frame, text="☁️ " + " | ".join(upload_parts), style="secondary")
+            uploads_label.configure(font=font_registry.sized(10))
+            uploads_label.pack(anchor="w", pady=(2, 0))
+        
         # Pulsanti (destra)
         buttons_frame = ThemedFrame(content_frame, style="surface")
         buttons_frame.pack(side="right", padx=(10, 0))
@@ -676,7 +752,7 @@ Verifica che il file di backup sia valido e riprova."""
         
         # Icona di avvertimento
         warning_label = ThemedLabel(frame, text="⚠️", style="primary")
-        warning_label.configure(font=ctk.CTkFont(size=32))
+        warning_label.configure(font=font_registry.sized(32))
         warning_label.pack(pady=(0, 10))
         
         # Messaggio migliorato
@@ -688,7 +764,7 @@ Verifica che il file di backup sia valido e riprova."""
         
         label = ThemedLabel(frame, text=message_text, style="primary")
         label.configure(
-            font=ctk.CTkFont(size=12),
+            font=font_registry.get("body"),
             justify="center",
             wraplength=350
         )
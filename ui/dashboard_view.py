@@ -1,21 +1,36 @@
 import customtkinter as ctk
 import secrets
 import string
+import threading
 from typing import Callable, Optional, Dict, Any
-from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message
-from core.database import PasswordDatabase
+from core.fonts import font_registry
+from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message, show_toast
+from core.database import ChangeEvent, ChangeKind, PasswordDatabase
 from core.password_strength import PasswordValidator, SecurePasswordGenerator
 from core.config import config_manager
+from core.query import parse_query
+from core.search import SearchPipeline
+from core.sort_index import DEFAULT_SORT_ORDER, SORT_ORDERS
+from ui.password_list import CompactPasswordTable, PasswordListItem, VirtualPasswordList
 
 class PasswordStrengthIndicator(ThemedFrame):
     """
     Indicatore visivo della forza della password con barra di progresso colorata
     Analizza in tempo reale la sicurezza della password inserita
+    
+    Durante la digitazione l'analisi parte solo dopo una breve pausa
+    (DEBOUNCE_MS) e i widget vengono riconfigurati solo se il valore
+    mostrato cambia.
     """
     
+    DEBOUNCE_MS = 120
+    
     def __init__(self, master):
         super().__init__(master, style="surface")
         self.validator = PasswordValidator()
+        self._pending_password: Optional[str] = None
+        self._update_job = None
+        self._shown: Dict[str, Any] = {}   # valori attualmente mostrati, per widget
         self._create_ui()
     
     def _create_ui(self):
@@ -24,7 +39,7 @@ class PasswordStrengthIndicator(ThemedFrame):
         strength_label_text = config_manager.get('password_editor.strength_label', 'Forza Password:')
         
         self.strength_label = ThemedLabel(self, text=strength_label_text, style="primary")
-        self.strength_label.configure(font=ctk.CTkFont(size=12, weight="bold"))
+        self.strength_label.configure(font=font_registry.get("bold"))
         self.strength_label.pack(anchor="w", pady=(0, 5))
         
         # Container per barra di progresso e percentuale
@@ -38,87 +53,75 @@ class PasswordStrengthIndicator(ThemedFrame):
         
         # Label che mostra la percentuale numerica
         self.score_label = ThemedLabel(progress_frame, text="0%", style="secondary")
-        self.score_label.configure(font=ctk.CTkFont(size=11))
+        self.score_label.configure(font=font_registry.get("small"))
         self.score_label.pack(side="right", padx=(10, 0))
         
         # Label descrizione forza
         self.description_label = ThemedLabel(self, text="Nessuna password", style="secondary")
-        self.description_label.configure(font=ctk.CTkFont(size=11))
+        self.description_label.configure(font=font_registry.get("small"))
         self.description_label.pack(anchor="w", pady=(0, 10))
     
-    def update_strength(self, password: str):
-        """Aggiorna l'indicatore con una nuova password"""
+    def update_strength(self, password: str, immediate: bool = False):
+        """
+        Aggiorna l'indicatore con una nuova password
+        
+        Args:
+            password: Password da analizzare
+            immediate: Aggiorna subito invece di attendere la fine della digitazione
+        """
+        self._pending_password = password
+        if self._update_job is not None:
+            self.after_cancel(self._update_job)
+            self._update_job = None
+        
+        if immediate:
+            self._apply_pending()
+        else:
+            self._update_job = self.after(self.DEBOUNCE_MS, self._apply_pending)
+    
+    def _apply_pending(self):
+        """Analizza l'ultima password ricevuta e aggiorna i widget cambiati"""
+        self._update_job = None
+        password, self._pending_password = self._pending_password, None
+        if password is None:
+            return
+        
         analysis = self.validator.analyze_password(password)
         
         # Aggiorna barra di progresso
-        progress = analysis.score / 100
-        self.progress_bar.set(progress)
-        self.progress_bar.configure(progress_color=analysis.color)
+        if self._changed("progress", (analysis.score, analysis.color)):
+            self.progress_bar.set(analysis.score / 100)
+            self.progress_bar.configure(progress_color=analysis.color)
         
         # Aggiorna percentuale
-        self.score_label.configure(text=f"{analysis.score}%")
-        
-        # Aggiorna descrizione - usa configurazione
-        strength_names = {
-            0: config_manager.get('password_generator.strength_levels.0', 'Molto Debole'),
-            1: config_manager.get('password_generator.strength_levels.1', 'Debole'),
-            2: config_manager.get('password_generator.strength_levels.2', 'Discreta'),
-            3: config_manager.get('password_generator.strength_levels.3', 'Buona'),
-            4: config_manager.get('password_generator.strength_levels.4', 'Forte'),
-            5: config_manager.get('password_generator.strength_levels.5', 'Molto Forte')
-        }
-        
-        description = strength_names.get(analysis.strength.value, "Sconosciuta")
-        self.description_label.configure(text=f"Forza: {description}")
-
-class PasswordListItem(ThemedFrame):
-    """Item della lista password"""
-    
-    def __init__(self, master, password_data: Dict, on_select: Callable):
-        super().__init__(master, style="surface")
+        if self._changed("score", analysis.score):
+            self.score_label.configure(text=f"{analysis.score}%")
         
-        self.password_data = password_data
-        self.on_select = on_select
-        
-        self._create_ui()
-        self._setup_bindings()
+        # Aggiorna descrizione - etichette precalcolate nella configurazione compilata
+        description = config_manager.messages.strength_name(analysis.strength.value)
+        if self._changed("description", description):
+            self.description_label.configure(text=f"Forza: {description}")
     
-    def _create_ui(self):
-        self.configure(height=60, corner_radius=8)
-        
-        # Site name
-        site_label = ThemedLabel(self, text=self.password_data["site"], style="primary")
-        site_label.configure(font=ctk.CTkFont(size=14, weight="bold"))
-        site_label.pack(anchor="w", padx=15, pady=(8, 2))
-        
-        # Username
-        username_label = ThemedLabel(self, text=self.password_data["username"], style="secondary")
-        username_label.configure(font=ctk.CTkFont(size=12))
-        username_label.pack(anchor="w", padx=15, pady=(0, 8))
-    
-    def _setup_bindings(self):
-        """Setup dei binding per il click"""
-        self.bind("<Button-1>", lambda e: self.on_select(self.password_data))
-        self.bind("<Enter>", self._on_enter)
-        self.bind("<Leave>", self._on_leave)
-        
-        for child in self.winfo_children():
-            child.bind("<Button-1>", lambda e: self.on_select(self.password_data))
+    def _changed(self, widget: str, value: Any) -> bool:
+        """Registra il valore mostrato da un widget; False se era già quello"""
+        if self._shown.get(widget) == value:
+            return False
+        self._shown[widget] = value
+        return True
     
-    def _on_enter(self, event):
-        from core.theme import theme_manager
-        colors = theme_manager.get_colors()
-        self.configure(fg_color=colors['hover'])
-    
-    def _on_leave(self, event):
-        from core.theme import theme_manager
-        colors = theme_manager.get_colors()
-        self.configure(fg_color=colors['surface'])
+    def destroy(self):
+        if self._update_job is not None:
+            try:
+                self.after_cancel(self._update_job)
+            except Exception:
+                pass
+            self._update_job = None
+        super().destroy()
 
 class PasswordEditor(ThemedFrame):
     """Editor per le password"""
     
-    def __init__(self, master, database: PasswordDatabase, on_save: Callable):
+    def __init__(self, master, database: PasswordDatabase, on_save: Optional[Callable] = None):
         super().__init__(master, style="surface")
         
         self.database = database
@@ -133,7 +136,7 @@ class PasswordEditor(ThemedFrame):
     def _create_ui(self):
         # Titolo
         self.title_label = ThemedLabel(self, text="Nuova Password", style="primary")
-        self.title_label.configure(font=ctk.CTkFont(size=20, weight="bold"))
+        self.title_label.configure(font=font_registry.get("subtitle"))
         self.title_label.pack(pady=(20, 30))
         
         # Form
@@ -305,7 +308,8 @@ class PasswordEditor(ThemedFrame):
     def _on_password_change(self, event=None):
         """Callback per aggiornamento in tempo reale della forza password"""
         password = self.password_entry.get()
-        self.strength_indicator.update_strength(password)
+        # Durante la digitazione (evento da tastiera) l'aggiornamento è differito
+        self.strength_indicator.update_strength(password, immediate=event is None)
     
     def _on_gen_type_change(self, value):
         """Callback per cambio tipo di generazione"""
@@ -332,7 +336,7 @@ class PasswordEditor(ThemedFrame):
         frame.pack(fill="both", expand=True, padx=40, pady=40)
         
         title = ThemedLabel(frame, text="🔒 Come Creare Password Sicure", style="primary")
-        title.configure(font=ctk.CTkFont(size=16, weight="bold"))
+        title.configure(font=font_registry.sized(16, "bold"))
         title.pack(pady=(0, 25))
         
         tips_text = """✅ CARATTERISTICHE ESSENZIALI:
@@ -365,7 +369,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         
         tips_textbox = ctk.CTkTextbox(
             frame,
-            font=ctk.CTkFont(size=11),  # Font più piccolo
+            font=font_registry.get("small"),  # Font più piccolo
             height=400,  # Altezza fissa
             wrap="word"
         )
@@ -415,7 +419,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
             # Aggiorna indicatore forza
             self._on_password_change()
             
-            show_message(self, "Password Generata", f"Password {gen_type.lower()} generata con successo!", "success")
+            show_toast(self, f"Password {gen_type.lower()} generata", "success")
             
         except Exception as e:
             show_message(self, "Errore", f"Errore nella generazione: {str(e)}", "error")
@@ -441,7 +445,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         frame.pack(fill="both", expand=True, padx=30, pady=30)
         
         title = ThemedLabel(frame, text="Personalizza Password", style="primary")
-        title.configure(font=ctk.CTkFont(size=14, weight="bold"))
+        title.configure(font=font_registry.sized(14, "bold"))
         title.pack(pady=(0, 25))
         
         # Lunghezza
@@ -449,7 +453,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         length_frame.pack(fill="x", pady=10)
         
         length_label = ThemedLabel(length_frame, text="Lunghezza:", style="primary")
-        length_label.configure(font=ctk.CTkFont(size=11))
+        length_label.configure(font=font_registry.get("small"))
         length_label.pack(side="left")
         
         length_var = ctk.IntVar(value=16)
@@ -457,7 +461,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         length_slider.pack(side="right", fill="x", expand=True, padx=(15, 0))
         
         length_value_label = ThemedLabel(length_frame, text="16", style="secondary")
-        length_value_label.configure(font=ctk.CTkFont(size=11))
+        length_value_label.configure(font=font_registry.get("small"))
         length_value_label.pack(side="right", padx=(10, 0))
         
         def update_length_label(value):
@@ -474,10 +478,10 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         numbers_var = ctk.BooleanVar(value=True)
         symbols_var = ctk.BooleanVar(value=True)
         
-        ctk.CTkCheckBox(options_frame, text="Maiuscole (A-Z)", variable=uppercase_var, height=20, font=ctk.CTkFont(size=11)).pack(anchor="w", pady=3)
-        ctk.CTkCheckBox(options_frame, text="Minuscole (a-z)", variable=lowercase_var, height=20, font=ctk.CTkFont(size=11)).pack(anchor="w", pady=3)
-        ctk.CTkCheckBox(options_frame, text="Numeri (0-9)", variable=numbers_var, height=20, font=ctk.CTkFont(size=11)).pack(anchor="w", pady=3)
-        ctk.CTkCheckBox(options_frame, text="Simboli (!@#$...)", variable=symbols_var, height=20, font=ctk.CTkFont(size=11)).pack(anchor="w", pady=3)
+        ctk.CTkCheckBox(options_frame, text="Maiuscole (A-Z)", variable=uppercase_var, height=20, font=font_registry.get("small")).pack(anchor="w", pady=3)
+        ctk.CTkCheckBox(options_frame, text="Minuscole (a-z)", variable=lowercase_var, height=20, font=font_registry.get("small")).pack(anchor="w", pady=3)
+        ctk.CTkCheckBox(options_frame, text="Numeri (0-9)", variable=numbers_var, height=20, font=font_registry.get("small")).pack(anchor="w", pady=3)
+        ctk.CTkCheckBox(options_frame, text="Simboli (!@#$...)", variable=symbols_var, height=20, font=font_registry.get("small")).pack(anchor="w", pady=3)
         
         # Pulsanti
         buttons_frame = ThemedFrame(frame, style="surface")
@@ -489,7 +493,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
             
             # Verifica che almeno un'opzione sia selezionata
             if not any([uppercase_var.get(), lowercase_var.get(), numbers_var.get(), symbols_var.get()]):
-                show_message(custom_dialog, "Errore", "Seleziona almeno un tipo di carattere", "error")
+                show_toast(custom_dialog, "Seleziona almeno un tipo di carattere", "error")
                 return
             
             password = self.password_generator.generate_strong_password(length, include_symbols)
@@ -502,7 +506,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
             self._on_password_change()
             
             custom_dialog.destroy()
-            show_message(self, "Password Generata", "Password personalizzata generata!", "success")
+            show_toast(self, "Password personalizzata generata", "success")
         
         generate_btn = ThemedButton(
             buttons_frame,
@@ -530,7 +534,9 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         if password:
             self.clipboard_clear()
             self.clipboard_append(password)
-            show_message(self, "Copiata", "Password copiata negli appunti", "success")
+            if self.edit_mode and self.current_password:
+                self.database.record_access(self.current_password["id"])
+            show_toast(self, config_manager.get('messages.success.password_copied', "Password copiata negli appunti"), "success")
     
     def _save_password(self):
         """Salva la password"""
@@ -540,16 +546,22 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         notes = self.notes_text.get("1.0", "end-1c").strip()
         
         if not site or not username or not password:
-            show_message(self, "Errore", "Compila i campi obbligatori", "error")
+            show_toast(self, config_manager.get('messages.validation.missing_required_fields', "Compila i campi obbligatori"), "error")
             return
         
-        success, message = self.database.add_password(site, username, password, notes)
+        if self.edit_mode and self.current_password:
+            success, message = self.database.update_password(
+                self.current_password["id"], site, username, password, notes
+            )
+        else:
+            success, message = self.database.add_password(site, username, password, notes)
         
         if success:
             action = "aggiornata" if self.edit_mode else "salvata"
-            show_message(self, "Successo", f"Password {action} con successo", "success")
+            show_toast(self, f"Password {action} con successo", "success")
             self._clear_form_and_hide()
-            self.on_save()
+            if self.on_save:
+                self.on_save()
         else:
             show_message(self, "Errore", message, "error")
     
@@ -579,7 +591,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         
         # Icona di avvertimento
         warning_icon = ThemedLabel(frame, text="⚠️", style="primary")
-        warning_icon.configure(font=ctk.CTkFont(size=48))
+        warning_icon.configure(font=font_registry.sized(48))
         warning_icon.pack(pady=(0, 20))
         
         # Messaggio in textbox per coerenza
@@ -592,7 +604,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         
         message_textbox = ctk.CTkTextbox(
             frame,
-            font=ctk.CTkFont(size=12),
+            font=font_registry.get("body"),
             wrap="word",
             height=150
         )
@@ -636,9 +648,10 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
         )
         
         if success:
-            show_message(self, "Successo", "Password eliminata con successo", "success")
+            show_toast(self, config_manager.get('messages.success.password_deleted', "Password eliminata con successo"), "success")
             self._clear_form_and_hide()
-            self.on_save()
+            if self.on_save:
+                self.on_save()
         else:
             show_message(self, "Errore", message, "error")
     
@@ -695,7 +708,7 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
             self.edit_mode = False
             
             if hasattr(self, 'strength_indicator'):
-                self.strength_indicator.update_strength("")
+                self.strength_indicator.update_strength("", immediate=True)
             
             # Nascondi pulsanti aggiuntivi
             try:
@@ -784,6 +797,9 @@ Password: "M1P14c3P1zz4M@rgh3r1t@24!"
 class DashboardView(ThemedFrame):
     """Vista principale del dashboard"""
     
+    # Intervallo di controllo degli indici costruiti in background
+    INDEX_POLL_MS = 100
+    
     def __init__(self, master, database: PasswordDatabase, on_logout: Callable):
         super().__init__(master, style="background")
         
@@ -793,9 +809,16 @@ class DashboardView(ThemedFrame):
             
         self.database = database
         self.on_logout = on_logout
+        # Impostato dai thread che costruiscono gli indici, letto solo nel thread di Tk
+        self._index_ready = threading.Event()
+        self._index_poll_job = None
         
         self._create_ui()
         self._refresh_password_list()
+        
+        # Le modifiche alle password arrivano come eventi e aggiornano solo le righe interessate
+        self.database.add_change_listener(self._on_database_change)
+        self._poll_index_ready()
     
     def _create_ui(self):
         # Header principale con controlli di navigazione
@@ -807,16 +830,13 @@ class DashboardView(ThemedFrame):
         title_section.pack(side="left", fill="x", expand=True)
         
         main_title = ThemedLabel(title_section, text="🔐 Password Manager", style="primary")
-        main_title.configure(font=ctk.CTkFont(size=20, weight="bold"))
+        main_title.configure(font=font_registry.get("subtitle"))
         main_title.pack(anchor="w")
         
-        user_info = ThemedLabel(
-            title_section, 
-            text=f"👤 {self.database.current_user or 'Utente'} | 📊 {len(self.database.get_passwords())} password salvate", 
-            style="secondary"
-        )
-        user_info.configure(font=ctk.CTkFont(size=12))
-        user_info.pack(anchor="w", pady=(2, 0))
+        self.user_info_label = ThemedLabel(title_section, text="", style="secondary")
+        self.user_info_label.configure(font=font_registry.get("body"))
+        self.user_info_label.pack(anchor="w", pady=(2, 0))
+        self._update_user_info()
         
         # Controlli di navigazione
         nav_controls = ThemedFrame(header_frame, style="surface")
@@ -837,6 +857,16 @@ class DashboardView(ThemedFrame):
         )
         backup_button.pack(side="left", padx=(0, 15))
         
+        audit_button = ThemedButton(
+            nav_controls,
+            text="🛡️ Audit",
+            command=self._show_audit,
+            style="primary",
+            width=100,
+            height=40
+        )
+        audit_button.pack(side="left", padx=(0, 15))
+        
         logout_button = ThemedButton(
             nav_controls,
             text="🚪 Logout",
@@ -864,7 +894,7 @@ class DashboardView(ThemedFrame):
         list_header.pack(fill="x", padx=20, pady=(20, 10))
         
         list_title = ThemedLabel(list_header, text="📋 Le tue Password", style="primary")
-        list_title.configure(font=ctk.CTkFont(size=16, weight="bold"))
+        list_title.configure(font=font_registry.sized(16, "bold"))
         list_title.pack(side="left")
         
         new_button = ThemedButton(
@@ -887,16 +917,46 @@ class DashboardView(ThemedFrame):
             height=35
         )
         self.search_entry.pack(fill="x")
-        self.search_entry.bind("<KeyRelease>", self._filter_passwords)
         
-        # Lista password scrollabile
-        self.password_list = ctk.CTkScrollableFrame(left_panel, height=400)
-        self.password_list.pack(fill="both", expand=True, padx=20, pady=10)
+        # Ordinamento della lista completa (i risultati di ricerca sono per rilevanza)
+        sort_frame = ThemedFrame(search_frame, style="surface")
+        sort_frame.pack(fill="x", pady=(8, 0))
         
-        # Info conteggio password
+        sort_label = ThemedLabel(sort_frame, text="Ordina per:", style="secondary")
+        sort_label.configure(font=font_registry.get("body"))
+        sort_label.pack(side="left")
+        
+        self.sort_order = config_manager.get('dashboard.sort_order', DEFAULT_SORT_ORDER)
+        if self.sort_order not in SORT_ORDERS:
+            self.sort_order = DEFAULT_SORT_ORDER
+        
+        self.sort_menu = ctk.CTkOptionMenu(
+            sort_frame,
+            values=list(SORT_ORDERS.values()),
+            command=self._on_sort_changed,
+            width=170,
+            height=30
+        )
+        self.sort_menu.set(SORT_ORDERS[self.sort_order])
+        self.sort_menu.pack(side="right")
+        
+        # Pipeline di ricerca: debounce, scarta i tasti che non cambiano il testo
+        # e applica solo il risultato dell'ultima query
+        self.search_pipeline = SearchPipeline(
+            self,
+            self._search_passwords,
+            self._apply_search_result,
+            delay_ms=config_manager.get('dashboard.search.debounce_ms', 150)
+        )
+        self.search_entry.bind("<KeyRelease>", self._on_search_changed)
+        self.max_search_results = config_manager.get('dashboard.search.max_results', 200)
+        
+        # Info conteggio password (la lista viene inserita sopra)
         self.count_label = ThemedLabel(left_panel, text="", style="secondary")
-        self.count_label.configure(font=ctk.CTkFont(size=11))
-        self.count_label.pack(pady=(5, 15))
+        self.count_label.configure(font=font_registry.get("small"))
+        self.count_label.pack(side="bottom", pady=(5, 15))
+        
+        self.password_list = self._create_password_list(left_panel, self._wants_compact_list())
         
         # Pannello destro - Editor
         self.right_panel = ctk.CTkScrollableFrame(main_container, corner_radius=12)
@@ -910,11 +970,11 @@ class DashboardView(ThemedFrame):
         welcome_content.pack(expand=True)
         
         welcome_icon = ThemedLabel(welcome_content, text="🎯", style="primary")
-        welcome_icon.configure(font=ctk.CTkFont(size=48))
+        welcome_icon.configure(font=font_registry.sized(48))
         welcome_icon.pack(pady=(20, 10))
         
         welcome_title = ThemedLabel(welcome_content, text="Gestisci le tue Password", style="primary")
-        welcome_title.configure(font=ctk.CTkFont(size=18, weight="bold"))
+        welcome_title.configure(font=font_registry.get("header"))
         welcome_title.pack(pady=(0, 15))
         
         welcome_text = """• Seleziona una password dalla lista per modificarla
@@ -923,7 +983,7 @@ class DashboardView(ThemedFrame):
 • Crea backup per proteggere i tuoi dati"""
         
         welcome_label = ThemedLabel(welcome_content, text=welcome_text, style="secondary")
-        welcome_label.configure(font=ctk.CTkFont(size=13), justify="left")
+        welcome_label.configure(font=font_registry.sized(13), justify="left")
         welcome_label.pack(pady=(0, 20))
         
         # Pulsanti di azione rapida
@@ -950,56 +1010,118 @@ class DashboardView(ThemedFrame):
         )
         quick_backup_btn.pack(pady=5)
         
-        # Editor password (creato ma inizialmente nascosto)
-        self.password_editor = PasswordEditor(self.right_panel, self.database, self._refresh_password_list)
-        
-        # Mantieni riferimento ai dati originali per il filtro
-        self.all_passwords = []
+        # Editor password (creato ma inizialmente nascosto); la lista si aggiorna
+        # tramite gli eventi del database, non serve una callback di salvataggio
+        self.password_editor = PasswordEditor(self.right_panel, self.database)
     
-    def _filter_passwords(self, event=None):
-        """Filtra le password in base al testo di ricerca"""
-        search_text = self.search_entry.get().lower().strip()
-        
-        # Pulisci lista attuale
-        for widget in self.password_list.winfo_children():
-            widget.destroy()
+    def _wants_compact_list(self) -> bool:
+        """True se il vault supera la soglia della tabella compatta"""
+        compact_threshold = config_manager.get('dashboard.compact_mode_threshold', 5000)
+        return len(self.database.get_passwords()) > compact_threshold
+    
+    def _create_password_list(self, parent, compact: bool):
+        """
+        Lista password: virtualizzata (crea solo le righe visibili) oppure,
+        oltre la soglia configurata, tabella compatta su un unico Treeview
+        """
+        if compact:
+            password_list = CompactPasswordTable(
+                parent,
+                self._select_password,
+                on_sort=self._on_table_sort,
+                sort_order=self.sort_order,
+                strength_of=self.database.strength_of,
+                height=400
+            )
+        else:
+            password_list = VirtualPasswordList(parent, self._select_password, height=400)
+        password_list.pack(fill="both", expand=True, padx=20, pady=10)
+        return password_list
+    
+    def _update_list_mode(self) -> bool:
+        """
+        Passa alla lista adatta al numero di password attuale
+
+        La dashboard resta nella cache delle viste: il vault può superare
+        (o scendere sotto) la soglia senza che la vista venga ricostruita.
+
+        Returns:
+            bool: True se la lista è stata sostituita (va ripopolata)
+        """
+        compact = self._wants_compact_list()
+        if compact == isinstance(self.password_list, CompactPasswordTable):
+            return False
+        
+        parent = self.password_list.master
+        self.password_list.destroy()
+        self.password_list = self._create_password_list(parent, compact)
+        return True
+    
+    def _get_search_text(self) -> str:
+        """Testo di ricerca normalizzato"""
+        return self.search_entry.get().lower().strip()
+    
+    def _on_search_changed(self, event=None):
+        """Callback per ogni tasto nella barra di ricerca"""
+        self.search_pipeline.submit(self._get_search_text())
+    
+    def _search_passwords(self, search_text: str, is_cancelled) -> Optional[list]:
+        """Filtra le password (eseguito dalla pipeline in background)"""
+        if not search_text:
+            # Copia già ordinata: la lista la modifica con gli eventi del database
+            return self.database.get_sorted_passwords(self.sort_order)
+        
+        # Ricerca fuzzy su sito/username seguita dalle note: solo i primi risultati
+        # vengono materializzati e la ricerca si interrompe se superata da una più recente
+        return self.database.search(search_text, self.max_search_results, is_cancelled)
+    
+    def _apply_search_result(self, search_text: str, filtered_passwords: Optional[list], keep_scroll: bool = False):
+        """Mostra il risultato di una ricerca"""
+        if filtered_passwords is None:
+            return
         
-        # Filtra password
+        # Mostra password filtrate (la lista riusa le righe già create)
         if search_text:
-            filtered_passwords = [
-                pwd for pwd in self.all_passwords
-                if search_text in pwd["site"].lower() or search_text in pwd["username"].lower()
-            ]
+            empty_text = f"Nessun risultato per '{search_text}'"
+            # Segnala i predicati non validi (es. una data scritta male)
+            errors = parse_query(search_text).errors
+            if errors:
+                empty_text += "\n" + "\n".join(errors)
         else:
-            filtered_passwords = self.all_passwords
-        
-        # Mostra password filtrate
-        if not filtered_passwords:
-            if search_text:
-                no_results = ThemedLabel(
-                    self.password_list,
-                    text=f"Nessun risultato per '{search_text}'",
-                    style="secondary"
-                )
-                no_results.pack(pady=20)
-            else:
-                empty_label = ThemedLabel(
-                    self.password_list,
-                    text="Nessuna password salvata.\nClicca '➕ Nuova' per iniziare.",
-                    style="secondary"
-                )
-                empty_label.pack(pady=40)
-        else:
-            for password in filtered_passwords:
-                item = PasswordListItem(
-                    self.password_list,
-                    password,
-                    self._select_password
-                )
-                item.pack(fill="x", pady=3, padx=5)
+            empty_text = "Nessuna password salvata.\nClicca '➕ Nuova' per iniziare."
+        if self._update_list_mode():
+            keep_scroll = False
+        self.password_list.set_items(filtered_passwords, empty_text, keep_scroll=keep_scroll)
         
         # Aggiorna conteggio
-        self._update_count_label(len(filtered_passwords), len(self.all_passwords), search_text)
+        self._update_count_label(len(filtered_passwords), len(self.database.get_passwords()), search_text)
+    
+    def _filter_passwords(self, event=None, keep_scroll: bool = False):
+        """Filtra subito le password in base al testo di ricerca"""
+        search_text = self._get_search_text()
+        filtered_passwords = self.search_pipeline.run_now(search_text)
+        self._apply_search_result(search_text, filtered_passwords, keep_scroll=keep_scroll)
+
+    def _on_sort_changed(self, label: str):
+        """Cambia l'ordinamento della lista dal selettore"""
+        order = next((key for key, value in SORT_ORDERS.items() if value == label), DEFAULT_SORT_ORDER)
+        self._set_sort_order(order)
+    
+    def _on_table_sort(self, column: str):
+        """Click sull'intestazione della tabella compatta: un secondo click torna all'ordine di inserimento"""
+        order = "insertion" if column == self.sort_order else column
+        self.sort_menu.set(SORT_ORDERS[order])
+        self._set_sort_order(order)
+    
+    def _set_sort_order(self, order: str):
+        if order == self.sort_order:
+            return
+        
+        self.sort_order = order
+        if isinstance(self.password_list, CompactPasswordTable):
+            self.password_list.set_sort_order(order)
+        if not self._get_search_text():
+            self._filter_passwords()
 
     def _update_count_label(self, shown_count, total_count, search_text=""):
         """Aggiorna il label del conteggio"""
@@ -1010,21 +1132,81 @@ class DashboardView(ThemedFrame):
         self.count_label.configure(text=text)
 
     def _refresh_password_list(self):
-        """Aggiorna la lista delle password"""
-        self.all_passwords = self.database.get_passwords()
+        """Ricarica completamente la lista delle password (apertura del dashboard)"""
+        self._update_user_info()
         
-        # Aggiorna anche il conteggio nell'header
-        if hasattr(self, 'count_label'):
-            try:
-                user_info = self.master.winfo_children()[0].winfo_children()[0].winfo_children()[0].winfo_children()[1]
-                user_info.configure(
-                    text=f"👤 {self.database.current_user or 'Utente'} | 📊 {len(self.all_passwords)} password salvate"
-                )
-            except:
-                pass
+        # Applica il filtro corrente mantenendo la posizione nella lista
+        self._filter_passwords(keep_scroll=True)
+    
+    def on_show(self):
+        """Chiamato quando la vista torna visibile dalla cache dell'app"""
+        # La lista è già aggiornata dagli eventi del database, anche da nascosta;
+        # va ricreata solo se il vault ha superato la soglia della tabella compatta
+        self._update_user_info()
+        if self._update_list_mode():
+            self._filter_passwords()
+    
+    def _update_user_info(self):
+        """Aggiorna utente e numero di password nell'header"""
+        self.user_info_label.configure(
+            text=f"👤 {self.database.current_user or 'Utente'} | 📊 {len(self.database.get_passwords())} password salvate"
+        )
+    
+    def _on_database_change(self, event: ChangeEvent):
+        """Applica una modifica del database alla lista senza ricaricarla"""
+        if event.kind is ChangeKind.INDEXED:
+            # L'evento arriva dal thread che ha costruito l'indice, dove Tk non
+            # si può usare: lo raccoglie _poll_index_ready nel thread di Tk
+            self._index_ready.set()
+            return
+        
+        if event.kind is ChangeKind.ACCESSED:
+            # La nuova frecency vale dal prossimo aggiornamento della lista (il
+            # database rimanda il riposizionamento): la riga appena aperta non
+            # si sposta sotto il cursore e le posizioni restano quelle mostrate
+            return
+        
+        self._update_user_info()
         
-        # Applica il filtro corrente
-        self._filter_passwords()
+        search_text = self._get_search_text()
+        if search_text:
+            # Con una ricerca attiva la voce può entrare o uscire dai risultati:
+            # la lista riconcilia il nuovo risultato toccando solo le righe cambiate
+            self._filter_passwords(keep_scroll=True)
+            return
+        
+        # Posizione nell'ordinamento scelto (None = in fondo, ordine di inserimento)
+        position = self.database.sort_position(self.sort_order, event.entry_id) if event.entry else None
+        
+        if event.kind is ChangeKind.ADDED:
+            self.password_list.insert_item(event.entry, position)
+        elif event.kind is ChangeKind.UPDATED:
+            # Una modifica può spostare la voce nell'ordinamento
+            if position is None or self.password_list.index_of(event.entry_id) == position:
+                self.password_list.update_item(event.entry)
+            else:
+                self.password_list.remove_item(event.entry_id)
+                self.password_list.insert_item(event.entry, position)
+        elif event.kind is ChangeKind.DELETED:
+            self.password_list.remove_item(event.entry_id)
+        
+        total_count = len(self.database.get_passwords())
+        self._update_count_label(total_count, total_count)
+    
+    def _poll_index_ready(self):
+        """Controlla periodicamente, nel thread di Tk, se un indice è diventato pronto"""
+        if self._index_ready.is_set():
+            self._index_ready.clear()
+            self._on_index_ready()
+        self._index_poll_job = self.after(self.INDEX_POLL_MS, self._poll_index_ready)
+    
+    def _on_index_ready(self):
+        """Riesegue la ricerca attiva, fatta senza indice (o senza note) durante la costruzione"""
+        # Anche la forza delle password arriva a login avvenuto: la tabella
+        # compatta la mostra e l'ordinamento per forza ne dipende
+        if (self._get_search_text() or self.sort_order == "strength"
+                or isinstance(self.password_list, CompactPasswordTable)):
+            self._filter_passwords(keep_scroll=True)
     
     def _select_password(self, password_data: Dict):
         """Seleziona una password per la modifica"""
@@ -1045,6 +1227,11 @@ class DashboardView(ThemedFrame):
         self.password_editor.pack_forget()
         self.welcome_frame.pack(fill="both", expand=True)
     
+    def _show_audit(self):
+        """Mostra il report di audit del vault (gestito dall'app principale)"""
+        if hasattr(self.master, 'master') and hasattr(self.master.master, '_show_audit'):
+            self.master.master._show_audit()
+
     def _show_backup(self):
         """Mostra la vista backup"""
         # Passa la richiesta all'app principale
@@ -1085,9 +1272,14 @@ class DashboardView(ThemedFrame):
     def destroy(self):
         """Override destroy per pulizia sicura"""
         try:
-            # Pulisci eventuali timer o callback
-            if hasattr(self, '_search_timer') and self._search_timer:
-                self.after_cancel(self._search_timer)
+            self.database.remove_change_listener(self._on_database_change)
+            if self._index_poll_job is not None:
+                self.after_cancel(self._index_poll_job)
+                self._index_poll_job = None
+            
+            # Ferma la pipeline di ricerca (timer di debounce e ricerche in corso)
+            if hasattr(self, 'search_pipeline'):
+                self.search_pipeline.shutdown()
             
             # Pulisci tutti i widget dropdown/optionmenu
             for widget in self.winfo_children():
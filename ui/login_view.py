@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from typing import Callable
 from pathlib import Path
+from core.fonts import font_registry
 from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message
 from core.database import PasswordDatabase
 
@@ -33,11 +34,11 @@ class LoginView(ThemedFrame):
         
         # Logo/Titolo
         title_label = ThemedLabel(main_container, text="🔐 Password Manager", style="primary")
-        title_label.configure(font=ctk.CTkFont(size=32, weight="bold"))
+        title_label.configure(font=font_registry.sized(32, "bold"))
         title_label.pack(pady=(40, 20))
         
         subtitle_label = ThemedLabel(main_container, text="Accedi al tuo account", style="secondary")
-        subtitle_label.configure(font=ctk.CTkFont(size=14))
+        subtitle_label.configure(font=font_registry.sized(14))
         subtitle_label.pack(pady=(0, 30))
         
         # Form di login
@@ -108,19 +109,26 @@ class LoginView(ThemedFrame):
         password = self.password_entry.get()
         
         if not username or not password:
-            from core.components import show_message
-            show_message(self, "Errore", "Inserisci username e password", "error")
+            from core.components import show_toast
+            show_toast(self, "Inserisci username e password", "error")
             return
         
         # Prova il login
         success, message = self.database.login(username, password)
         
         if success:
+            # La vista resta in cache dopo il login: la password master non deve restare nel campo
+            self.password_entry.delete(0, "end")
             self.on_login_success()
         else:
             from core.components import show_message
             show_message(self, "Errore Login", message, "error")
 
+    def on_show(self):
+        """Chiamato quando la vista torna visibile dalla cache dell'app"""
+        self.password_entry.delete(0, "end")
+        self.username_entry.focus()
+
     def clear_form(self):
         """Pulisce il form"""
         self.username_entry.delete(0, "end")
@@ -0,0 +1,513 @@
+import math
+import customtkinter as ctk
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+from core.fonts import font_registry
+from core.components import ThemedFrame, ThemedLabel
+from core.config import config_manager
+from core.theme import theme_manager
+
+class PasswordListItem(ThemedFrame):
+    """Item della lista password"""
+
+    def __init__(self, master, password_data: Dict, on_select: Callable):
+        super().__init__(master, style="surface")
+
+        self.password_data = password_data
+        self.on_select = on_select
+
+        self._create_ui()
+        self._setup_bindings()
+
+    def _create_ui(self):
+        self.configure(height=60, corner_radius=8)
+
+        # Site name
+        self.site_label = ThemedLabel(self, text=self.password_data["site"], style="primary")
+        self.site_label.configure(font=font_registry.sized(14, "bold"))
+        self.site_label.pack(anchor="w", padx=15, pady=(8, 2))
+
+        # Username
+        self.username_label = ThemedLabel(self, text=self.password_data["username"], style="secondary")
+        self.username_label.configure(font=font_registry.get("body"))
+        self.username_label.pack(anchor="w", padx=15, pady=(0, 8))
+
+    def _setup_bindings(self):
+        """Setup dei binding per il click"""
+        self.bind("<Button-1>", lambda e: self.on_select(self.password_data))
+        self.bind("<Enter>", self._on_enter)
+        self.bind("<Leave>", self._on_leave)
+
+        for child in self.winfo_children():
+            child.bind("<Button-1>", lambda e: self.on_select(self.password_data))
+
+    def set_data(self, password_data: Dict):
+        """Associa l'item a una nuova password riusando i widget esistenti"""
+        self.password_data = password_data
+        self.site_label.configure(text=password_data["site"])
+        self.username_label.configure(text=password_data["username"])
+
+    def _on_enter(self, event):
+        self.configure(fg_color=theme_manager.get_colors()['hover'])
+
+    def _on_leave(self, event):
+        self.configure(fg_color=theme_manager.get_colors()['surface'])
+
+class VirtualPasswordList(ThemedFrame):
+    """
+    Lista password virtualizzata
+
+    Mantiene un pool fisso di PasswordListItem dimensionato sull'area visibile
+    e, durante lo scroll, riassocia le righe ai dati invece di creare un widget
+    per ogni password. Il costo di rendering dipende quindi solo dall'altezza
+    della lista, non dal numero di password nel vault.
+    """
+
+    ROW_HEIGHT = 60
+    ROW_SPACING = 6
+
+    def __init__(self, master, on_select: Callable, **kwargs):
+        super().__init__(master, style="surface", **kwargs)
+
+        self.on_select = on_select
+        self.items: List[Dict] = []
+        self._rows: List[PasswordListItem] = []
+        self._positions: List[Optional[int]] = []  # posizione visibile di ogni riga (None = nascosta)
+        self._item_index: Optional[Dict[str, int]] = None  # id password -> indice in items (calcolato al bisogno)
+        self._empty_text = ""
+        self._offset = 0
+        self._visible_rows = 0
+
+        self._create_ui()
+
+    def _create_ui(self):
+        # Scrollbar che rappresenta la posizione nella lista completa
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 2), pady=2)
+
+        # Area che ospita il pool di righe posizionate con place()
+        self.body = ThemedFrame(self, style="surface")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_configure)
+
+        # Messaggio mostrato quando la lista è vuota
+        self.empty_label = ThemedLabel(self.body, text="", style="secondary")
+
+        self._bind_mousewheel(self.body)
+
+    def _bind_mousewheel(self, widget):
+        """Collega la rotellina del mouse a un widget (Windows/macOS e X11)"""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll_by(1))
+
+    def set_items(self, items: List[Dict], empty_text: str = "", keep_scroll: bool = False):
+        """
+        Imposta i dati mostrati dalla lista
+
+        Args:
+            items: Password da mostrare, nell'ordine di visualizzazione
+            empty_text: Messaggio da mostrare se la lista è vuota
+            keep_scroll: Mantiene la posizione di scroll corrente
+        """
+        self.items = items
+        self._item_index = None
+        self._empty_text = empty_text
+
+        if not keep_scroll:
+            self._offset = 0
+        self._refresh()
+
+    def insert_item(self, item: Dict, index: Optional[int] = None):
+        """Inserisce una password nella posizione indicata (in fondo se None)"""
+        if index is None or index >= len(self.items):
+            self.items.append(item)
+            if self._item_index is not None:
+                self._item_index[item.get("id")] = len(self.items) - 1
+        else:
+            self.items.insert(index, item)
+            self._item_index = None
+        self._refresh()
+
+    def update_item(self, item: Dict) -> bool:
+        """
+        Sostituisce la password con lo stesso id
+
+        Le posizioni non cambiano: viene riconfigurata solo la riga che la
+        mostra, se visibile.
+
+        Returns:
+            bool: False se la password non è nella lista
+        """
+        index = self.index_of(item.get("id"))
+        if index is None:
+            return False
+        self.items[index] = item
+        self._render()
+        return True
+
+    def remove_item(self, entry_id: str) -> bool:
+        """
+        Rimuove la password con l'id indicato
+
+        Returns:
+            bool: False se la password non è nella lista
+        """
+        index = self.index_of(entry_id)
+        if index is None:
+            return False
+        del self.items[index]
+        self._item_index = None
+        self._refresh()
+        return True
+
+    def index_of(self, entry_id: str) -> Optional[int]:
+        """Posizione nella lista della password con l'id indicato"""
+        if self._item_index is None:
+            self._item_index = {item.get("id"): index for index, item in enumerate(self.items)}
+        return self._item_index.get(entry_id)
+
+    def _refresh(self):
+        """Aggiorna messaggio di lista vuota, scroll e righe dopo un cambio dei dati"""
+        self._clamp_offset()
+
+        if self.items:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.configure(text=self._empty_text)
+            self.empty_label.place(relx=0.5, y=40, anchor="n")
+
+        self._render()
+
+    def scroll_to(self, index: int):
+        """Porta la riga indicata in cima all'area visibile"""
+        self._offset = index
+        self._clamp_offset()
+        self._render()
+
+    def scroll_by(self, rows: int):
+        """Scorre la lista di un certo numero di righe"""
+        self.scroll_to(self._offset + rows)
+
+    def _clamp_offset(self):
+        max_offset = max(0, len(self.items) - self._visible_rows)
+        self._offset = max(0, min(self._offset, max_offset))
+
+    def _on_configure(self, event):
+        """Ridimensiona il pool di righe quando cambia l'altezza visibile"""
+        height = event.height / self._get_widget_scaling()
+        visible_rows = max(1, math.ceil(height / (self.ROW_HEIGHT + self.ROW_SPACING)))
+
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._clamp_offset()
+            self._render()
+
+    def _on_scrollbar(self, action: str, value, units: Optional[str] = None):
+        """Gestisce i comandi della scrollbar (trascinamento e click)"""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.items)))
+        elif action == "scroll":
+            step = self._visible_rows if units == "pages" else 1
+            self.scroll_by(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        if event.delta:
+            # Windows usa multipli di 120, macOS valori piccoli
+            steps = -int(event.delta / 120) if abs(event.delta) >= 120 else -int(math.copysign(1, event.delta))
+            self.scroll_by(steps)
+
+    def _ensure_pool(self, count: int):
+        """Crea righe aggiuntive solo se l'area visibile è cresciuta"""
+        while len(self._rows) < count:
+            row = PasswordListItem(self.body, self.items[0], self.on_select)
+            row.pack_propagate(False)
+            self._bind_mousewheel(row)
+            for child in row.winfo_children():
+                self._bind_mousewheel(child)
+            self._rows.append(row)
+            self._positions.append(None)
+
+    def _render(self):
+        """
+        Associa le righe del pool alla finestra di dati visibile
+
+        Le righe che mostrano una password ancora visibile la mantengono e,
+        se serve, vengono solo spostate; vengono riconfigurate soltanto le
+        righe i cui dati sono usciti dalla finestra (es. restringendo la ricerca).
+        """
+        visible_count = min(self._visible_rows, max(0, len(self.items) - self._offset))
+        if visible_count:
+            self._ensure_pool(visible_count)
+
+        visible = self.items[self._offset:self._offset + visible_count]
+
+        # Righe visibili indicizzate per la password che mostrano
+        shown = {id(row.password_data): number
+                 for number, row in enumerate(self._rows)
+                 if self._positions[number] is not None}
+
+        assigned: List[Optional[int]] = [None] * visible_count
+        for position, data in enumerate(visible):
+            assigned[position] = shown.pop(id(data), None)
+
+        used = {number for number in assigned if number is not None}
+        free = [number for number in range(len(self._rows)) if number not in used]
+        for position, data in enumerate(visible):
+            if assigned[position] is None:
+                number = free.pop(0)
+                self._rows[number].set_data(data)
+                assigned[position] = number
+
+        slot = self.ROW_HEIGHT + self.ROW_SPACING
+        for position, number in enumerate(assigned):
+            if self._positions[number] != position:
+                self._rows[number].place(x=0, y=position * slot, relwidth=1.0)
+                self._positions[number] = position
+
+        # Le righe rimaste libere non hanno dati da mostrare
+        for number in free:
+            if self._positions[number] is not None:
+                self._rows[number].place_forget()
+                self._positions[number] = None
+
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.items)
+        if total == 0 or total <= self._visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / total, (self._offset + self._visible_rows) / total)
+
+
+class CompactPasswordTable(ThemedFrame):
+    """
+    Lista password compatta per vault molto grandi
+
+    Usa un unico ttk.Treeview (nessun widget per riga): ogni password occupa
+    solo una tupla di stringhe nel widget Tk. Offre la stessa interfaccia di
+    VirtualPasswordList, quindi la dashboard può usare l'una o l'altra.
+    Le righe vengono inserite a blocchi con after() per non bloccare
+    l'interfaccia anche con 100k password.
+    """
+
+    COLUMNS = ("site", "username", "updated", "strength")
+    HEADINGS = {
+        "site": "Sito",
+        "username": "Username",
+        "updated": "Modificata",
+        "strength": "Forza",
+    }
+    COLUMN_WIDTHS = {"site": 180, "username": 170, "updated": 115, "strength": 95}
+
+    # Ordinamenti mostrati dal valore più alto (stesso criterio di core.sort_index)
+    DESCENDING_COLUMNS = {"updated"}
+
+    ROW_HEIGHT = 24
+    BATCH_SIZE = 2000
+    STYLE = "Compact.Treeview"
+
+    def __init__(self, master, on_select: Callable, on_sort: Optional[Callable[[str], None]] = None,
+                 sort_order: Optional[str] = None,
+                 strength_of: Optional[Callable[[Dict], Optional[int]]] = None, **kwargs):
+        """
+        Args:
+            on_select: Chiamata con la password selezionata
+            on_sort: Chiamata con la colonna (= ordinamento) cliccata nell'intestazione
+            sort_order: Ordinamento corrente, indicato nell'intestazione
+            strength_of: Livello di forza di una password (non salvato nella voce)
+        """
+        super().__init__(master, style="surface", **kwargs)
+
+        self.on_select = on_select
+        self.on_sort = on_sort
+        self.sort_order = sort_order
+        self.strength_of = strength_of
+        self.items: List[Dict] = []
+        self._item_index: Optional[Dict[str, int]] = None
+        self._loaded = 0            # righe di items già inserite nel Treeview
+        self._load_job = None
+        self._strength_labels = config_manager.get('password_generator.strength_levels', {})
+
+        self._create_ui()
+
+    def _create_ui(self):
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings",
+                                 selectmode="browse", style=self.STYLE)
+        for column in self.COLUMNS:
+            self.tree.heading(column, command=lambda column=column: self._on_heading(column))
+            self.tree.column(column, width=self.COLUMN_WIDTHS[column], minwidth=60,
+                             stretch=column in ("site", "username"))
+        self._update_headings()
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 2), pady=2)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+
+        # Messaggio mostrato quando la lista è vuota
+        self.empty_label = ThemedLabel(self, text="", style="secondary")
+
+    def set_items(self, items: List[Dict], empty_text: str = "", keep_scroll: bool = False):
+        """
+        Imposta i dati mostrati dalla tabella
+
+        Args:
+            items: Password da mostrare, nell'ordine di visualizzazione
+            empty_text: Messaggio da mostrare se la lista è vuota
+            keep_scroll: Mantiene la posizione di scroll corrente
+        """
+        scroll = self.tree.yview()[0] if keep_scroll else 0.0
+
+        self._cancel_load()
+        self.tree.delete(*self.tree.get_children())
+        self.items = items
+        self._item_index = None
+        self._loaded = 0
+
+        if items:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.configure(text=empty_text)
+            self.empty_label.place(relx=0.5, y=40, anchor="n")
+
+        self._load_batch()
+        if scroll:
+            self.tree.yview_moveto(scroll)
+
+    def insert_item(self, item: Dict, index: Optional[int] = None):
+        """Inserisce una password nella posizione indicata (in fondo se None)"""
+        if index is None or index >= len(self.items):
+            index = len(self.items)
+            self.items.append(item)
+            if self._item_index is not None:
+                self._item_index[item.get("id")] = index
+        else:
+            self.items.insert(index, item)
+            self._item_index = None
+
+        # Le righe oltre quelle già caricate verranno inserite dal caricamento a blocchi
+        if index < self._loaded or self._load_job is None:
+            self.tree.insert("", index, iid=item["id"], values=self._row_values(item))
+            self._loaded += 1
+        self.empty_label.place_forget()
+
+    def update_item(self, item: Dict) -> bool:
+        """
+        Sostituisce la password con lo stesso id
+
+        Returns:
+            bool: False se la password non è nella lista
+        """
+        index = self.index_of(item.get("id"))
+        if index is None:
+            return False
+        self.items[index] = item
+        if index < self._loaded:
+            self.tree.item(item["id"], values=self._row_values(item))
+        return True
+
+    def remove_item(self, entry_id: str) -> bool:
+        """
+        Rimuove la password con l'id indicato
+
+        Returns:
+            bool: False se la password non è nella lista
+        """
+        index = self.index_of(entry_id)
+        if index is None:
+            return False
+        del self.items[index]
+        self._item_index = None
+        if index < self._loaded:
+            self.tree.delete(entry_id)
+            self._loaded -= 1
+        return True
+
+    def index_of(self, entry_id: str) -> Optional[int]:
+        """Posizione nella lista della password con l'id indicato"""
+        if self._item_index is None:
+            self._item_index = {item.get("id"): index for index, item in enumerate(self.items)}
+        return self._item_index.get(entry_id)
+
+    def set_sort_order(self, sort_order: str):
+        """Aggiorna l'indicatore di ordinamento nell'intestazione"""
+        self.sort_order = sort_order
+        self._update_headings()
+
+    def _load_batch(self):
+        """Inserisce il blocco successivo di righe e pianifica il seguente"""
+        self._load_job = None
+        end = min(self._loaded + self.BATCH_SIZE, len(self.items))
+        insert = self.tree.insert
+        for item in self.items[self._loaded:end]:
+            insert("", "end", iid=item["id"], values=self._row_values(item))
+        self._loaded = end
+
+        if self._loaded < len(self.items):
+            self._load_job = self.after(1, self._load_batch)
+
+    def _cancel_load(self):
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+
+    def _row_values(self, item: Dict):
+        strength = self.strength_of(item) if self.strength_of else None
+        return (
+            item["site"],
+            item["username"],
+            item.get("updated_at", "")[:16].replace("T", " "),
+            self._strength_labels.get(str(strength), "-") if strength is not None else "-",
+        )
+
+    def _update_headings(self):
+        for column in self.COLUMNS:
+            text = self.HEADINGS[column]
+            if column == self.sort_order:
+                text += " ▼" if column in self.DESCENDING_COLUMNS else " ▲"
+            self.tree.heading(column, text=text)
+
+    def _on_heading(self, column: str):
+        if self.on_sort:
+            self.on_sort(column)
+
+    def _on_tree_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index = self.index_of(selection[0])
+        if index is not None:
+            self.on_select(self.items[index])
+
+    def _apply_theme_colors(self, colors: Dict):
+        """Applica i colori del tema allo stile ttk della tabella"""
+        super()._apply_theme_colors(colors)
+        row_height = int(self.ROW_HEIGHT * self._get_widget_scaling())
+
+        # Solo lo stile della tabella: il tema ttk ("clam") è scelto dall'app all'avvio
+        style = ttk.Style(self)
+        style.configure(self.STYLE,
+                        background=colors['surface'],
+                        fieldbackground=colors['surface'],
+                        foreground=colors['text'],
+                        bordercolor=colors['border'],
+                        borderwidth=0,
+                        rowheight=row_height)
+        style.map(self.STYLE,
+                  background=[("selected", colors['primary'])],
+                  foreground=[("selected", "white")])
+        style.configure(f"{self.STYLE}.Heading",
+                        background=colors['secondary'],
+                        foreground=colors['text'],
+                        bordercolor=colors['border'],
+                        relief="flat")
+        style.map(f"{self.STYLE}.Heading",
+                  background=[("active", colors['hover'])])
+
+    def destroy(self):
+        self._cancel_load()
+        super().destroy()
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from typing import Callable
 from pathlib import Path
+from core.fonts import font_registry
 from core.components import ThemedFrame, ThemedLabel, ThemedButton, ThemedEntry, show_message
 from core.database import PasswordDatabase
 from core.config import config_manager
@@ -34,10 +35,9 @@ class RegisterView(ThemedFrame):
         
         # Titolo - usa configurazione
         title_text = config_manager.get('register.title', 'Crea Nuovo Account')
-        title_font = config_manager.get_font_config('title')
         
         title_label = ThemedLabel(main_container, text=title_text, style="primary")
-        title_label.configure(font=ctk.CTkFont(size=title_font['size'], weight=title_font['weight']))
+        title_label.configure(font=font_registry.get("title"))
         title_label.pack(pady=(40, 30))
         
         # Form di registrazione
@@ -185,6 +185,10 @@ class RegisterView(ThemedFrame):
             error_message = config_manager.format_message('messages.errors.database_error', error=str(e))
             show_message(self, "Errore", error_message, "error")
     
+    def on_show(self):
+        """Chiamato quando la vista torna visibile dalla cache dell'app"""
+        self.clear_form()
+    
     def clear_form(self):
         """Pulisce tutti i campi del form di registrazione"""
         self.username_entry.delete(0, "end")